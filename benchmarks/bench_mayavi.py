@@ -0,0 +1,147 @@
+"""Benchmarks for the Mayavi pipeline and mlab.
+
+All the benchmarks run headless.  The pipeline benchmarks use a
+`NullEngine` and the rendering benchmarks an `OffScreenEngine`.
+"""
+# Copyright (c) 2013,  Enthought, Inc.
+# License: BSD Style.
+
+import os
+import tempfile
+
+import numpy as np
+
+from mayavi import mlab
+from mayavi.core.null_engine import NullEngine
+from mayavi.core.off_screen_engine import OffScreenEngine
+from mayavi.core.lut_manager import lut_mode_list
+from mayavi.sources.array_source import ArraySource
+from mayavi.filters.threshold import Threshold
+from mayavi.filters.contour import Contour
+from mayavi.filters.extract_vector_norm import ExtractVectorNorm
+from mayavi.modules.surface import Surface
+from mayavi.modules.outline import Outline
+
+from common import Benchmark
+
+
+def make_null_engine():
+    e = NullEngine()
+    e.start()
+    e.new_scene()
+    return e
+
+
+def make_volume(n):
+    x, y, z = np.ogrid[-5:5:n*1j, -5:5:n*1j, -5:5:n*1j]
+    return np.sin(x*y*z)/(x*y*z + 1e-3)
+
+
+class MlabSourceSet(Benchmark):
+    description = 'MlabSource.set on a scalar_scatter with glyphs'
+    params = [10**4, 10**6]
+    quick_params = [10**4]
+
+    def setup(self, n):
+        self.e = make_null_engine()
+        x, y, z, s = np.random.random((4, n))
+        src = mlab.pipeline.scalar_scatter(x, y, z, s,
+                                           figure=self.e.current_scene)
+        mlab.pipeline.glyph(src, mode='point')
+        self.ms = src.mlab_source
+        self.x = x
+        self.s = s
+
+    def run(self, n):
+        self.ms.set(x=self.x*1.01, scalars=self.s*0.99)
+
+    def teardown(self, n):
+        self.e.stop()
+
+
+class ArraySourceUpdate(Benchmark):
+    description = 'Replace the scalar_data of an ArraySource (n^3 grid)'
+    params = [32, 128, 256]
+    quick_params = [32]
+
+    def setup(self, n):
+        self.e = e = make_null_engine()
+        self.data = make_volume(n)
+        self.src = ArraySource(scalar_data=self.data)
+        e.add_source(self.src)
+        e.add_module(Outline())
+
+    def run(self, n):
+        self.src.scalar_data = self.data*1.01
+
+    def teardown(self, n):
+        self.e.stop()
+
+
+class DataChangedPropagation(Benchmark):
+    description = 'data_changed through several branches (n^3 grid)'
+    params = [32, 64, 128]
+    quick_params = [32]
+
+    def setup(self, n):
+        self.e = e = make_null_engine()
+        data = make_volume(n)
+        vectors = np.random.random((n, n, n, 3))
+        self.src = src = ArraySource(scalar_data=data, vector_data=vectors)
+        e.add_source(src)
+        for f in (Threshold(), Contour(), ExtractVectorNorm()):
+            e.add_filter(f, src)
+            e.add_module(Surface(), f)
+
+    def run(self, n):
+        self.src.update()
+
+    def teardown(self, n):
+        self.e.stop()
+
+
+class LUTManagerSwitch(Benchmark):
+    description = 'Switch the LUT of a module manager through all modes'
+    params = [256, 4096]
+    quick_params = [256]
+
+    def setup(self, n):
+        self.e = e = make_null_engine()
+        src = ArraySource(scalar_data=make_volume(32))
+        e.add_source(src)
+        surf = Surface()
+        e.add_module(surf)
+        self.lm = lm = surf.module_manager.scalar_lut_manager
+        lm.number_of_colors = n
+        self.modes = [m for m in lut_mode_list() if m != 'file']
+
+    def run(self, n):
+        lm = self.lm
+        for mode in self.modes:
+            lm.lut_mode = mode
+
+    def teardown(self, n):
+        self.e.stop()
+
+
+class OffScreenSavefig(Benchmark):
+    description = 'mlab.savefig of a surface with an OffScreenEngine'
+    params = [(300, 300), (1024, 768), (3840, 2160)]
+    quick_params = [(300, 300)]
+
+    def setup(self, size):
+        self.e = e = OffScreenEngine()
+        e.start()
+        self.fig = mlab.figure(engine=e, size=size)
+        x, y = np.mgrid[-5:5:200j, -5:5:200j]
+        mlab.surf(x, y, np.sin(x*y), figure=self.fig)
+        fd, self.fname = tempfile.mkstemp(suffix='.png')
+        os.close(fd)
+
+    def run(self, size):
+        mlab.savefig(self.fname, size=size, figure=self.fig)
+
+    def teardown(self, size):
+        mlab.close(self.fig)
+        self.e.stop()
+        os.remove(self.fname)
@@ -0,0 +1,117 @@
+"""Benchmarks for the TVTK array conversion code.
+"""
+# Copyright (c) 2013,  Enthought, Inc.
+# License: BSD Style.
+
+import numpy as np
+
+import vtk
+from tvtk import array_handler
+from tvtk.api import tvtk
+
+from common import Benchmark
+
+
+SIZES = [10**4, 10**6, 10**7]
+QUICK_SIZES = [10**4, 10**5]
+
+
+class Array2VTKFloat(Benchmark):
+    description = 'array2vtk on an (n, 3) float64 array'
+    params = SIZES
+    quick_params = QUICK_SIZES
+
+    def setup(self, n):
+        self.a = np.random.random((n, 3))
+
+    def run(self, n):
+        array_handler.array2vtk(self.a)
+
+
+class Array2VTKNonContiguous(Benchmark):
+    description = 'array2vtk on a non-contiguous float32 array (copies)'
+    params = SIZES
+    quick_params = QUICK_SIZES
+
+    def setup(self, n):
+        self.a = np.random.random((n, 6)).astype('f')[:, ::2]
+
+    def run(self, n):
+        array_handler.array2vtk(self.a)
+
+
+class Array2VTKIdType(Benchmark):
+    description = 'array2vtk on an id type array'
+    params = SIZES
+    quick_params = QUICK_SIZES
+
+    def setup(self, n):
+        self.a = np.arange(n, dtype=array_handler.ID_TYPE_CODE)
+
+    def run(self, n):
+        array_handler.array2vtk(self.a)
+
+
+class VTK2ArrayFloat(Benchmark):
+    description = 'vtk2array on a 3 component vtkFloatArray'
+    params = SIZES
+    quick_params = QUICK_SIZES
+
+    def setup(self, n):
+        self.v = array_handler.array2vtk(np.random.random((n, 3)).astype('f'))
+
+    def run(self, n):
+        array_handler.vtk2array(self.v)
+
+
+class VTK2ArrayIdType(Benchmark):
+    description = 'vtk2array on a vtkIdTypeArray'
+    params = SIZES
+    quick_params = QUICK_SIZES
+
+    def setup(self, n):
+        v = vtk.vtkIdTypeArray()
+        v.SetNumberOfTuples(n)
+        self.v = v
+
+    def run(self, n):
+        array_handler.vtk2array(self.v)
+
+
+class VTK2ArrayBit(Benchmark):
+    description = 'vtk2array on a vtkBitArray'
+    params = [10**4, 10**6]
+    quick_params = [10**4]
+
+    def setup(self, n):
+        v = vtk.vtkBitArray()
+        v.SetNumberOfTuples(n)
+        self.v = v
+
+    def run(self, n):
+        array_handler.vtk2array(self.v)
+
+
+class Array2VTKCellArray(Benchmark):
+    description = 'array2vtkCellArray on (n, 3) triangles'
+    params = SIZES
+    quick_params = QUICK_SIZES
+
+    def setup(self, n):
+        self.a = np.random.randint(0, n, (n, 3))
+
+    def run(self, n):
+        array_handler.array2vtkCellArray(self.a)
+
+
+class PointsToArray(Benchmark):
+    description = 'tvtk.Points.to_array'
+    params = SIZES
+    quick_params = QUICK_SIZES
+
+    def setup(self, n):
+        self.p = tvtk.Points()
+        self.p.data = np.random.random((n, 3))
+
+    def run(self, n):
+        self.p.to_array()
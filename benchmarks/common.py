@@ -0,0 +1,355 @@
+"""Benchmark related utilities.
+
+A benchmark is a subclass of `Benchmark` that defines a `run` method
+(and optionally `setup` and `teardown`) taking one parameter, usually
+the size of the data.  The benchmark is run once for each value in its
+`params` list.  Each run is timed and the peak memory used during the
+run is recorded.  On platforms with `os.fork` every parameter is run
+in a forked child process so that one case does not affect the next
+one.
+
+The peak memory is the highest resident set size seen while `run` is
+timed, minus the resident set size before it.  On Linux the kernel's
+high water mark is reset before the run and read afterwards; elsewhere
+the resident set size is sampled from a thread during the run, which
+may miss very short peaks.  `ru_maxrss` is not used since it includes
+the peak of `setup` and, after a fork, that of the parent process.
+
+"""
+# Copyright (c) 2013,  Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports
+import os
+import sys
+import gc
+import re
+import time
+import json
+import cPickle
+import platform
+import threading
+import traceback
+from timeit import default_timer
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+######################################################################
+# Memory measurement.
+######################################################################
+def get_rss():
+    """Return the current resident set size of this process in bytes
+    or None if this cannot be found.
+    """
+    try:
+        f = open('/proc/self/statm')
+        try:
+            pages = int(f.read().split()[1])
+        finally:
+            f.close()
+        return pages*os.sysconf('SC_PAGE_SIZE')
+    except (IOError, OSError, ValueError, AttributeError):
+        return None
+
+
+def reset_peak_rss():
+    """Reset the peak resident set size recorded by the kernel for this
+    process.  Returns True if this is supported (Linux 4.0 and later).
+    """
+    try:
+        f = open('/proc/self/clear_refs', 'w')
+        try:
+            f.write('5')
+        finally:
+            f.close()
+    except (IOError, OSError):
+        return False
+    return get_peak_rss() is not None
+
+
+def get_peak_rss():
+    """Return the peak resident set size of this process, since it
+    started or since the last `reset_peak_rss`, in bytes or None if
+    this cannot be found.
+    """
+    try:
+        f = open('/proc/self/status')
+        try:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    # The value is in kilobytes.
+                    return int(line.split()[1])*1024
+        finally:
+            f.close()
+    except (IOError, OSError, ValueError):
+        pass
+    return None
+
+
+class RSSSampler(object):
+    """Records the highest resident set size of this process seen by a
+    thread polling it every `interval` seconds between `start` and
+    `stop`.
+    """
+
+    def __init__(self, interval=0.001):
+        self.interval = interval
+        self.peak = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self.peak = get_rss()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._poll)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling and return the peak seen, or None if the
+        resident set size cannot be found."""
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+        return self.peak
+
+    def _sample(self):
+        rss = get_rss()
+        if rss is not None and rss > self.peak:
+            self.peak = rss
+
+    def _poll(self):
+        while not self._stop.is_set():
+            self._sample()
+            self._stop.wait(self.interval)
+
+
+######################################################################
+# `Benchmark` class.
+######################################################################
+class Benchmark(object):
+    """Base class for all benchmarks.
+
+    Subclasses should set `params` and override `run`.  The `setup`
+    and `teardown` methods are not timed.
+    """
+
+    # The parameters (typically data sizes) to run the benchmark for.
+    params = [None]
+
+    # Smaller parameters to use for a quick run (for example in CI).
+    # If None, the first of `params` is used.
+    quick_params = None
+
+    # Number of times `run` is timed for each parameter.
+    repeat = 3
+
+    # Short description of the benchmark.
+    description = ''
+
+    def setup(self, param):
+        pass
+
+    def run(self, param):
+        raise NotImplementedError
+
+    def teardown(self, param):
+        pass
+
+    def get_name(self):
+        return self.__class__.__name__
+
+    def get_params(self, quick=False):
+        if quick:
+            if self.quick_params is not None:
+                return self.quick_params
+            return self.params[:1]
+        return self.params
+
+
+def find_benchmarks(modules, pattern=None):
+    """Return instances of all the `Benchmark` subclasses defined in
+    the given modules whose names match the optional regular
+    expression `pattern`.
+    """
+    result = []
+    for m in modules:
+        for name in sorted(dir(m)):
+            klass = getattr(m, name)
+            try:
+                ok = issubclass(klass, Benchmark) and klass is not Benchmark
+            except TypeError:
+                continue
+            if ok and klass.__module__ == m.__name__:
+                if pattern is None or re.search(pattern, name):
+                    result.append(klass())
+    return result
+
+
+######################################################################
+# Running benchmarks.
+######################################################################
+def measure(bench, param):
+    """Run the benchmark for the given parameter in this process and
+    return a dictionary of the results.
+    """
+    bench.setup(param)
+    try:
+        gc.collect()
+        start_rss = get_rss()
+        sampler = None
+        if not reset_peak_rss():
+            sampler = RSSSampler()
+            sampler.start()
+        try:
+            times = []
+            for i in range(bench.repeat):
+                t0 = default_timer()
+                bench.run(param)
+                times.append(default_timer() - t0)
+        finally:
+            if sampler is None:
+                peak = get_peak_rss()
+            else:
+                peak = sampler.stop()
+    finally:
+        bench.teardown(param)
+
+    if start_rss is None or peak is None:
+        memory = None
+    else:
+        memory = max(peak - start_rss, 0)
+    times.sort()
+    return {'name': bench.get_name(), 'param': param,
+            'times': times, 'min': times[0],
+            'median': times[len(times)//2], 'peak_memory': memory}
+
+
+def measure_in_child(bench, param):
+    """Run `measure` in a forked process and return its result.
+    Falls back to running in this process when `os.fork` is not
+    available.
+    """
+    if not hasattr(os, 'fork'):
+        return measure(bench, param)
+    r, w = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        # Child.
+        os.close(r)
+        try:
+            try:
+                result = measure(bench, param)
+            except Exception:
+                result = {'name': bench.get_name(), 'param': param,
+                          'error': traceback.format_exc()}
+            f = os.fdopen(w, 'wb')
+            cPickle.dump(result, f, cPickle.HIGHEST_PROTOCOL)
+            f.close()
+        finally:
+            # Do not run any cleanup handlers of the parent.
+            os._exit(0)
+    os.close(w)
+    f = os.fdopen(r, 'rb')
+    try:
+        data = f.read()
+    finally:
+        f.close()
+    os.waitpid(pid, 0)
+    if not data:
+        return {'name': bench.get_name(), 'param': param,
+                'error': 'Benchmark process died.'}
+    return cPickle.loads(data)
+
+
+def get_metadata():
+    """Return information on the environment the benchmarks run in."""
+    import numpy
+    md = {'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+          'python': sys.version.split()[0],
+          'platform': platform.platform(),
+          'machine': platform.machine(),
+          'numpy': numpy.__version__}
+    try:
+        import vtk
+        md['vtk'] = vtk.vtkVersion.GetVTKVersion()
+    except ImportError:
+        md['vtk'] = None
+    return md
+
+
+def run_benchmarks(benchmarks, quick=False, fork=True, verbose=True):
+    """Run all the given benchmarks and return the results as a
+    dictionary that can be saved as JSON.
+    """
+    results = []
+    func = measure_in_child if fork else measure
+    for bench in benchmarks:
+        for param in bench.get_params(quick):
+            result = func(bench, param)
+            results.append(result)
+            if verbose:
+                print format_result(result)
+                sys.stdout.flush()
+    return {'metadata': get_metadata(), 'results': results}
+
+
+######################################################################
+# Reporting.
+######################################################################
+def format_memory(nbytes):
+    if nbytes is None:
+        return 'n/a'
+    for unit in ('B', 'KB', 'MB'):
+        if abs(nbytes) < 1024:
+            return '%.1f %s'%(nbytes, unit)
+        nbytes /= 1024.0
+    return '%.1f GB'%nbytes
+
+
+def format_result(result):
+    label = '%s(%s)'%(result['name'], result['param'])
+    if 'error' in result:
+        return '%-45s ERROR\n%s'%(label, result['error'])
+    return '%-45s %10.4f s %12s'%(label, result['min'],
+                                  format_memory(result['peak_memory']))
+
+
+def save_results(results, file_name):
+    f = open(file_name, 'w')
+    try:
+        json.dump(results, f, indent=1, sort_keys=True)
+    finally:
+        f.close()
+
+
+def load_results(file_name):
+    f = open(file_name)
+    try:
+        return json.load(f)
+    finally:
+        f.close()
+
+
+def compare_results(old, new, threshold=1.2):
+    """Compare two sets of results (as returned by `run_benchmarks`
+    or `load_results`).  Returns a list of (name, param, old time, new
+    time, ratio, regressed) tuples, where `regressed` is True if the
+    new time is more than `threshold` times the old one.
+    """
+    def _key(r):
+        return (r['name'], json.dumps(r['param']))
+    old_map = dict((_key(r), r) for r in old['results'] if 'error' not in r)
+    result = []
+    for r in new['results']:
+        o = old_map.get(_key(r))
+        if o is None or 'error' in r:
+            continue
+        ratio = r['min']/o['min'] if o['min'] > 0 else float('inf')
+        result.append((r['name'], r['param'], o['min'], r['min'], ratio,
+                       ratio > threshold))
+    return result
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+"""Script to run the benchmarks and compare results.
+
+Run all the benchmarks and save the results::
+
+    $ python run.py -o results.json
+
+Compare two saved runs, this exits with a non-zero status if any
+benchmark is slower than the given threshold::
+
+    $ python run.py --compare old.json new.json
+
+"""
+# Copyright (c) 2013,  Enthought, Inc.
+# License: BSD Style.
+
+import sys
+from optparse import OptionParser
+
+from common import find_benchmarks, run_benchmarks, save_results, \
+     load_results, compare_results
+
+# The modules containing the benchmarks.
+BENCHMARK_MODULES = ['bench_tvtk', 'bench_mayavi']
+
+
+def get_modules(names):
+    modules = []
+    for name in names:
+        try:
+            modules.append(__import__(name))
+        except ImportError, e:
+            print "Skipping %s: %s"%(name, e)
+    return modules
+
+
+def print_comparison(comparison):
+    print '%-45s %10s %10s %8s'%('benchmark', 'old (s)', 'new (s)', 'ratio')
+    print '-'*76
+    for name, param, old, new, ratio, regressed in comparison:
+        flag = '  SLOWER' if regressed else ''
+        print '%-45s %10.4f %10.4f %8.2f%s'%('%s(%s)'%(name, param),
+                                             old, new, ratio, flag)
+
+
+def main():
+    usage = """usage: %prog [options]
+       %prog --compare old.json new.json"""
+    parser = OptionParser(usage)
+    parser.add_option("-o", "--output", action="store", type="string",
+                      dest="output", default='',
+                      help="Save the results to this JSON file.")
+    parser.add_option("-k", "--match", action="store", type="string",
+                      dest="match", default=None,
+                      help="Only run benchmarks whose name matches "
+                           "this regular expression.")
+    parser.add_option("-q", "--quick", action="store_true",
+                      dest="quick", default=False,
+                      help="Run with small sizes only (for CI).")
+    parser.add_option("-n", "--no-fork", action="store_false",
+                      dest="fork", default=True,
+                      help="Run all benchmarks in this process.")
+    parser.add_option("-c", "--compare", action="store_true",
+                      dest="compare", default=False,
+                      help="Compare two result files.")
+    parser.add_option("-t", "--threshold", action="store", type="float",
+                      dest="threshold", default=1.2,
+                      help="Ratio of new/old time above which a "
+                           "benchmark is considered a regression "
+                           "(default: 1.2).")
+    (options, args) = parser.parse_args()
+
+    if options.compare:
+        if len(args) != 2:
+            parser.error("--compare needs two result files.")
+        old, new = [load_results(x) for x in args]
+        comparison = compare_results(old, new, options.threshold)
+        print_comparison(comparison)
+        return any(c[-1] for c in comparison)
+
+    modules = get_modules(BENCHMARK_MODULES)
+    benchmarks = find_benchmarks(modules, options.match)
+    results = run_benchmarks(benchmarks, quick=options.quick,
+                             fork=options.fork)
+    if options.output:
+        save_results(results, options.output)
+    return any('error' in r for r in results['results'])
+
+
+if __name__ == '__main__':
+    sys.exit(main())
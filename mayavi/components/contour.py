@@ -5,25 +5,94 @@ minimum and maximum value or explicitly specify the contours.  This
 component may be used for any input data.  The component also provides
 a convenient option to create "filled contours".
 
+The extracted contours can be cached, so that going back to contour
+values used recently does not execute the contour filter again.  When a
+single contour is moved, the neighbouring values along the direction
+of the move are then extracted in a background thread.
+
 """
 # Author: Prabhu Ramachandran <prabhu_r@users.sf.net>
 # Copyright (c) 2005, Enthought, Inc.
 # License: BSD Style.
 
 # Standard library imports.
+import logging
+import threading
+import Queue
+
 import numpy
 
 # Enthought library imports.
 from traits.api import Instance, List, Tuple, Bool, Range, \
-                                 Float, Property
+                                 Float, Property, Any
 from tvtk.api import tvtk
 
 # Local imports.
 from mayavi.core.component import Component
 from mayavi.core.common import error
+from mayavi.core.lru_cache import LRUCache
 from mayavi.components.common \
      import get_module_source, convert_to_poly_data
 
+# Setup a logger for this module.
+logger = logging.getLogger(__name__)
+
+# The settings of the contour filters changing the contours extracted.
+FILTER_SETTINGS = ('compute_normals', 'compute_gradients',
+                   'compute_scalars', 'clipping', 'scalar_mode',
+                   'generate_triangles', 'generate_contour_edges')
+
+
+######################################################################
+# `ContourPrecomputer` class.
+######################################################################
+class ContourPrecomputer(object):
+    """Extracts contours in a background thread and puts them in a
+    cache.  Submitting new tasks cancels the tasks not yet done.
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+        self._generation = 0
+        self._queue = Queue.Queue()
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def submit(self, data, filled, tasks):
+        """Extracts the contours for each (key, filter) of `tasks` from
+        `data`, which must not be modified afterwards."""
+        self._generation += 1
+        self._queue.put((self._generation, data, filled, tasks))
+
+    def stop(self):
+        self._generation += 1
+        self._queue.put(None)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            generation, data, filled, tasks = item
+            if generation != self._generation:
+                continue
+            try:
+                if filled:
+                    data = convert_to_poly_data(data)
+                for key, cf in tasks:
+                    if generation != self._generation:
+                        break
+                    if key in self.cache:
+                        continue
+                    cf.input = data
+                    cf.update()
+                    output = tvtk.PolyData()
+                    output.shallow_copy(cf.output)
+                    self.cache.put(key, output)
+            except Exception:
+                logger.exception('Precomputing contours failed')
+
 
 ######################################################################
 # `Contour` class.
@@ -89,6 +158,22 @@ class Contour(Component):
     auto_update_range = Bool(True,
                              desc='if the contour range is updated automatically')
 
+    # The memory, in megabytes, used to cache the extracted contours.
+    # The cache is disabled if 0.
+    cache_size = Range(0, 100000, 0, enter_set=True, auto_set=False,
+                       desc='the memory in MB used to cache the contours')
+
+    # The number of neighbouring contour values extracted in the
+    # background, in each direction, when a single contour is moved
+    # with the cache enabled.  The VTK 5 Python wrappers keep the
+    # global interpreter lock while the contour filter executes, so the
+    # background thread does not run concurrently with the GUI there:
+    # it uses the idle time between moves, but an extraction in
+    # progress delays the next update.
+    precompute_neighbors = Range(0, 100, 2, enter_set=True, auto_set=False,
+                                 desc='the number of neighbouring contours '
+                                      'extracted in the background')
+
     ########################################
     # The component's view
 
@@ -142,13 +227,31 @@ class Contour(Component):
     _fill_cont_filt = Instance(tvtk.BandedPolyDataContourFilter, args=(),
                                kw={'clipping': 1, 'scalar_mode':'value'})
 
+    # The cache of the extracted contours, None if disabled.
+    _cache = Any
+
+    # The output used when the cache is enabled.
+    _cache_output = Instance(tvtk.PolyData, args=())
+
+    # The background extraction of the neighbouring contours.
+    _precomputer = Any
+
+    # The (input, modification time, copy) of the input copied for the
+    # background extraction.
+    _precompute_input = Any
+
+    # The last change of the value of a single explicit contour.
+    _contour_step = Float(0.0)
+
     ######################################################################
     # `object` interface
     ######################################################################
     def __get_pure_state__(self):
         d = super(Contour, self).__get_pure_state__()
         # These traits are dynamically created.
-        for name in ('_data_min', '_data_max', '_default_contour'):
+        for name in ('_data_min', '_data_max', '_default_contour',
+                     '_cache', '_cache_output', '_precomputer',
+                     '_precompute_input', '_contour_step'):
             d.pop(name, None)
 
         return d
@@ -165,7 +268,7 @@ class Contour(Component):
         """
         if not self._has_input():
             return
-        cf = self._set_contour_input()
+        self._set_contour_input()
         first = False
         if len(self._current_range) == 0:
             first = True
@@ -176,7 +279,8 @@ class Contour(Component):
             self.contours = [(cr[0] + cr[1])/2]
             self.minimum_contour = cr[0]
             self.maximum_contour = cr[1]
-        self.outputs = [cf.output]
+        self._execute()
+        self.outputs = [self._get_output()]
 
     def update_data(self):
         """Override this method to do what is necessary when upstream
@@ -186,9 +290,21 @@ class Contour(Component):
         sends a `data_changed` event.
         """
         self._update_ranges()
+        if self._cache is not None and self._has_input():
+            self._execute()
         # Propagage the data changed event.
         self.data_changed = True
 
+    ######################################################################
+    # `Base` interface
+    ######################################################################
+    def stop(self):
+        """Invoked when this object is removed from the mayavi
+        pipeline.
+        """
+        self._stop_precomputer()
+        super(Contour, self).stop()
+
     ######################################################################
     # Non-public methods.
     ######################################################################
@@ -199,8 +315,10 @@ class Contour(Component):
         added, removed, index = (list_event.added, list_event.removed,
                                  list_event.index)
         if len(added) == len(removed):
+            if len(added) == 1:
+                self._contour_step = added[0] - removed[0]
             cf.set_value(index, added[0])
-            cf.update()
+            self._execute()
             self.data_changed = True
         else:
             self._contours_changed(self.contours)
@@ -212,7 +330,7 @@ class Contour(Component):
         cf.number_of_contours = len(values)
         for i, x in enumerate(values):
             cf.set_value(i, x)
-        cf.update()
+        self._execute()
         self.data_changed = True
 
     def _update_ranges(self):
@@ -273,15 +391,133 @@ class Contour(Component):
             self.contour_filter.generate_values(self.number_of_contours,
                                                 min(minc, maxc),
                                                 max(minc, maxc))
+            if self._cache is not None:
+                self._execute()
             self.data_changed = True
 
     def _filled_contours_changed(self, val):
         if not self._has_input():
             return
-        cf = self._set_contour_input()
+        self._set_contour_input()
         # This will trigger a change.
         self._auto_contours_changed(self.auto_contours)
-        self.outputs = [cf.output]
+        self.outputs = [self._get_output()]
+
+    def _cache_size_changed(self, value):
+        if value > 0:
+            if self._cache is None:
+                self._cache = LRUCache(value*2**20)
+            else:
+                self._cache.max_bytes = value*2**20
+        else:
+            self._stop_precomputer()
+            self._cache = None
+        if self._has_input():
+            self._execute()
+            self.outputs = [self._get_output()]
+            self.data_changed = True
+
+    def _get_output(self):
+        """Returns the output of the component, the contour filter's
+        or the one the cached contours are copied to."""
+        if self._cache is None:
+            return self.contour_filter.output
+        return self._cache_output
+
+    def _filter_settings(self, cf):
+        return tuple((name, getattr(cf, name)) for name in FILTER_SETTINGS
+                     if hasattr(cf, name))
+
+    def _cache_key(self, values):
+        """Returns the key of the contours with the given values for the
+        current input and contour filter settings."""
+        # The values are rounded so that values differing by rounding
+        # errors, like the ones computed for the precomputation, match.
+        span = max(self._data_max - self._data_min, 1e-300)
+        values = tuple(round((v - self._data_min)/span, 9) for v in values)
+        inp = tvtk.to_vtk(self.inputs[0].outputs[0])
+        return (inp.GetMTime(), self.filled_contours,
+                self._filter_settings(self.contour_filter), values)
+
+    def _execute(self):
+        """Updates the contour filter, or copies the contours from the
+        cache to the output if they are there."""
+        cf = self.contour_filter
+        cache = self._cache
+        if cache is None:
+            cf.update()
+            return
+        values = [cf.get_value(i) for i in range(cf.number_of_contours)]
+        key = self._cache_key(values)
+        data = cache.get(key)
+        if data is None:
+            # Drop the contours of outdated input data.
+            cache.discard(lambda k: k[0] != key[0])
+            cf.update()
+            data = tvtk.PolyData()
+            data.shallow_copy(cf.output)
+            cache.put(key, data)
+        self._cache_output.shallow_copy(data)
+        self._precompute(values)
+
+    def _precompute(self, values):
+        """Extracts the contours of the values next to a single moving
+        contour in the background."""
+        n, step = self.precompute_neighbors, self._contour_step
+        if n == 0 or step == 0 or self.auto_contours or len(values) != 1:
+            return
+        cf = self.contour_filter
+        settings = dict(self._filter_settings(cf))
+        tasks = []
+        for i in range(1, n + 1):
+            for value in (values[0] + i*step, values[0] - i*step):
+                if not self._data_min <= value <= self._data_max:
+                    continue
+                key = self._cache_key([value])
+                if key in self._cache:
+                    continue
+                f = cf.__class__(**settings)
+                f.set_value(0, value)
+                tasks.append((key, f))
+        if len(tasks) == 0:
+            return
+        if self._precomputer is None:
+            self._precomputer = ContourPrecomputer(self._cache)
+        self._precomputer.submit(self._get_precompute_input(),
+                                 self.filled_contours, tasks)
+
+    def _get_precompute_input(self):
+        """Returns the copy of the input used by the background thread,
+        made again when the input changes."""
+        inp = tvtk.to_vtk(self.inputs[0].outputs[0])
+        cached = self._precompute_input
+        if cached is not None and cached[0] is inp and \
+               cached[1] == inp.GetMTime():
+            return cached[2]
+        # VTK caches the ranges of arrays and the bounds of points in
+        # them when they are read, so the thread must not share the
+        # scalars and the points read by the contour filter with the
+        # live input.  The other arrays are shared.
+        data = inp.NewInstance()
+        data.ShallowCopy(inp)
+        scalars = inp.GetPointData().GetScalars()
+        if scalars is not None:
+            copy = scalars.NewInstance()
+            copy.DeepCopy(scalars)
+            data.GetPointData().SetScalars(copy)
+        if inp.IsA('vtkPointSet') and inp.GetPoints() is not None:
+            points = inp.GetPoints().NewInstance()
+            points.DeepCopy(inp.GetPoints())
+            data.SetPoints(points)
+        data = tvtk.to_tvtk(data)
+        self._precompute_input = (inp, inp.GetMTime(), data)
+        return data
+
+    def _stop_precomputer(self):
+        if self._precomputer is not None:
+            self._precomputer.stop()
+            self._precomputer = None
+        self._precompute_input = None
 
     def _get_contour_filter(self):
         if self.filled_contours:
@@ -0,0 +1,53 @@
+"""
+Conversion of the arrays of the point and cell data of datasets to and
+from lists of numpy arrays, keeping track of the active attributes.
+
+This is used by the helpers that compute their output with numpy, such
+as the sorted threshold index and the parallel seed tracer.
+"""
+# Copyright (c) 2013, Enthought, Inc.
+# License: BSD Style.
+
+from tvtk.api import tvtk
+from tvtk.array_handler import array2vtk
+
+
+# The attributes that are kept active.
+ATTRIBUTES = ('scalars', 'vectors', 'normals', 'tensors', 't_coords')
+
+
+######################################################################
+# Utility functions.
+######################################################################
+def get_attribute_arrays(data):
+    """Returns the arrays of the `tvtk.PointData` or `tvtk.CellData`
+    `data` as a list of (name, active attribute or None, array).  The
+    arrays are views of the VTK arrays.  Arrays that are not data
+    arrays, string arrays for example, are skipped.
+    """
+    active = {}
+    for name in ATTRIBUTES:
+        arr = getattr(data, name)
+        if arr is not None:
+            active[tvtk.to_vtk(arr)] = name
+    result = []
+    for i in range(data.number_of_arrays):
+        arr = data.get_array(i)
+        if arr is not None:
+            result.append((arr.name, active.get(tvtk.to_vtk(arr)),
+                           arr.to_array()))
+    return result
+
+
+def set_attribute_arrays(data, arrays):
+    """Adds the (name, active attribute or None, array) `arrays` to the
+    `tvtk.PointData` or `tvtk.CellData` `data`.  The VTK arrays use the
+    memory of contiguous numpy arrays.
+    """
+    for name, attribute, values in arrays:
+        arr = tvtk.to_tvtk(array2vtk(values))
+        arr.name = name
+        if attribute is None:
+            data.add_array(arr)
+        else:
+            setattr(data, attribute, arr)
@@ -0,0 +1,209 @@
+"""
+Joint execution of the independent branches of a pipeline.
+
+When a source with several filters attached to it fires a
+`data_changed` event, the filters are normally updated one after the
+other by the event handlers.  When parallel updates are enabled on the
+engine (`Engine.parallel_update`), the `BranchExecutor` first brings
+the VTK pipelines of all the sibling branches up to date and waits for
+them to finish.  The usual event handlers then run on the main thread
+as before, but find the data already computed.
+
+The branches are updated on a pool of worker threads.  This is an
+experimental option with restrictions:
+
+ - The VTK executives are not thread safe, and every branch walks up
+   the executive of the shared input while it updates.  The shared
+   input is brought up to date first, but this is not guaranteed to be
+   safe for every VTK version and filter.
+
+ - Any VTK observer or trait handler fired while a filter executes,
+   for example a `ModifiedEvent` observer that renders, runs on a
+   worker thread.
+
+ - The VTK 5 Python wrappers keep the global interpreter lock while a
+   filter executes, so the branches do not run concurrently there.
+   Threads only help with VTK builds that release the lock.
+"""
+# Copyright (c) 2013, Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import logging
+import threading
+import traceback
+import weakref
+from multiprocessing import cpu_count
+from multiprocessing.pool import ThreadPool
+
+# Enthought library imports.
+from traits.api import HasTraits, Int
+from tvtk.api import tvtk
+
+# Local imports.
+from mayavi.core.common import get_engine
+
+# Setup a logger for this module.
+logger = logging.getLogger(__name__)
+
+
+######################################################################
+# Utility functions.
+######################################################################
+def _is_filter(obj):
+    from mayavi.core.filter import Filter
+    return isinstance(obj, Filter)
+
+
+def _get_filters(obj):
+    """Return a list of `obj` and all the filters below it."""
+    result = [obj]
+    for child in result:
+        result.extend(c for c in getattr(child, 'children', [])
+                      if _is_filter(c))
+    return result
+
+
+def get_branches(obj):
+    """Return the independent branches below the pipeline object `obj`
+    as a list of (filters, outputs) tuples, one for each filter that is
+    a child of `obj`.  `filters` are all the filters of the branch and
+    `outputs` the outputs of the filters at its leaves, updating these
+    updates the whole branch.
+    """
+    branches = []
+    for child in getattr(obj, 'children', []):
+        if not _is_filter(child) or not child.running:
+            continue
+        filters = _get_filters(child)
+        outputs = []
+        for f in filters:
+            if not [c for c in f.children if _is_filter(c)]:
+                outputs.extend(f.outputs)
+        branches.append((filters, outputs))
+    return branches
+
+
+def _get_mtime(obj):
+    """Return the largest modification time of the outputs of `obj`."""
+    return max([tvtk.to_vtk(output).GetMTime()
+                for output in obj.outputs] or [0])
+
+
+def update_outputs(outputs):
+    """Update the given datasets, this is run on a worker thread.
+    Returns the formatted traceback if an error occurs, None
+    otherwise."""
+    try:
+        for output in outputs:
+            output.update()
+    except Exception:
+        return traceback.format_exc()
+
+
+######################################################################
+# `BranchExecutor` class.
+######################################################################
+class BranchExecutor(HasTraits):
+    """Updates the sibling branches of a pipeline together on a pool
+    of threads.  There is a single instance, `executor`, used by all
+    the engines that have `parallel_update` set.
+    """
+
+    # The number of threads to use, if 0 the number of CPUs is used.
+    n_threads = Int(0)
+
+    ######################################################################
+    # `object` interface.
+    ######################################################################
+    def __init__(self, **traits):
+        super(BranchExecutor, self).__init__(**traits)
+        # The engines using parallel updates.
+        self._engines = weakref.WeakKeyDictionary()
+        # The filters updated by the last parallel update whose own
+        # data_changed events can be ignored, with the modification
+        # time of their outputs after the update.
+        self._fresh = weakref.WeakKeyDictionary()
+        self._pool = None
+
+    ######################################################################
+    # `BranchExecutor` interface.
+    ######################################################################
+    def register(self, engine):
+        """Use parallel updates for the pipeline of `engine`."""
+        self._engines[engine] = True
+
+    def unregister(self, engine):
+        """Stop using parallel updates for the pipeline of `engine`."""
+        self._engines.pop(engine, None)
+        if len(self._engines) == 0:
+            self._fresh.clear()
+            self.close()
+
+    def is_active(self):
+        """Return True if any engine uses parallel updates."""
+        return len(self._engines) > 0
+
+    def update_branches(self, obj):
+        """Update the branches below `obj` and return when they are all
+        done.  This is called when `obj` fires its
+        `data_changed` event, before the children handle the event.
+        """
+        mtime = self._fresh.pop(obj, None)
+        if mtime is not None and mtime == _get_mtime(obj):
+            # Already updated along with its parent, and not changed
+            # since.
+            return
+        if not isinstance(threading.current_thread(),
+                          threading._MainThread):
+            return
+        if get_engine(obj) not in self._engines:
+            return
+
+        branches = get_branches(obj)
+        if len(branches) < 2:
+            return
+
+        # Update the shared input here so the branches only execute
+        # their own filters.
+        for output in obj.outputs:
+            output.update()
+
+        tasks = [outputs for filters, outputs in branches]
+        errors = self._get_pool().map(update_outputs, tasks)
+
+        fresh = self._fresh
+        fresh.clear()
+        for filters, outputs in branches:
+            for f in filters:
+                fresh[f] = _get_mtime(f)
+        for error in errors:
+            if error is not None:
+                # The branch is updated again when its filter handles
+                # the event, which reports the error on the main thread.
+                logger.warning('Error updating a branch in parallel:\n%s',
+                               error)
+
+    def close(self):
+        """Stop the worker threads."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+
+    ######################################################################
+    # Non-public interface.
+    ######################################################################
+    def _get_pool(self):
+        if self._pool is None:
+            n = self.n_threads
+            if n <= 0:
+                n = cpu_count()
+            self._pool = ThreadPool(n)
+        return self._pool
+
+    def _n_threads_changed(self):
+        self.close()
+
+
+# The global executor.
+executor = BranchExecutor()
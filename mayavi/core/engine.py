@@ -28,6 +28,8 @@ from mayavi.core.base import Base
 from mayavi.core.scene import Scene
 from mayavi.core.common import error, process_ui_events
 from mayavi.core.registry import registry
+from mayavi.core.profiler import profiler
+from mayavi.core.branch_executor import executor
 from mayavi.core.adder_node import AdderNode, SceneAdderNode
 from mayavi.preferences.api import preference_manager
 from mayavi.core.ui.mayavi_scene import viewer_factory
@@ -103,6 +105,13 @@ class Engine(HasStrictTraits):
     # The recorder for script recording.
     recorder = Instance(Recorder, record=False)
 
+    # Update the sibling branches of the pipeline together on worker
+    # threads when data changes (see `mayavi.core.branch_executor` for
+    # the restrictions).
+    parallel_update = Bool(False, record=False,
+                           desc='if independent branches of the '
+                                'pipeline are updated in parallel')
+
     ########################################
     # Private traits.
 
@@ -200,6 +209,8 @@ class Engine(HasStrictTraits):
         if scene is None:
             self.new_scene()
             scene = self.current_scene
+        if profiler.enabled:
+            profiler.instrument()
         scene.add_child(src)
         self.current_object = src
 
@@ -219,6 +230,8 @@ class Engine(HasStrictTraits):
             return
         if (obj is not None) and (not isinstance(obj, Scene)):
             if obj.running:
+                if profiler.enabled:
+                    profiler.instrument()
                 obj.add_child(fil)
                 self.current_object = fil
             else:
@@ -486,6 +499,42 @@ class Engine(HasStrictTraits):
         """
         return None
 
+    ######################################################################
+    # Profiling related methods.
+    ######################################################################
+    def start_profiling(self, reset=True):
+        """Start recording the calls to the expensive methods of the
+        pipeline objects (see `mayavi.core.profiler`).  Note that
+        profiling is turned on for all the engines.  If `reset` is
+        True, previously recorded data is discarded.
+        """
+        if reset:
+            profiler.reset()
+        profiler.enable()
+
+    def stop_profiling(self):
+        """Stop recording the profiling data.  The data recorded so far
+        is still available from `get_profile`.
+        """
+        profiler.disable()
+
+    def get_profile(self, sort_by='total_time'):
+        """Return the `ProfileRecord`s of the objects in this engine
+        sorted in decreasing order of the given attribute.  Each record
+        gives the number of calls, the total, last and inclusive times
+        and the size of the output of one method of one object.
+        """
+        records = profiler.get_records(self._get_pipeline_objects())
+        records.sort(key=lambda r: getattr(r, sort_by), reverse=True)
+        return records
+
+    def show_profile(self):
+        """Show a table of the profiling data of this engine."""
+        from mayavi.core.ui.profile_view import ProfileView
+        view = ProfileView(engine=self)
+        view.edit_traits()
+        return view
+
     ######################################################################
     # Non-public interface
     ######################################################################
@@ -545,6 +594,26 @@ class Engine(HasStrictTraits):
         self._current_selection = object
         self.trait_property_changed('current_selection', old, object)
 
+    def _get_pipeline_objects(self):
+        """Return a list of all the objects in the pipeline including
+        the TVTK scenes."""
+        result = []
+        def _add(node):
+            result.append(node)
+            for child in getattr(node, 'children', []):
+                _add(child)
+        for scene in self.scenes:
+            _add(scene)
+            if scene.scene is not None:
+                result.append(scene.scene)
+        return result
+
+    def _parallel_update_changed(self, value):
+        if value:
+            executor.register(self)
+        else:
+            executor.unregister(self)
+
     def _on_scene_closed(self, obj, name, old, new):
         self.remove_scene(obj.scene)
 
@@ -0,0 +1,388 @@
+"""
+Level-of-detail (LOD) rendering for interactive scenes.
+
+The `LODManager` swaps the inputs of the mappers in a scene for reduced
+versions of their datasets while the user interacts with the camera
+and restores the full resolution data when the interaction ends.  The
+reduced datasets are built on a background thread so that they never
+block the UI.
+"""
+# Copyright (c) 2013, Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import math
+import threading
+import logging
+
+# Enthought library imports.
+from traits.api import HasTraits, Instance, Bool, Int, Enum, Dict, \
+     List, Any, on_trait_change
+from tvtk.api import tvtk
+
+# Local imports.
+from mayavi.core.scene import Scene
+
+# Setup a logger for this module.
+logger = logging.getLogger(__name__)
+
+
+######################################################################
+# Utility functions.
+######################################################################
+def _traverse(node):
+    """Generator yielding all the objects below (and including)
+    `node` in the mayavi pipeline."""
+    for child in getattr(node, 'children', []):
+        for obj in _traverse(child):
+            yield obj
+    yield node
+
+
+def reduce_dataset(data, budget, method='quadric_clustering'):
+    """Return a reduced version of the given `data` (a tvtk dataset)
+    that has roughly `budget` cells (or points for image data).
+
+    `method` is one of 'quadric_clustering', 'quadric_decimation',
+    'decimate_pro' or 'mask_points' and is used for poly data.  Image
+    data is always shrunk with a `tvtk.ImageShrink3D` filter and other
+    datasets have their surface extracted first.  Returns `None` if
+    the data is already within the budget.
+    """
+    if data.is_a('vtkImageData'):
+        n = data.number_of_points
+        if n <= budget:
+            return None
+        factor = int(math.ceil((float(n)/budget)**(1.0/3)))
+        f = tvtk.ImageShrink3D(shrink_factors=(factor, factor, factor),
+                               averaging=False)
+    else:
+        n_cells = data.number_of_cells
+        n_polys = 0
+        if data.is_a('vtkPolyData'):
+            n_polys = data.number_of_polys + data.number_of_strips
+        if max(n_cells, data.number_of_points) <= budget:
+            return None
+        if not data.is_a('vtkPolyData'):
+            surf = tvtk.DataSetSurfaceFilter(input=data)
+            surf.update()
+            data = surf.output
+            n_polys = data.number_of_polys + data.number_of_strips
+            n_cells = data.number_of_cells
+            if n_cells <= budget:
+                return data
+        if n_polys == 0 or method == 'mask_points':
+            ratio = int(math.ceil(float(data.number_of_points)/budget))
+            f = tvtk.MaskPoints(on_ratio=max(ratio, 1),
+                                maximum_number_of_points=budget,
+                                generate_vertices=True)
+        elif method == 'quadric_clustering':
+            # A surface clustered on a d^3 grid has roughly 2*d^2
+            # triangles.
+            div = max(int(math.sqrt(budget/2.0)), 2)
+            f = tvtk.QuadricClustering(number_of_x_divisions=div,
+                                       number_of_y_divisions=div,
+                                       number_of_z_divisions=div)
+        else:
+            reduction = 1.0 - float(budget)/n_cells
+            if method == 'quadric_decimation':
+                tri = tvtk.TriangleFilter(input=data)
+                tri.update()
+                data = tri.output
+                f = tvtk.QuadricDecimation(target_reduction=reduction)
+            else:
+                f = tvtk.DecimatePro(target_reduction=reduction,
+                                     preserve_topology=False)
+    f.input = data
+    f.update()
+    output = f.output
+    result = output.new_instance()
+    result.shallow_copy(output)
+    return result
+
+
+######################################################################
+# `LODManager` class.
+######################################################################
+class LODManager(HasTraits):
+    """ Manages level-of-detail rendering for a mayavi scene.
+
+        When enabled, the mappers of the actors and volumes of every
+        module in the scene are fed a reduced version of their data
+        during interaction.  The reduced datasets are computed on a
+        background thread when the data changes (or the first time an
+        interaction happens) and the full resolution data is restored
+        when the interaction ends.  While a reduced dataset is still
+        being built, the full resolution data is rendered.
+
+        The number of cells used for a module is its `lod_budget`
+        trait, or `default_budget` if the module's budget is negative.
+        A budget of zero disables level-of-detail for that module.
+    """
+
+    # The scene we manage.
+    scene = Instance(Scene)
+
+    # Enable level-of-detail rendering.
+    enabled = Bool(False, desc='if reduced data is rendered during '
+                               'interaction')
+
+    # The default budget (number of cells or image points) for modules
+    # whose `lod_budget` is negative.
+    default_budget = Int(100000, desc='the default number of cells '
+                                      'rendered during interaction')
+
+    # The method used to reduce poly data.
+    method = Enum('quadric_clustering', 'quadric_decimation',
+                  'decimate_pro', 'mask_points',
+                  desc='the method used to reduce the data')
+
+    # Are we interacting?
+    interacting = Bool(False)
+
+    #--------------------------------------------------------------------------
+    # Private traits
+    #--------------------------------------------------------------------------
+
+    # The reduced datasets, keyed on the id of the full resolution
+    # dataset.  The values are tuples of (key, reduced data) where key
+    # is (MTime, budget, method).
+    _cache = Dict
+
+    # The keys of the datasets currently being built.
+    _pending = Dict
+
+    # Lock protecting the `_cache` and `_pending` dictionaries.
+    _lock = Any
+
+    # The (mapper, full resolution input, reduced input) of the
+    # mappers that currently render reduced data.
+    _swapped = List
+
+    # The VTK observer ids on the interactor.
+    _observer_ids = List(Int)
+
+    # The interactor the observers were added to.
+    _interactor = Any
+
+    ######################################################################
+    # `object` interface
+    ######################################################################
+    def __init__(self, **traits):
+        super(LODManager, self).__init__(**traits)
+        self._lock = threading.Lock()
+
+    ######################################################################
+    # `LODManager` interface
+    ######################################################################
+    def get_budget(self, module):
+        """Return the LOD budget for the given module."""
+        budget = getattr(module, 'lod_budget', -1)
+        if budget < 0:
+            budget = self.default_budget
+        return budget
+
+    def prepare(self, wait=False):
+        """Schedule the computation of any reduced datasets that are
+        missing or out of date.  This is done automatically, it is
+        useful to call this once the data is setup to avoid rendering
+        the first interaction at full resolution.  If `wait` is True,
+        this returns only when the reduced datasets are computed.
+        """
+        threads = []
+        mappers = self._get_mappers()
+        current = set(id(m.input) for m, b in mappers)
+        lock = self._lock
+        lock.acquire()
+        try:
+            # Forget about data that is no longer displayed.
+            for data_id in self._cache.keys():
+                if data_id not in current:
+                    del self._cache[data_id]
+        finally:
+            lock.release()
+
+        for mapper, budget in mappers:
+            data = mapper.input
+            if data is None:
+                continue
+            key = (data.m_time, budget, self.method)
+            data_id = id(data)
+            lock.acquire()
+            try:
+                entry = self._cache.get(data_id)
+                if entry is not None and entry[0] == key:
+                    continue
+                if self._pending.get(data_id) == key:
+                    continue
+                self._pending[data_id] = key
+            finally:
+                lock.release()
+            # A shallow copy shares the arrays but lets the background
+            # thread run the filters without touching the pipeline.
+            data.update()
+            copy = data.new_instance()
+            copy.shallow_copy(data)
+            t = threading.Thread(target=self._build,
+                                 args=(data_id, key, copy, budget))
+            t.setDaemon(True)
+            t.start()
+            threads.append(t)
+
+        if wait:
+            for t in threads:
+                t.join()
+
+    def clear(self):
+        """Restore full resolution rendering and clear the cache."""
+        self._restore()
+        lock = self._lock
+        lock.acquire()
+        try:
+            self._cache.clear()
+            # The datasets being built are dropped when they are done.
+            self._pending.clear()
+        finally:
+            lock.release()
+
+    def start_interaction(self):
+        """Switch all mappers with available reduced data to the
+        reduced data."""
+        self.interacting = True
+        if not self.enabled or self.scene is None:
+            return
+        # Anything that is stale will be ready for the next interaction.
+        self.prepare()
+        swapped = self._swapped
+        scene = self.scene.scene
+        if scene is not None:
+            status = scene.disable_render
+            scene.disable_render = True
+        try:
+            for mapper, budget in self._get_mappers():
+                data = mapper.input
+                if data is None:
+                    continue
+                key = (data.m_time, budget, self.method)
+                entry = self._cache.get(id(data))
+                if entry is not None and entry[0] == key and \
+                       entry[1] is not None:
+                    swapped.append((mapper, data, entry[1]))
+                    mapper.input = entry[1]
+        finally:
+            if scene is not None:
+                scene.disable_render = status
+
+    def end_interaction(self):
+        """Restore the full resolution data."""
+        self.interacting = False
+        self._restore()
+
+    ######################################################################
+    # Non-public interface
+    ######################################################################
+    def _get_mappers(self):
+        """Return a list of (mapper, budget) for all the mappers of the
+        modules in the scene that have a non-zero budget."""
+        from mayavi.core.module import Module
+        result = []
+        if self.scene is None:
+            return result
+        for obj in _traverse(self.scene):
+            if not isinstance(obj, Module) or not obj.visible:
+                continue
+            budget = self.get_budget(obj)
+            # Volumes rendering multi-resolution data handle
+            # interaction themselves.
+            if budget == 0 or getattr(obj, 'multi_resolution', False):
+                continue
+            for actor in obj.actors:
+                mapper = getattr(actor, 'mapper', None)
+                if mapper is None or not hasattr(mapper, 'input'):
+                    continue
+                # Volume mappers only accept image data as reduced data.
+                data = mapper.input
+                if mapper.is_a('vtkAbstractVolumeMapper') and \
+                       (data is None or not data.is_a('vtkImageData')):
+                    continue
+                result.append((mapper, budget))
+        return result
+
+    def _build(self, data_id, key, data, budget):
+        """Build the reduced dataset, this is run on a worker thread."""
+        try:
+            result = reduce_dataset(data, budget, key[2])
+        except Exception:
+            # No UI dialogs from a worker thread, just log it.
+            logger.exception('Unable to build the reduced dataset')
+            result = None
+        lock = self._lock
+        lock.acquire()
+        try:
+            if self._pending.get(data_id) == key:
+                del self._pending[data_id]
+                self._cache[data_id] = (key, result)
+        finally:
+            lock.release()
+
+    def _restore(self):
+        swapped = self._swapped
+        if len(swapped) == 0:
+            return
+        scene = self.scene.scene
+        if scene is not None:
+            status = scene.disable_render
+            scene.disable_render = True
+        try:
+            for mapper, data, reduced in swapped:
+                # Only restore if the pipeline has not changed the
+                # input in the meanwhile.
+                if mapper.input is reduced:
+                    mapper.input = data
+        finally:
+            self._swapped = []
+            if scene is not None:
+                scene.disable_render = status
+        if scene is not None:
+            scene.render()
+
+    def _on_interaction(self, vtk_obj, event):
+        if event == 'StartInteractionEvent':
+            self.start_interaction()
+        else:
+            self.end_interaction()
+
+    def _setup_observers(self, enable):
+        # The observers are removed from the interactor they were added
+        # to, the scene may have another one now.
+        iren = self._interactor
+        if iren is not None:
+            for id in self._observer_ids:
+                iren.remove_observer(id)
+        self._observer_ids = []
+        self._interactor = None
+        scene = self.scene
+        if not enable or scene is None or scene.scene is None:
+            return
+        iren = scene.scene.interactor
+        if iren is None:
+            return
+        self._observer_ids = [
+            iren.add_observer('StartInteractionEvent',
+                              self._on_interaction),
+            iren.add_observer('EndInteractionEvent',
+                              self._on_interaction)]
+        self._interactor = iren
+
+    @on_trait_change('scene.scene.interactor')
+    def _interactor_changed(self):
+        # The interactor is created when the scene is activated, and
+        # changes with the scene.
+        self._setup_observers(self.enabled)
+
+    def _enabled_changed(self, value):
+        self._setup_observers(value)
+        if value:
+            self.prepare()
+        else:
+            self.clear()
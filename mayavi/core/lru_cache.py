@@ -0,0 +1,115 @@
+"""
+A thread safe least recently used cache with a memory budget.
+
+The cache is used to keep the results of expensive filter executions,
+like extracted iso-surfaces, so that going back to previously used
+parameters does not execute the filter again.  The least recently used
+entries are dropped when the total size of the entries exceeds the
+budget.
+"""
+# Copyright (c) 2013, Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import threading
+from collections import OrderedDict
+
+
+######################################################################
+# Utility functions.
+######################################################################
+def data_size(obj):
+    """Returns the size in bytes of a tvtk or VTK data object, or of a
+    numpy array.  Other objects are considered to have no size."""
+    if hasattr(obj, 'nbytes'):
+        return obj.nbytes
+    vtk_obj = getattr(obj, '_vtk_obj', obj)
+    if hasattr(vtk_obj, 'GetActualMemorySize'):
+        # The size is given in kibibytes.
+        return vtk_obj.GetActualMemorySize()*1024
+    return 0
+
+
+######################################################################
+# `LRUCache` class.
+######################################################################
+class LRUCache(object):
+    """A least recently used cache holding at most `max_bytes` bytes of
+    values, as measured by the `size` function (`data_size` by
+    default).  A value larger than the whole budget is not cached.  All
+    the methods may be called from any thread.
+    """
+
+    def __init__(self, max_bytes, size=data_size):
+        self._max_bytes = max_bytes
+        self._size = size
+        self._entries = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def get(self, key, default=None):
+        """Returns the value cached for `key`, making it the most
+        recently used, or `default` if there is none."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return default
+            self._entries[key] = entry
+            return entry[0]
+
+    def put(self, key, value):
+        """Caches `value` for `key` and drops the least recently used
+        entries if the budget is exceeded."""
+        nbytes = self._size(value)
+        with self._lock:
+            self._pop(key)
+            if nbytes > self._max_bytes:
+                return
+            self._entries[key] = (value, nbytes)
+            self._nbytes += nbytes
+            self._shrink()
+
+    def discard(self, predicate):
+        """Removes the entries whose key satisfies `predicate`."""
+        with self._lock:
+            for key in [k for k in self._entries if predicate(k)]:
+                self._pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+    def _get_max_bytes(self):
+        return self._max_bytes
+
+    def _set_max_bytes(self, value):
+        with self._lock:
+            self._max_bytes = value
+            self._shrink()
+
+    max_bytes = property(_get_max_bytes, _set_max_bytes,
+                         doc='The budget of the cache, in bytes.')
+
+    nbytes = property(lambda self: self._nbytes,
+                      doc='The total size of the cached values, in bytes.')
+
+    ######################################################################
+    # Non-public interface.
+    ######################################################################
+    def _pop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._nbytes -= entry[1]
+
+    def _shrink(self):
+        while self._nbytes > self._max_bytes and self._entries:
+            key, (value, nbytes) = self._entries.popitem(last=False)
+            self._nbytes -= nbytes
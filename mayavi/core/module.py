@@ -6,7 +6,7 @@
 # License: BSD Style.
 
 # Enthought library imports.
-from traits.api import List, Instance, Str
+from traits.api import List, Instance, Str, Int
 
 # Local imports
 from mayavi.core.pipeline_base import PipelineBase
@@ -36,9 +36,21 @@ class Module(PipelineBase):
     # components when the component traits are set in the handler.
     components = List(record=False)
 
+    # The number of cells (points for image data) this module's actors
+    # may render while the scene is being interacted with, when
+    # level-of-detail rendering is enabled on the scene's
+    # `lod_manager`.  A negative value uses the manager's default
+    # budget and zero always renders at full resolution.
+    lod_budget = Int(-1, desc='the number of cells rendered during '
+                              'interaction')
+
     # The icon
     icon = Str('module.ico')
 
+    # The (VTK object, observer id) of the observers added on the scene
+    # for `_get_scene_observers`.
+    _scene_observers = List(record=False)
+
     # The human-readable type for this object
     type = Str(' module')
 
@@ -59,7 +71,7 @@ class Module(PipelineBase):
 
     def __get_pure_state__(self):
         d = super(Module, self).__get_pure_state__()
-        for x in ('module_manager', 'components'):
+        for x in ('module_manager', 'components', '_scene_observers'):
             d.pop(x, None)
         return d
 
@@ -129,6 +141,8 @@ class Module(PipelineBase):
         # Call parent method to set the running state.
         super(Module, self).start()
 
+        self._update_scene_observers()
+
     def stop(self):
         """Invoked when this object is removed from the mayavi
         pipeline.
@@ -146,6 +160,8 @@ class Module(PipelineBase):
         # Call parent method to set the running state.
         super(Module, self).stop()
 
+        self._update_scene_observers()
+
     def add_child(self, child):
         """This method intelligently adds a child to this object in
         the MayaVi pipeline.
@@ -210,10 +226,35 @@ class Module(PipelineBase):
         src.on_trait_event(self.update_data, 'data_changed',
                            remove=True)
 
+    def _get_scene_observers(self, scene):
+        """Override this method to observe VTK events of the scene
+        while the module is running.  Returns a list of (VTK object,
+        event, callback) tuples, where the objects are usually the
+        `interactor` or the `renderer` of `scene`.
+        """
+        return []
+
+    def _update_scene_observers(self):
+        """Removes the observers on the scene and adds those given by
+        `_get_scene_observers` if the module is running.  Call this when
+        the observers needed change."""
+        for obj, id in self._scene_observers:
+            obj.remove_observer(id)
+        self._scene_observers = []
+        scene = self.scene
+        if not self.running or scene is None:
+            return
+        observers = []
+        for obj, event, callback in self._get_scene_observers(scene):
+            if obj is not None:
+                observers.append((obj, obj.add_observer(event, callback)))
+        self._scene_observers = observers
+
     def _scene_changed(self, old_scene, new_scene):
         for component in self.components:
             component.scene = new_scene
         super(Module, self)._scene_changed(old_scene, new_scene)
+        self._update_scene_observers()
 
     def _components_changed(self, old, new):
         self._handle_components(old, new)
@@ -5,7 +5,9 @@ An off-screen mayavi engine.
 # Copyright (c) 2008, Enthought, Inc.
 # License: BSD Style.
 
-from traits.api import Callable, Str
+import weakref
+
+from traits.api import Callable, Str, HasTraits, Instance, Int, List
 from tvtk.pyface.tvtk_scene import TVTKWindow
 from mayavi.core.engine import Engine
 from mayavi.preferences.api import set_scene_preferences
@@ -20,6 +22,96 @@ def off_screen_viewer_factory(size=(400, 350)):
     win.scene.set_size(size)
     return win
 
+
+def reset_scene(scene):
+    """Cheaply resets a `TVTKScene` so it looks like a freshly created
+    one: all the props are removed and the camera and the preferences
+    are reset.  The render window, renderer and interactor are kept.
+    """
+    old = scene.disable_render
+    scene.disable_render = True
+    try:
+        scene.renderer.remove_all_view_props()
+        scene.camera.set(position=(0, 0, 1), focal_point=(0, 0, 0),
+                         view_up=(0, 1, 0), view_angle=30.0,
+                         parallel_scale=1.0)
+        scene.parallel_projection = False
+        set_scene_preferences(scene)
+    finally:
+        scene.disable_render = old
+
+
+################################################################################
+# `ScenePool` class.
+################################################################################
+class ScenePool(HasTraits):
+    """A pool of warm offscreen viewers.  Viewers released to the pool
+    are reset and handed out again when a scene is requested, which
+    avoids creating a new render window, renderer and interactor for
+    every figure of a batch script.
+    """
+
+    # The maximum number of idle viewers kept in the pool.
+    max_size = Int(4)
+
+    # The factory used to create viewers when none is available.
+    factory = Callable(off_screen_viewer_factory)
+
+    # The number of viewers created and reused by the pool.
+    n_created = Int(0)
+    n_reused = Int(0)
+
+    # The idle viewers.
+    _idle = List
+
+    ######################################################################
+    # `ScenePool` interface
+    ######################################################################
+    def get(self, size=(400, 350)):
+        """Returns a viewer of the given size, reusing an idle one if
+        possible.  A viewer of the same size is preferred, otherwise an
+        idle viewer is resized."""
+        size = tuple(size)
+        if len(self._idle) == 0:
+            self.n_created += 1
+            return self.factory(size=size)
+        index = -1
+        for i, v in enumerate(self._idle):
+            if tuple(v.scene.get_size()) == size:
+                index = i
+                break
+        viewer = self._idle.pop(index)
+        if index == -1:
+            viewer.scene.set_size(size)
+        self.n_reused += 1
+        return viewer
+
+    def release(self, viewer):
+        """Resets the viewer and keeps it in the pool.  Returns False
+        if the pool is full, in which case the viewer should be closed
+        by the caller."""
+        if len(self._idle) >= self.max_size or viewer in self._idle:
+            return False
+        reset_scene(viewer.scene)
+        self._idle.append(viewer)
+        return True
+
+    def clear(self):
+        """Closes all the idle viewers."""
+        while self._idle:
+            self._idle.pop().scene.close()
+
+    def __len__(self):
+        return len(self._idle)
+
+    ######################################################################
+    # Non-public interface
+    ######################################################################
+    def _max_size_changed(self, value):
+        while len(self._idle) > max(value, 0):
+            self._idle.pop(0).scene.close()
+
+
 ################################################################################
 # `OffScreenEngine` class.
 ################################################################################
@@ -29,3 +121,47 @@ class OffScreenEngine(Engine):
 
     # Our name.
     name = Str('Mayavi offscreen Engine')
+
+    # An optional pool of scenes.  When set, closed scenes are reset
+    # and kept warm to be reused by `new_scene` (and hence
+    # `mlab.figure`) instead of being destroyed.
+    scene_pool = Instance(ScenePool)
+
+    # The viewers of the pool whose events are observed by the engine.
+    _pooled_viewers = Instance(weakref.WeakKeyDictionary, ())
+
+    ######################################################################
+    # `Engine` interface
+    ######################################################################
+    def new_scene(self, viewer=None, name=None, **kwargs):
+        pool = self.scene_pool
+        if viewer is None and pool is not None:
+            pool.factory = self.scene_factory
+            viewer = pool.get(kwargs.get('size', (400, 350)))
+            if viewer in self._pooled_viewers:
+                # A reused viewer, the engine already observes its
+                # events.
+                if name is not None:
+                    viewer.name = name
+                self._viewer_ref[viewer.scene] = viewer
+                self.add_scene(viewer.scene)
+                return viewer
+            self._pooled_viewers[viewer] = True
+        return super(OffScreenEngine, self).new_scene(viewer, name,
+                                                      **kwargs)
+
+    def close_scene(self, scene):
+        pool = self.scene_pool
+        viewer = self.get_viewer(scene)
+        if pool is None or viewer is None or \
+                not isinstance(viewer, TVTKWindow):
+            return super(OffScreenEngine, self).close_scene(scene)
+        scene._mouse_pick_dispatcher.clear_callbacks()
+        self.remove_scene(scene.scene)
+        if not pool.release(viewer):
+            viewer.scene.close()
+
+    def stop(self):
+        if self.scene_pool is not None:
+            self.scene_pool.clear()
+        super(OffScreenEngine, self).stop()
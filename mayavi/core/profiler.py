@@ -0,0 +1,281 @@
+"""
+Opt-in profiling of the hot paths of the Mayavi pipeline.
+
+When enabled, the `PipelineProfiler` wraps the methods that do the work
+in a pipeline -- `update_pipeline` and `update_data` of filters and
+modules, `ModuleManager.update`, the `update` and `update_data` methods
+of sources (which read the data) and `TVTKScene.render` -- and records,
+for each object, the number of calls, the time taken and the size of
+the data produced.
+
+The times recorded for an object exclude the time spent in the
+instrumented methods of other objects called from it (for example the
+downstream filters updated when a filter changes its outputs), so the
+node with the largest `total_time` is the one to optimize.  The
+`inclusive_time` includes the time of these nested calls.
+
+Profiling is off by default and costs nothing until it is first
+enabled.  Use the `Engine.start_profiling` and `Engine.get_profile`
+methods or the profile table of the engine view to use it.
+"""
+# Copyright (c) 2013, Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import threading
+import weakref
+from timeit import default_timer
+
+# Enthought library imports.
+from traits.api import HasTraits, Bool, Str, Int, Float, WeakRef, \
+     Property
+
+
+######################################################################
+# Utility functions.
+######################################################################
+def _get_targets():
+    """Return a list of (base class, method names) to instrument."""
+    from mayavi.core.filter import Filter
+    from mayavi.core.module import Module
+    from mayavi.core.module_manager import ModuleManager
+    from mayavi.core.source import Source
+    from tvtk.pyface.tvtk_scene import TVTKScene
+    return [(Filter, ('update_pipeline', 'update_data')),
+            (Module, ('update_pipeline', 'update_data')),
+            (ModuleManager, ('update',)),
+            (Source, ('update', 'update_data')),
+            (TVTKScene, ('render',))]
+
+
+def _all_subclasses(cls):
+    """Return `cls` and all its (currently imported) subclasses."""
+    result = [cls]
+    for klass in result:
+        for sub in type.__subclasses__(klass):
+            if sub not in result:
+                result.append(sub)
+    return result
+
+
+def get_output_size(obj):
+    """Return the size in bytes of the outputs of the given pipeline
+    object, 0 if it has none."""
+    size = 0
+    for output in getattr(obj, 'outputs', []):
+        get_size = getattr(output, 'get_actual_memory_size', None)
+        if get_size is not None:
+            # VTK reports the size in kibibytes.
+            size += get_size()*1024
+    return size
+
+
+def get_object_name(obj):
+    """Return a name suitable to identify `obj` in a table."""
+    name = getattr(obj, 'name', '')
+    if not name:
+        name = obj.__class__.__name__
+    return name
+
+
+######################################################################
+# `ProfileRecord` class.
+######################################################################
+class ProfileRecord(HasTraits):
+    """The profiling data for one method of one object."""
+
+    # The object profiled.
+    object = WeakRef(HasTraits, allow_none=True)
+
+    # The name of the object.
+    name = Str
+
+    # The class of the object.
+    class_name = Str
+
+    # The method profiled.
+    method = Str
+
+    # The number of calls.
+    calls = Int
+
+    # The total time spent in the method excluding nested profiled
+    # calls of other objects.
+    total_time = Float
+
+    # The time spent in the last call.
+    last_time = Float
+
+    # The total time including the nested profiled calls.
+    inclusive_time = Float
+
+    # The average time of a call.
+    mean_time = Property(Float, depends_on='calls, total_time')
+
+    # The size in bytes of the outputs after the last call.
+    bytes = Int
+
+    def _get_mean_time(self):
+        if self.calls == 0:
+            return 0.0
+        return self.total_time/self.calls
+
+    def __repr__(self):
+        return '<%s.%s: %d calls, %.4f s>'%(self.name, self.method,
+                                             self.calls, self.total_time)
+
+
+######################################################################
+# `PipelineProfiler` class.
+######################################################################
+class PipelineProfiler(HasTraits):
+    """Records calls to the expensive methods of the pipeline objects.
+    There is a single instance of this class, `profiler`, since the
+    methods are instrumented on the classes.
+    """
+
+    # Is profiling enabled?
+    enabled = Bool(False)
+
+    ######################################################################
+    # `object` interface.
+    ######################################################################
+    def __init__(self, **traits):
+        super(PipelineProfiler, self).__init__(**traits)
+        # Mapping of object -> {method name: ProfileRecord}.
+        self._records = weakref.WeakKeyDictionary()
+        # The original functions indexed by (class, method name).
+        self._originals = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    ######################################################################
+    # `PipelineProfiler` interface.
+    ######################################################################
+    def enable(self):
+        """Start recording."""
+        self.instrument()
+        self.enabled = True
+
+    def disable(self):
+        """Stop recording.  The records are kept until `reset` is
+        called."""
+        self.enabled = False
+
+    def reset(self):
+        """Discard all the records."""
+        self._lock.acquire()
+        try:
+            self._records.clear()
+        finally:
+            self._lock.release()
+
+    def instrument(self):
+        """Wrap the profiled methods of all the pipeline classes
+        imported so far.  This is safe to call repeatedly and is called
+        by the engine when objects are added to the pipeline so that
+        classes imported after profiling was enabled are profiled too.
+        """
+        originals = self._originals
+        for base, names in _get_targets():
+            for cls in _all_subclasses(base):
+                for name in names:
+                    func = cls.__dict__.get(name)
+                    if func is None or (cls, name) in originals:
+                        continue
+                    originals[(cls, name)] = func
+                    setattr(cls, name, self._make_wrapper(func, name))
+
+    def uninstrument(self):
+        """Restore the original methods of all the classes."""
+        for (cls, name), func in self._originals.items():
+            setattr(cls, name, func)
+        self._originals.clear()
+        self.enabled = False
+
+    def get_records(self, objects=None):
+        """Return a list of all the `ProfileRecord`s.  If `objects` is
+        given, only the records of these objects are returned.
+        """
+        self._lock.acquire()
+        try:
+            if objects is None:
+                items = self._records.items()
+            else:
+                records = self._records
+                items = [(obj, records[obj]) for obj in objects
+                         if obj in records]
+            result = []
+            for obj, methods in items:
+                result.extend(methods.values())
+        finally:
+            self._lock.release()
+        return result
+
+    def call(self, obj, method, func, args, kw):
+        """Call `func(obj, *args, **kw)` and record it as a call of
+        `method` on `obj`."""
+        stack = self._get_stack()
+        if stack and stack[-1][0] is obj and stack[-1][1] == method:
+            # An overridden method calling its parent, this is a
+            # part of the call being recorded.
+            return func(obj, *args, **kw)
+
+        frame = [obj, method, 0.0]
+        stack.append(frame)
+        t0 = default_timer()
+        try:
+            return func(obj, *args, **kw)
+        finally:
+            elapsed = default_timer() - t0
+            stack.pop()
+            if stack:
+                stack[-1][2] += elapsed
+            self._record(obj, method, elapsed - frame[2], elapsed)
+
+    ######################################################################
+    # Non-public interface.
+    ######################################################################
+    def _make_wrapper(self, func, method):
+        profiler = self
+        def wrapper(self, *args, **kw):
+            if not profiler.enabled:
+                return func(self, *args, **kw)
+            return profiler.call(self, method, func, args, kw)
+        wrapper.__name__ = func.__name__
+        wrapper.__doc__ = func.__doc__
+        wrapper.__dict__.update(func.__dict__)
+        return wrapper
+
+    def _get_stack(self):
+        local = self._local
+        stack = getattr(local, 'stack', None)
+        if stack is None:
+            stack = local.stack = []
+        return stack
+
+    def _record(self, obj, method, self_time, inclusive_time):
+        nbytes = get_output_size(obj)
+        self._lock.acquire()
+        try:
+            methods = self._records.get(obj)
+            if methods is None:
+                methods = self._records[obj] = {}
+            record = methods.get(method)
+            if record is None:
+                record = ProfileRecord(object=obj,
+                                       name=get_object_name(obj),
+                                       class_name=obj.__class__.__name__,
+                                       method=method)
+                methods[method] = record
+            record.set(calls=record.calls + 1,
+                       total_time=record.total_time + self_time,
+                       last_time=self_time,
+                       inclusive_time=record.inclusive_time + inclusive_time,
+                       bytes=nbytes)
+        finally:
+            self._lock.release()
+
+
+# The global profiler.
+profiler = PipelineProfiler()
@@ -58,6 +58,11 @@ class Scene(Base):
         'mayavi.core.mouse_pick_dispatcher.MousePickDispatcher',
         record=False)
 
+    # The level-of-detail manager.  Set `lod_manager.enabled` to render
+    # reduced data while interacting with the scene.
+    lod_manager = Instance('mayavi.core.lod_manager.LODManager',
+                           record=False)
+
     ######################################################################
     # `object` interface
     ######################################################################
@@ -66,6 +71,7 @@ class Scene(Base):
         d = super(Scene, self).__get_pure_state__()
         d['scene'] = self.scene
         d.pop('_mouse_pick_dispatcher', None)
+        d.pop('lod_manager', None)
         return d
 
     def __set_pure_state__(self, state):
@@ -141,6 +147,12 @@ class Scene(Base):
         if not self.running:
             return
 
+        # Make sure the full resolution data is restored, without
+        # creating a manager if none was used.
+        lod_manager = self.__dict__.get('lod_manager')
+        if lod_manager is not None:
+            lod_manager.enabled = False
+
         # Disable rendering to accelerate shutting down.
         scene = self.scene
         if scene is not None:
@@ -225,3 +237,7 @@ class Scene(Base):
         from mayavi.core.mouse_pick_dispatcher import \
                         MousePickDispatcher
         return MousePickDispatcher(scene=self)
+
+    def _lod_manager_default(self):
+        from mayavi.core.lod_manager import LODManager
+        return LODManager(scene=self)
@@ -0,0 +1,311 @@
+"""
+Tracing of the streamlines of many seeds on a pool of workers.
+
+The seeds are split in chunks traced independently by worker threads or
+processes, and the streamlines are merged back in the order of the
+seeds.  The streamlines of each seed are cached, so that when only some
+seeds move only those are traced again.
+
+Worker threads are used by default.  They each trace on a shallow copy
+of the dataset, sharing its arrays, since a VTK dataset cannot be the
+input of several pipelines updated at once, and each copy builds its
+own locator.  The VTK 5 Python wrappers keep the global interpreter
+lock while a filter executes, so threads give no speedup there, only
+the cache helps.
+
+Worker processes are optional.  The locators used to find the cells
+containing the points are built before the processes are forked, and
+all the processes share the read-only locators of the dataset.  Forking
+a process that runs a GUI toolkit or other threads may deadlock the
+children, so processes are only safe in scripts without a GUI.
+"""
+# Copyright (c) 2013, Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import os
+from multiprocessing import cpu_count, Pool
+from multiprocessing.pool import ThreadPool
+from Queue import Queue
+
+# Enthought library imports.
+import numpy as np
+from tvtk.api import tvtk
+from tvtk.array_handler import ids2vtkCellArray, ID_TYPE_CODE
+
+# Local imports.
+from mayavi.core.lru_cache import LRUCache
+from mayavi.core.attribute_arrays import get_attribute_arrays, \
+     set_attribute_arrays
+
+
+# The traits of the `tvtk.StreamTracer` used by the workers.
+TRACER_SETTINGS = ('maximum_propagation', 'integration_direction',
+                   'integrator_type', 'initial_integration_step',
+                   'minimum_integration_step', 'maximum_integration_step',
+                   'integration_step_unit', 'maximum_number_of_steps',
+                   'maximum_error', 'terminal_speed', 'compute_vorticity',
+                   'rotation_scale', 'surface_streamlines')
+
+# The dataset traced by the worker processes, set before they are forked.
+_shared = {}
+
+# Marks the seeds missing from the cache, None is a seed without
+# streamlines.
+_MISSING = object()
+
+
+######################################################################
+# `Streamlines` class.
+######################################################################
+class Streamlines(object):
+    """The streamlines of a seed: the `points`, the number of points of
+    each line in `lengths`, and the point and cell data as lists of
+    (name, active attribute or None, array)."""
+
+    def __init__(self, points, lengths, point_data, cell_data):
+        self.points = points
+        self.lengths = lengths
+        self.point_data = point_data
+        self.cell_data = cell_data
+
+    nbytes = property(lambda self: self.points.nbytes +
+                      sum(a.nbytes for n, t, a in
+                          self.point_data + self.cell_data),
+                      doc='The size of the arrays, in bytes.')
+
+
+######################################################################
+# Utility functions.
+######################################################################
+def tracer_settings(stream_tracer):
+    """Returns the (name, value) settings of a `tvtk.StreamTracer`."""
+    return tuple((name, getattr(stream_tracer, name))
+                 for name in TRACER_SETTINGS
+                 if hasattr(stream_tracer, name))
+
+
+def prepare_data(data):
+    """Builds the locator and the links of `data` used to find the
+    cells containing points, so that the workers do not build them."""
+    vtk_data = tvtk.to_vtk(data)
+    for name in ('BuildLocator', 'BuildLinks'):
+        method = getattr(vtk_data, name, None)
+        if method is not None:
+            method()
+
+
+def split_streamlines(points, connectivity, seed_ids, point_data,
+                      cell_data, n_seeds):
+    """Splits the lines traced for `n_seeds` seeds by seed and returns
+    a list of `Streamlines`, or None for the seeds without lines.
+
+    `connectivity` holds the lines in the legacy VTK layout, `seed_ids`
+    the seed of each line and the data are lists of (name, attribute,
+    array).
+    """
+    starts = []
+    i = 0
+    while i < len(connectivity):
+        starts.append(i)
+        i += connectivity[i] + 1
+    lines = [[] for seed in range(n_seeds)]
+    for line, seed in enumerate(seed_ids):
+        lines[int(seed)].append(line)
+
+    result = []
+    for seed_lines in lines:
+        if len(seed_lines) == 0:
+            result.append(None)
+            continue
+        ids = [connectivity[starts[l] + 1:starts[l] + 1 +
+                            connectivity[starts[l]]] for l in seed_lines]
+        lengths = np.array([len(x) for x in ids])
+        ids = np.concatenate(ids)
+        result.append(Streamlines(
+            points[ids], lengths,
+            [(n, t, a[ids]) for n, t, a in point_data],
+            [(n, t, a[seed_lines]) for n, t, a in cell_data]))
+    return result
+
+
+def merge_streamlines(streamlines):
+    """Merges a list of `Streamlines`, or None, in a single one whose
+    lines are in the order of the list.  The 'SeedIds' cell data are
+    the indices in the list.  Returns None if there are no lines."""
+    items = [(i, s) for i, s in enumerate(streamlines) if s is not None]
+    if len(items) == 0:
+        return None
+    first = items[0][1]
+    concat = lambda get: np.concatenate([get(s) for i, s in items])
+    point_data = [(n, t, concat(lambda s: s.point_data[j][2]))
+                  for j, (n, t, a) in enumerate(first.point_data)]
+    cell_data = []
+    for j, (n, t, a) in enumerate(first.cell_data):
+        if n == 'SeedIds':
+            values = np.repeat([i for i, s in items],
+                               [len(s.lengths) for i, s in items])
+            values = values.astype(a.dtype)
+        else:
+            values = concat(lambda s: s.cell_data[j][2])
+        cell_data.append((n, t, values))
+    return Streamlines(concat(lambda s: s.points),
+                       concat(lambda s: s.lengths), point_data, cell_data)
+
+
+def line_connectivity(lengths):
+    """Returns the legacy VTK connectivity of consecutive lines with the
+    given numbers of points."""
+    n_points = np.sum(lengths)
+    cells = np.empty(len(lengths) + n_points, ID_TYPE_CODE)
+    heads = np.cumsum(lengths + 1) - (lengths + 1)
+    ids = np.ones(len(cells), dtype=bool)
+    ids[heads] = False
+    cells[heads] = lengths
+    cells[ids] = np.arange(n_points)
+    return cells
+
+
+def trace_seeds(data, seeds, settings):
+    """Traces the streamlines of the (n, 3) array `seeds` in `data` with
+    a `tvtk.StreamTracer` having the given (name, value) settings, and
+    returns the list of the `Streamlines` of each seed."""
+    st = tvtk.StreamTracer(**dict(settings))
+    st.input = data
+    st.source = tvtk.PolyData(points=seeds)
+    st.update()
+    output = st.output
+    seed_ids = output.cell_data.get_array('SeedIds')
+    if seed_ids is None:
+        if len(seeds) > 1:
+            # The lines cannot be told apart, trace the seeds one by one.
+            return sum([trace_seeds(data, seeds[i:i + 1], settings)
+                        for i in range(len(seeds))], [])
+        seed_ids = np.zeros(output.number_of_lines, int)
+    else:
+        seed_ids = seed_ids.to_array()
+    if output.number_of_lines == 0:
+        return [None]*len(seeds)
+    return split_streamlines(output.points.to_array(),
+                             output.lines.data.to_array(), seed_ids,
+                             get_attribute_arrays(output.point_data),
+                             get_attribute_arrays(output.cell_data),
+                             len(seeds))
+
+
+def _trace_shared(args):
+    """Traces seeds in a worker process, on the shared dataset."""
+    seeds, settings = args
+    return trace_seeds(_shared['data'], seeds, settings)
+
+
+######################################################################
+# `SeedTracer` class.
+######################################################################
+class SeedTracer(object):
+    """Traces streamlines on a pool of `n_workers` threads or processes
+    (the number of CPUs if 0) and caches them by seed, with a budget of
+    `cache_size` bytes.
+
+    Threads are used unless `use_processes` is set, processes are only
+    used where they can be forked.  The worker processes, or the copies
+    of the dataset of the threads, are kept as long as the dataset does
+    not change.
+    """
+
+    def __init__(self, n_workers=0, use_processes=False,
+                 cache_size=100*2**20, chunks_per_worker=4):
+        self.n_workers = n_workers or cpu_count()
+        self.use_processes = use_processes and hasattr(os, 'fork')
+        self.chunks_per_worker = chunks_per_worker
+        self.cache = LRUCache(cache_size)
+        self._key = None
+        self._pool = None
+        self._copies = None
+
+    def trace(self, data, seeds, settings, output):
+        """Traces the streamlines of the (n, 3) array `seeds` in the
+        dataset `data` with the `tvtk.StreamTracer` (name, value)
+        `settings`, and sets the poly data `output` to them.
+        """
+        vtk_data = tvtk.to_vtk(data)
+        key = (vtk_data, vtk_data.GetMTime(), tuple(settings))
+        if key != self._key:
+            self.close()
+            self.cache.clear()
+            prepare_data(data)
+            self._key = key
+
+        seeds = np.asarray(seeds, dtype=float).reshape(-1, 3)
+        cache = self.cache
+        keys = [tuple(seed) for seed in seeds.tolist()]
+        streamlines = [cache.get(k, _MISSING) for k in keys]
+        missing = [i for i, s in enumerate(streamlines) if s is _MISSING]
+        if len(missing) > 0:
+            n_chunks = min(len(missing),
+                           self.n_workers*self.chunks_per_worker)
+            chunks = np.array_split(np.array(missing), n_chunks)
+            traced = self._map(data, [seeds[c] for c in chunks], settings)
+            for chunk, chunk_streamlines in zip(chunks, traced):
+                for i, s in zip(chunk, chunk_streamlines):
+                    streamlines[i] = s
+                    cache.put(keys[i], s)
+        self._set_output(merge_streamlines(streamlines), output)
+
+    def close(self):
+        """Stops the workers and releases the copies of the dataset."""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+        self._copies = None
+        self._key = None
+
+    ######################################################################
+    # Non-public interface.
+    ######################################################################
+    def _map(self, data, tasks, settings):
+        n_workers = min(self.n_workers, len(tasks))
+        if n_workers <= 1:
+            return [trace_seeds(data, seeds, settings) for seeds in tasks]
+        if self.use_processes:
+            if self._pool is None:
+                # Forked now, the workers share the prepared dataset.
+                _shared['data'] = data
+                try:
+                    self._pool = Pool(self.n_workers)
+                finally:
+                    _shared.pop('data', None)
+            return self._pool.map(_trace_shared,
+                                  [(seeds, settings) for seeds in tasks])
+
+        if self._pool is None:
+            self._pool = ThreadPool(self.n_workers)
+            copies = Queue()
+            for i in range(self.n_workers):
+                copy = data.new_instance()
+                copy.shallow_copy(data)
+                prepare_data(copy)
+                copies.put(copy)
+            self._copies = copies
+        copies = self._copies
+
+        def trace(seeds):
+            copy = copies.get()
+            try:
+                return trace_seeds(copy, seeds, settings)
+            finally:
+                copies.put(copy)
+        return self._pool.map(trace, tasks)
+
+    def _set_output(self, streamlines, output):
+        output.initialize()
+        if streamlines is not None:
+            lengths = streamlines.lengths
+            lines = ids2vtkCellArray(line_connectivity(lengths),
+                                     len(lengths))
+            output.points = streamlines.points
+            output.lines = tvtk.to_tvtk(lines)
+            set_attribute_arrays(output.point_data, streamlines.point_data)
+            set_attribute_arrays(output.cell_data, streamlines.cell_data)
+        output.modified()
@@ -21,6 +21,7 @@ from mayavi.core.common import handle_children_state, \
                                          exception, error
 from mayavi.core.pipeline_info import PipelineInfo
 from mayavi.core.adder_node import ModuleFilterAdderNode
+from mayavi.core.branch_executor import executor
 
 ######################################################################
 # Utility functions.
@@ -217,6 +218,12 @@ class Source(PipelineBase):
                 except:
                     exception()
 
+    def _data_changed_fired(self):
+        # Static handlers run before the children's handlers, this
+        # lets the executor update the branches in parallel first.
+        if executor.is_active():
+            executor.update_branches(self)
+
     def _scene_changed(self, old, new):
         super(Source, self)._scene_changed(old, new)
         for obj in self.children:
@@ -0,0 +1,359 @@
+"""
+A sorted index of the scalar ranges of the cells of a dataset, used to
+change thresholds interactively on large datasets.
+
+The minimum and maximum of the scalars of each cell are computed and
+sorted once for each version of the input.  Finding the cells within a
+threshold range is then two binary searches and a gather, and the cells
+found are extracted with vectorized operations into buffers that are
+reused from one query to the next.
+
+Cells can be indexed for the datasets with an implicit topology (image
+data, rectilinear and structured grids).  Points can be indexed for any
+dataset with point scalars.
+"""
+# Copyright (c) 2013, Enthought, Inc.
+# License: BSD Style.
+
+import numpy as np
+
+from tvtk.api import tvtk
+from tvtk.array_handler import ids2vtkCellArray, ID_TYPE_CODE
+
+from mayavi.core.attribute_arrays import get_attribute_arrays, \
+     set_attribute_arrays
+
+
+# The VTK cell types of the cells of the structured datasets and their
+# corners, as offsets along the non degenerate axes, for each number of
+# dimensions of the cells.  Image data and rectilinear grids have
+# lines, pixels and voxels, structured grids lines, quads and
+# hexahedra.
+_CELLS = {
+    'voxel': {1: (3, [(0,), (1,)]),
+              2: (8, [(0, 0), (1, 0), (0, 1), (1, 1)]),
+              3: (11, [(0, 0, 0), (1, 0, 0), (0, 1, 0), (1, 1, 0),
+                       (0, 0, 1), (1, 0, 1), (0, 1, 1), (1, 1, 1)])},
+    'hexahedron': {1: (3, [(0,), (1,)]),
+                   2: (9, [(0, 0), (1, 0), (1, 1), (0, 1)]),
+                   3: (12, [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0),
+                            (0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1)])},
+}
+
+
+######################################################################
+# Utility functions.
+######################################################################
+def cell_ranges(values, dims):
+    """Returns the minimum and the maximum of the point `values` of each
+    cell of a structured grid with the point dimensions `dims`, as flat
+    arrays in the order of the cell ids.  Cells with a NaN value have a
+    NaN range.
+    """
+    lo = hi = np.asarray(values).reshape(tuple(dims)[::-1])
+    for axis in range(3):
+        if lo.shape[axis] == 1:
+            continue
+        first = [slice(None)]*3
+        last = [slice(None)]*3
+        first[axis] = slice(None, -1)
+        last[axis] = slice(1, None)
+        first, last = tuple(first), tuple(last)
+        lo = np.minimum(lo[first], lo[last])
+        hi = np.maximum(hi[first], hi[last])
+    return lo.ravel(), hi.ravel()
+
+
+def cell_points(cell_ids, dims, corners, out=None):
+    """Returns the (n, len(corners)) ids of the points of the given
+    cells of a structured grid with the point dimensions `dims`."""
+    cell_ids = np.asarray(cell_ids, ID_TYPE_CODE)
+    nx, ny = dims[0], dims[1]
+    cx, cy = max(nx - 1, 1), max(ny - 1, 1)
+    rest, i = np.divmod(cell_ids, cx)
+    k, j = np.divmod(rest, cy)
+    base = i + nx*(j + ny*k)
+    strides = (1, nx, nx*ny)
+    axes = [axis for axis in range(3) if dims[axis] > 1]
+    offsets = np.array([sum(c*strides[a] for c, a in zip(corner, axes))
+                        for corner in corners], dtype=ID_TYPE_CODE)
+    if out is None:
+        out = np.empty((len(cell_ids), len(corners)), ID_TYPE_CODE)
+    np.add(base[:, None], offsets, out=out)
+    return out
+
+
+def point_coordinates(data, ids, out):
+    """Writes the coordinates of the points `ids` of the dataset `data`
+    into the (n, 3) array `out`."""
+    if data.is_a('vtkImageData'):
+        nx, ny = data.dimensions[:2]
+        rest, out[:, 0] = np.divmod(ids, nx)
+        out[:, 2], out[:, 1] = np.divmod(rest, ny)
+        out += data.extent[::2]
+        out *= data.spacing
+        out += data.origin
+    elif data.is_a('vtkRectilinearGrid'):
+        nx, ny = data.dimensions[:2]
+        rest, i = np.divmod(ids, nx)
+        k, j = np.divmod(rest, ny)
+        for axis, index in enumerate((i, j, k)):
+            name = 'xyz'[axis] + '_coordinates'
+            out[:, axis] = getattr(data, name).to_array()[index]
+    else:
+        np.take(data.points.to_array(), ids, axis=0, out=out)
+
+
+def _structure(data):
+    """Returns the point dimensions and the kind of cells of a
+    structured dataset, or (None, None) if its cells cannot be
+    indexed."""
+    vtk_data = tvtk.to_vtk(data)
+    for name in ('HasAnyBlankCells', 'HasAnyBlankPoints'):
+        if getattr(vtk_data, name, lambda: False)():
+            return None, None
+    if data.is_a('vtkImageData') or data.is_a('vtkRectilinearGrid'):
+        kind = 'voxel'
+    elif data.is_a('vtkStructuredGrid'):
+        kind = 'hexahedron'
+    else:
+        return None, None
+    dims = tuple(data.dimensions)
+    if max(dims) < 2:
+        return None, None
+    return dims, kind
+
+
+def _scalars(data, by_cells, attribute_mode):
+    """Returns the scalars thresholded, like `tvtk.Threshold` or
+    `tvtk.ThresholdPoints` do, and True if they are point scalars."""
+    ps = data.point_data.scalars
+    if not by_cells:
+        return ps, True
+    cs = data.cell_data.scalars
+    if attribute_mode == 'use_cell_data':
+        return cs, False
+    if attribute_mode == 'use_point_data' or ps is not None:
+        return ps, True
+    return cs, False
+
+
+def _sort(values):
+    """Returns the order of `values` and the sorted values."""
+    order = np.argsort(values)
+    if len(order) < 2**31:
+        order = order.astype(np.int32)
+    return order, values[order]
+
+
+######################################################################
+# `ThresholdIndex` class.
+######################################################################
+class ThresholdIndex(object):
+    """Thresholds the cells, or the points, of a dataset using sorted
+    arrays of their scalar ranges.
+
+    Call `update` with the input, which builds the index if the input
+    changed, then `threshold` as many times as needed.  A cell is kept
+    if all its point values are within the thresholds, like
+    `tvtk.Threshold` does with `all_scalars` on.  The output dataset is
+    the same object for all the queries.  Its cells are in the order of
+    the input cells and its points in the order of the input points.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        """Empties the index and releases its buffers."""
+        # The key of the indexed version of the input.
+        self._key = None
+        self._last = None
+        self._data = None
+        self._by_cells = True
+        self.on_points = True
+        self._dims = None
+        self._cell_type = None
+        self._corners = None
+        # The (order, sorted values) of the minimum and maximum of the
+        # cells, the same for point values.
+        self._by_min = self._by_max = None
+        self._min = self._max = None
+        self._buffers = {}
+        self.range = None
+        self.output = None
+
+    def update(self, data, by_cells=True, attribute_mode='default'):
+        """Builds the index of the cells, or of the points if `by_cells`
+        is False, of the dataset `data` unless it is already built for
+        the current version of the data.  Returns False, and empties the
+        index, if the data cannot be indexed.
+        """
+        scalars, on_points = _scalars(data, by_cells, attribute_mode)
+        dims, kind = None, None
+        if by_cells:
+            dims, kind = _structure(data)
+        elif not (data.is_a('vtkPointSet') or data.is_a('vtkImageData') or
+                  data.is_a('vtkRectilinearGrid')):
+            scalars = None
+        if scalars is None or scalars.number_of_components != 1 or \
+                (by_cells and dims is None):
+            self.clear()
+            return False
+
+        vtk_data = tvtk.to_vtk(data)
+        key = (vtk_data, vtk_data.GetMTime(), tvtk.to_vtk(scalars).GetMTime(),
+               by_cells, on_points)
+        if key == self._key:
+            return True
+
+        output = self.output
+        self.clear()
+        values = scalars.to_array()
+        if by_cells and on_points:
+            self._min, self._max = cell_ranges(values, dims)
+            self._by_min = _sort(self._min)
+            self._by_max = _sort(self._max)
+        else:
+            self._by_min = self._by_max = _sort(values)
+        # NaN values are sorted last.
+        low = self._by_min[1]
+        high = self._by_max[1]
+        n_valid = high.searchsorted(np.inf, 'right')
+        if len(low) == 0 or n_valid == 0:
+            self.range = (np.nan, np.nan)
+        else:
+            self.range = (float(low[0]), float(high[n_valid - 1]))
+
+        # The output is kept when the index is rebuilt.
+        if by_cells:
+            self._dims = dims
+            n_dims = len([n for n in dims if n > 1])
+            self._cell_type, self._corners = _CELLS[kind][n_dims]
+            if output is None or not output.is_a('vtkUnstructuredGrid'):
+                output = tvtk.UnstructuredGrid()
+        elif output is None or not output.is_a('vtkPolyData'):
+            output = tvtk.PolyData()
+        self.output = output
+        self._data = data
+        self._by_cells = by_cells
+        self.on_points = on_points
+        self._key = key
+        return True
+
+    def query(self, lower, upper):
+        """Returns the sorted ids of the cells, or points, whose values
+        are all between `lower` and `upper`."""
+        order, values = self._by_min
+        start = values.searchsorted(lower, 'left')
+        if self._by_max is self._by_min:
+            stop = max(start, values.searchsorted(upper, 'right'))
+            return np.sort(order[start:stop])
+        order_max, values_max = self._by_max
+        stop = values_max.searchsorted(upper, 'right')
+        # Check the other bound on the smaller of the two candidate sets,
+        # the cells with NaN values fail the comparisons.
+        with np.errstate(invalid='ignore'):
+            if len(order) - start < stop:
+                ids = order[start:]
+                ids = ids[self._max[ids] <= upper]
+            else:
+                ids = order_max[:stop]
+                ids = ids[self._min[ids] >= lower]
+        return np.sort(ids)
+
+    def threshold(self, lower, upper):
+        """Extracts the cells, or points, between `lower` and `upper`
+        and returns the output dataset."""
+        last = (self._key, lower, upper)
+        if last == self._last:
+            return self.output
+        ids = self.query(lower, upper)
+        output = self.output
+        output.initialize()
+        if len(ids) > 0:
+            if self._by_cells:
+                self._extract_cells(ids)
+            else:
+                self._extract_points(ids)
+        output.modified()
+        self._last = last
+        return output
+
+    ######################################################################
+    # Non-public interface.
+    ######################################################################
+    def _buffer(self, name, shape, dtype):
+        """Returns the first `shape[0]` rows of the buffer `name`, which
+        is reallocated when it is too small."""
+        buf = self._buffers.get(name)
+        n = shape[0]
+        if buf is None or buf.dtype != dtype or buf.shape[1:] != shape[1:] \
+                or len(buf) < n:
+            if buf is not None and buf.shape[1:] == shape[1:]:
+                # Grow geometrically while the thresholds are scrubbed.
+                n = max(n, 2*len(buf))
+            buf = np.empty((n,) + tuple(shape[1:]), dtype)
+            self._buffers[name] = buf
+        return buf[:shape[0]]
+
+    def _cell_array(self, cells):
+        """Returns a `tvtk.CellArray` wrapping the (n, m) array `cells`
+        in the legacy VTK layout."""
+        return tvtk.to_tvtk(ids2vtkCellArray(cells, len(cells)))
+
+    def _extract_cells(self, ids):
+        data = self._data
+        n_points = int(np.prod(self._dims))
+        corners = self._corners
+        cells = self._buffer('cells', (len(ids), len(corners) + 1),
+                             ID_TYPE_CODE)
+        cells[:, 0] = len(corners)
+        connectivity = cells[:, 1:]
+        cell_points(ids, self._dims, corners, out=connectivity)
+
+        # Keep the used points only and renumber them.
+        used = self._buffer('used', (n_points,), np.bool_)
+        used[:] = False
+        used[connectivity] = True
+        point_ids = np.flatnonzero(used)
+        new_ids = self._buffer('new_ids', (n_points,), ID_TYPE_CODE)
+        new_ids[point_ids] = np.arange(len(point_ids))
+        connectivity[...] = new_ids[connectivity]
+
+        output = self.output
+        output.points = self._coordinates(point_ids)
+        output.set_cells(self._cell_type, self._cell_array(cells))
+        self._gather(data.point_data, output.point_data, point_ids, 'point')
+        self._gather(data.cell_data, output.cell_data, ids, 'cell')
+
+    def _extract_points(self, ids):
+        verts = self._buffer('cells', (len(ids), 2), ID_TYPE_CODE)
+        verts[:, 0] = 1
+        verts[:, 1] = np.arange(len(ids))
+        output = self.output
+        output.points = self._coordinates(ids)
+        output.verts = self._cell_array(verts)
+        self._gather(self._data.point_data, output.point_data, ids, 'point')
+
+    def _coordinates(self, ids):
+        data = self._data
+        if data.is_a('vtkPointSet'):
+            dtype = data.points.to_array().dtype
+        else:
+            dtype = np.float64
+        points = self._buffer('points', (len(ids), 3), dtype)
+        point_coordinates(data, ids, points)
+        return points
+
+    def _gather(self, source, target, ids, prefix):
+        """Copies the values `ids` of the arrays of the attribute data
+        `source` to `target`, keeping the active attributes."""
+        arrays = []
+        for i, (name, attribute, values) in \
+                enumerate(get_attribute_arrays(source)):
+            out = self._buffer((prefix, i), (len(ids),) + values.shape[1:],
+                               values.dtype)
+            np.take(values, ids, axis=0, out=out)
+            arrays.append((name, attribute, out))
+        set_attribute_arrays(target, arrays)
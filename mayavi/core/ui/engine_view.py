@@ -270,13 +270,23 @@ class EngineView(HasTraits):
                 perform=self._perform_record,
             )
 
+        profile = \
+            Action(
+                image=ImageResource('preferences.png',
+                                     search_path=self._image_path),
+                tooltip="Show the time spent in the pipeline objects",
+                defined_when='True',
+                enabled_when='engine is not None',
+                perform=self._perform_profile,
+            )
+
         # Check the record icon if the engine already has a recorder
         # set.
         if self.engine is not None and self.engine.recorder is not None:
             record.checked = True
 
         return [tvtk_docs, Separator(), add_scene, add_source, add_module,
-                add_filter, Separator(), help, record]
+                add_filter, Separator(), help, record, profile]
 
 
     ###########################################################################
@@ -312,6 +322,9 @@ class EngineView(HasTraits):
         else:
             stop_recording(e, save=False)
 
+    def _perform_profile(self):
+        self.engine.show_profile()
+
     def _recorder_changed_for_engine(self, recorder):
         """Called when the recorder trait on the engine trait of this
         object changes.
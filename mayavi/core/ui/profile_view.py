@@ -0,0 +1,119 @@
+"""A table of the profiling data of the pipeline of an engine.
+
+"""
+# Copyright (c) 2013, Enthought, Inc.
+# License: BSD Style.
+
+# Enthought library imports.
+from traits.api import HasTraits, Instance, List, Enum, Button, \
+     on_trait_change
+from traitsui.api import View, Item, HGroup, TabularEditor
+from traitsui.tabular_adapter import TabularAdapter
+
+# Local imports.
+from mayavi.core.engine import Engine
+from mayavi.core.profiler import ProfileRecord, PipelineProfiler, \
+     profiler
+
+
+################################################################################
+# `ProfileAdapter` class.
+################################################################################
+class ProfileAdapter(TabularAdapter):
+
+    columns = [('Object', 'name'),
+               ('Class', 'class_name'),
+               ('Method', 'method'),
+               ('Calls', 'calls'),
+               ('Total (s)', 'total_time'),
+               ('Last (s)', 'last_time'),
+               ('Mean (s)', 'mean_time'),
+               ('Inclusive (s)', 'inclusive_time'),
+               ('Output (KB)', 'bytes')]
+
+    total_time_format = '%.4f'
+    last_time_format = '%.4f'
+    mean_time_format = '%.4f'
+    inclusive_time_format = '%.4f'
+
+    def _get_bytes_text(self):
+        return '%.1f'%(self.item.bytes/1024.0)
+
+
+################################################################################
+# `ProfileView` class.
+################################################################################
+class ProfileView(HasTraits):
+    """Shows the profiling data of the objects of an engine sorted by
+    the time spent in them."""
+
+    # The engine whose pipeline is shown.
+    engine = Instance(Engine)
+
+    # The profiler.
+    profiler = Instance(PipelineProfiler)
+
+    # The records shown.
+    records = List(ProfileRecord)
+
+    # The column to sort by.
+    sort_by = Enum('total_time', 'inclusive_time', 'last_time',
+                   'mean_time', 'calls', 'bytes')
+
+    # Start profiling.
+    start = Button('Start')
+
+    # Stop profiling.
+    stop = Button('Stop')
+
+    # Update the table.
+    refresh = Button('Refresh')
+
+    # Discard the profiling data.
+    reset = Button('Reset')
+
+    view = View(HGroup(Item('start', show_label=False,
+                            enabled_when='not profiler.enabled'),
+                       Item('stop', show_label=False,
+                            enabled_when='profiler.enabled'),
+                       Item('refresh', show_label=False),
+                       Item('reset', show_label=False),
+                       Item('sort_by')),
+                Item('records', show_label=False,
+                     editor=TabularEditor(adapter=ProfileAdapter(),
+                                          editable=False)),
+                title='Mayavi pipeline profile',
+                resizable=True,
+                width=700, height=400)
+
+    ######################################################################
+    # `ProfileView` interface.
+    ######################################################################
+    def update(self):
+        """Update the records from the engine."""
+        if self.engine is not None:
+            self.records = self.engine.get_profile(self.sort_by)
+
+    ######################################################################
+    # Non-public interface.
+    ######################################################################
+    def _profiler_default(self):
+        return profiler
+
+    def _start_fired(self):
+        self.engine.start_profiling(reset=False)
+
+    def _stop_fired(self):
+        self.engine.stop_profiling()
+        self.update()
+
+    def _refresh_fired(self):
+        self.update()
+
+    def _reset_fired(self):
+        self.profiler.reset()
+        self.update()
+
+    @on_trait_change('engine, sort_by')
+    def _update_records(self):
+        self.update()
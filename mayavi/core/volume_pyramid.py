@@ -0,0 +1,165 @@
+"""
+A multi-resolution pyramid of bricks for the volume rendering of large
+image data.
+
+Each level of the pyramid is the previous one subsampled by two along
+each axis.  The levels are split in cubic bricks whose minimum and
+maximum values are kept, so that the bricks that are fully transparent
+for an opacity transfer function are known without looking at the
+voxels again.  The pyramid is built once for a version of the data and
+everything is done on the CPU with numpy.
+"""
+# Copyright (c) 2013, Enthought, Inc.
+# License: BSD Style.
+
+import numpy as np
+
+from tvtk.api import tvtk
+from tvtk import array_handler
+
+
+######################################################################
+# Utility functions.
+######################################################################
+def brick_ranges(values, size):
+    """Returns the minimum and maximum of the bricks of `size` voxels
+    along each axis of the 3D array `values`.  Bricks include the first
+    voxels of their next neighbours, which are used when interpolating
+    near their boundary.  Bricks with a NaN value have a NaN range.
+    """
+    lo = hi = values
+    for axis in range(3):
+        n = values.shape[axis]
+        starts = np.arange(0, n, size)
+        next_lo = np.take(lo, starts[1:], axis=axis)
+        next_hi = np.take(hi, starts[1:], axis=axis)
+        lo = np.minimum.reduceat(lo, starts, axis=axis)
+        hi = np.maximum.reduceat(hi, starts, axis=axis)
+        head = [slice(None)]*3
+        head[axis] = slice(None, -1)
+        head = tuple(head)
+        lo[head] = np.minimum(lo[head], next_lo)
+        hi[head] = np.maximum(hi[head], next_hi)
+    return lo, hi
+
+
+def max_opacity(lo, hi, nodes, clamping=True):
+    """Returns the maximum of the piecewise linear opacity function
+    given by its (x, opacity) `nodes` over each of the ranges [`lo`,
+    `hi`].  Outside the nodes the function is constant if `clamping` is
+    True and zero otherwise.  The result is NaN for NaN ranges.
+    """
+    lo = np.asarray(lo, dtype=float)
+    hi = np.asarray(hi, dtype=float)
+    if len(nodes) == 0:
+        return np.zeros(lo.shape)
+    x, a = np.asarray(sorted(nodes), dtype=float).T
+    if clamping:
+        left, right = a[0], a[-1]
+    else:
+        left = right = 0.0
+    # A linear function reaches its maximum at the ends of the ranges
+    # or at the nodes.
+    result = np.maximum(np.interp(lo, x, a, left, right),
+                        np.interp(hi, x, a, left, right))
+    with np.errstate(invalid='ignore'):
+        for xi, ai in zip(x, a):
+            inside = (lo <= xi) & (xi <= hi)
+            result[inside] = np.maximum(result[inside], ai)
+    return result
+
+
+def opacity_nodes(volume_property):
+    """Returns the (x, opacity) nodes and the clamping of the scalar
+    opacity function of a `tvtk.VolumeProperty`."""
+    otf = volume_property.get_scalar_opacity()
+    if hasattr(otf, 'nodes'):
+        nodes = [(x, otf.get_value(x)) for x in otf.nodes]
+    else:
+        nodes = []
+        val = [0]*4
+        for i in range(otf.size):
+            otf.get_node_value(i, val)
+            nodes.append(tuple(val[:2]))
+    return nodes, otf.clamping
+
+
+def _make_image(values, origin, spacing, name):
+    """Returns a `tvtk.ImageData` with the 3D array `values`, indexed
+    (z, y, x), as point scalars."""
+    nz, ny, nx = values.shape
+    img = tvtk.ImageData(origin=origin, spacing=spacing,
+                         dimensions=(nx, ny, nz))
+    img.extent = 0, nx - 1, 0, ny - 1, 0, nz - 1
+    img.update_extent = 0, nx - 1, 0, ny - 1, 0, nz - 1
+    img.point_data.scalars = values.ravel()
+    img.point_data.scalars.name = name
+    img.scalar_type = array_handler.get_vtk_array_type(values.dtype)
+    return img
+
+
+######################################################################
+# `VolumePyramid` class.
+######################################################################
+class VolumePyramid(object):
+    """The levels and bricks of an image data.
+
+    `levels[0]` is the image data given, `levels[i]` is subsampled by
+    `2**i` along each axis.  Levels are added until the coarsest has at
+    most `min_size` voxels along its largest axis.
+    """
+
+    def __init__(self, data, brick_size=32, min_size=32):
+        self.brick_size = brick_size
+        scalars = data.point_data.scalars
+        dims = tuple(data.dimensions)
+        values = scalars.to_array().reshape(dims[::-1])
+        spacing = np.asarray(data.spacing, dtype=float)
+        origin = np.asarray(data.origin) + spacing*data.extent[::2]
+        self.levels = [data]
+        self.ranges = [brick_ranges(values, brick_size)]
+        self._spacings = [spacing]
+        self._origin = origin
+        while max(values.shape) > min_size:
+            values = values[::2, ::2, ::2].copy()
+            spacing = spacing*2
+            self.levels.append(_make_image(values, tuple(origin),
+                                           tuple(spacing), scalars.name))
+            self.ranges.append(brick_ranges(values, brick_size))
+            self._spacings.append(spacing)
+
+    def level_for(self, budget):
+        """Returns the finest level with at most `budget` voxels."""
+        for i, img in enumerate(self.levels):
+            if img.number_of_points <= budget:
+                return i
+        return len(self.levels) - 1
+
+    def visible_bricks(self, level, nodes, clamping=True):
+        """Returns a boolean (z, y, x) array of the bricks of `level`
+        that are not fully transparent for the opacity function given
+        by its `nodes`."""
+        lo, hi = self.ranges[level]
+        opacity = max_opacity(lo, hi, nodes, clamping)
+        # NaN ranges are kept.
+        return ~(opacity <= 0)
+
+    def visible_bounds(self, level, nodes, clamping=True):
+        """Returns the bounds, in world coordinates, of the box holding
+        all the visible bricks of `level`, or None if there are none."""
+        visible = self.visible_bricks(level, nodes, clamping)
+        if not visible.any():
+            return None
+        dims = self.levels[level].dimensions
+        size = self.brick_size
+        spacing = self._spacings[level]
+        bounds = []
+        # The axes of `visible` are (z, y, x).
+        for axis in range(3):
+            other = tuple(a for a in range(3) if a != 2 - axis)
+            ids = np.flatnonzero(visible.any(axis=other))
+            start = ids[0]*size
+            stop = min((ids[-1] + 1)*size, dims[axis] - 1)
+            bounds.extend([self._origin[axis] + spacing[axis]*start,
+                           self._origin[axis] + spacing[axis]*stop])
+        return tuple(bounds)
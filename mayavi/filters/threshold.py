@@ -11,13 +11,14 @@ import numpy as np
 
 # Enthought library imports.
 from traits.api import Instance, Range, Float, Bool, \
-                                 Property, Enum
+                                 Property, Enum, Any
 from traitsui.api import View, Group, Item
 from tvtk.api import tvtk
 
 # Local imports
 from mayavi.core.filter import Filter
 from mayavi.core.pipeline_info import PipelineInfo
+from mayavi.core.threshold_index import ThresholdIndex
 
 
 ######################################################################
@@ -66,6 +67,16 @@ class Threshold(Filter):
                             'automatically reset when upstream '
                             'data changes')
 
+    # Use a sorted index of the values of the cells, built once for
+    # each version of the input, to threshold.  This makes changing the
+    # thresholds much faster on large datasets at the expense of memory.
+    # The index is used for the cells of image data, rectilinear and
+    # structured grids and for the points of any dataset; the threshold
+    # filter is used otherwise.
+    use_sorted_index = Bool(False, desc='if a sorted index of the '
+                            'values is used to speed up changing the '
+                            'thresholds')
+
     input_info = PipelineInfo(datasets=['any'],
                               attribute_types=['any'],
                               attributes=['any'])
@@ -80,7 +91,8 @@ class Threshold(Filter):
                             Item(name='lower_threshold'),
                             Item(name='auto_reset_lower'),
                             Item(name='upper_threshold'),
-                            Item(name='auto_reset_upper')),
+                            Item(name='auto_reset_upper'),
+                            Item(name='use_sorted_index')),
                       Item(name='_'),
                       Group(Item(name='threshold_filter',
                                  show_label=False,
@@ -107,13 +119,16 @@ class Threshold(Filter):
     # Internal data to
     _first = Bool(True)
 
+    # The sorted index of the values of the input.
+    _index = Any
+
     ######################################################################
     # `object` interface.
     ######################################################################
     def __get_pure_state__(self):
         d = super(Threshold, self).__get_pure_state__()
         # These traits are dynamically created.
-        for name in ('_first', '_data_min', '_data_max'):
+        for name in ('_first', '_data_min', '_data_max', '_index'):
             d.pop(name, None)
 
         return d
@@ -143,7 +158,8 @@ class Threshold(Filter):
         fil.input = self.inputs[0].outputs[0]
 
         self._update_ranges()
-        self._set_outputs([self.threshold_filter.output])
+        self._set_outputs([self._execute(self.lower_threshold,
+                                         self.upper_threshold)])
 
     def update_data(self):
         """Override this method to do what is necessary when upstream
@@ -157,6 +173,14 @@ class Threshold(Filter):
 
         self._update_ranges()
 
+        if self._get_index() is not None:
+            # The index is not part of the VTK pipeline, it has to be
+            # queried again.  This does nothing if the thresholds were
+            # reset and it was already done.
+            self._threshold_between(self.lower_threshold,
+                                    self.upper_threshold)
+            return
+
         # Propagate the data_changed event.
         self.data_changed = True
 
@@ -164,16 +188,62 @@ class Threshold(Filter):
     # Non-public interface
     ######################################################################
     def _lower_threshold_changed(self, new_value):
-        fil = self.threshold_filter
-        fil.threshold_between(new_value, self.upper_threshold)
-        fil.update()
-        self.data_changed = True
+        self._threshold_between(new_value, self.upper_threshold)
 
     def _upper_threshold_changed(self, new_value):
+        self._threshold_between(self.lower_threshold, new_value)
+
+    def _use_sorted_index_changed(self, value):
+        if not value:
+            # Release the memory used by the index.
+            self._index = None
+        if len(self.inputs) > 0:
+            self._threshold_between(self.lower_threshold,
+                                    self.upper_threshold)
+
+    def _threshold_between(self, lower, upper):
+        """Thresholds the input and propagates the change."""
+        output = self._execute(lower, upper)
+        if len(self.outputs) > 0 and self.outputs[0] is not output:
+            self._set_outputs([output])
+        else:
+            self.data_changed = True
+
+    def _execute(self, lower, upper):
+        """Thresholds the input between `lower` and `upper` with the
+        sorted index if it can be used, or the threshold filter, and
+        returns the output."""
+        index = self._get_index()
+        if index is not None:
+            return index.threshold(lower, upper)
         fil = self.threshold_filter
-        fil.threshold_between(self.lower_threshold, new_value)
+        fil.threshold_between(lower, upper)
         fil.update()
-        self.data_changed = True
+        return fil.output
+
+    def _get_index(self):
+        """Returns the sorted index, up to date with the input, or None
+        if it is not used or cannot be used with the input and the
+        settings of the threshold filter."""
+        if not self.use_sorted_index or len(self.inputs) == 0:
+            return None
+        by_cells = self.filter_type == 'cells'
+        attribute_mode = 'default'
+        if by_cells:
+            fil = self._threshold
+            # Only the default component settings and all the points
+            # of the cells in range are supported.
+            if not fil.all_scalars or \
+                    getattr(fil, 'use_continuous_cell_range', False):
+                return None
+            attribute_mode = getattr(fil, 'attribute_mode', 'default')
+        if self._index is None:
+            self._index = ThresholdIndex()
+        index = self._index
+        if not index.update(self.inputs[0].outputs[0], by_cells,
+                            attribute_mode):
+            return None
+        return index
 
     def _update_ranges(self):
         """Updates the ranges of the input.
@@ -203,6 +273,11 @@ class Threshold(Filter):
         ps = input.point_data.scalars
         cs = input.cell_data.scalars
 
+        # The index knows the range of the values it has sorted.
+        index = self._get_index()
+        if index is not None and index.on_points == (ps is not None):
+            return list(index.range)
+
         # FIXME: need to be able to handle cell and point data
         # together.
         if ps is not None:
@@ -255,11 +330,8 @@ class Threshold(Filter):
             return
         fil = new
         fil.input = self.inputs[0].outputs[0]
-        fil.threshold_between(self.lower_threshold,
-                              self.upper_threshold)
-        fil.update()
-        self._set_outputs([fil.output])
+        self._set_outputs([self._execute(self.lower_threshold,
+                                         self.upper_threshold)])
 
     def _threshold_filter_edited(self):
-        self.threshold_filter.update()
-        self.data_changed = True
+        self._threshold_between(self.lower_threshold, self.upper_threshold)
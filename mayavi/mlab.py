@@ -26,11 +26,13 @@ if not 'wx' in sys.modules:
 # Mayavi imports
 from mayavi.tools.camera import view, roll, yaw, pitch, move
 from mayavi.tools.figure import figure, clf, gcf, savefig, \
-    draw, sync_camera, close, screenshot
+    draw, sync_camera, close, screenshot, FrameGrabber
 from mayavi.tools.engine_manager import get_engine, show_pipeline, \
         options, set_engine
 from mayavi.tools.show import show
 from mayavi.tools.animator import animate
+from mayavi.tools.render_farm import render_farm
+from tvtk.tools.tiling import tiled
 
 def show_engine():
     """ This function is deprecated, please use show_pipeline.
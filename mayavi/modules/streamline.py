@@ -13,7 +13,7 @@ from math import sqrt
 
 # Enthought library imports.
 from traits.api import Instance, Bool, TraitPrefixList, Trait, \
-                             Delegate, Button
+                             Delegate, Button, Int, Range, Any
 from traitsui.api import View, Group, Item, InstanceEditor
 from tvtk.api import tvtk
 
@@ -22,6 +22,7 @@ from mayavi.core.module import Module
 from mayavi.core.pipeline_info import PipelineInfo
 from mayavi.components.actor import Actor
 from mayavi.components.source_widget import SourceWidget
+from mayavi.core.seed_tracer import SeedTracer, tracer_settings
 
 
 ######################################################################
@@ -60,6 +61,28 @@ class Streamline(Module):
     # The actor component that represents the visualization.
     actor = Instance(Actor, allow_none=False, record=True)
 
+    # Trace the seeds in chunks on a pool of workers, and cache the
+    # streamlines of each seed so that only the seeds that moved are
+    # traced again.  The settings of `stream_tracer` are used.
+    parallel_tracing = Bool(False, desc='if the seeds are traced in '
+                            'parallel and their streamlines cached')
+
+    # The number of workers tracing the seeds, the number of CPUs if 0.
+    n_workers = Int(0, desc='the number of workers tracing the seeds')
+
+    # Trace in worker processes rather than threads.  The processes
+    # share the cell locator of the input and are used where they can
+    # be forked.  Forking the application while a GUI toolkit runs may
+    # deadlock the workers, so this is only safe in scripts without a
+    # GUI.  Threads do not trace concurrently with the VTK 5 wrappers,
+    # which keep the global interpreter lock.
+    use_processes = Bool(False, desc='if the seeds are traced in worker '
+                         'processes instead of threads')
+
+    # The memory budget of the cache of streamlines, in MB.
+    cache_size = Range(0, 100000, 100, desc='the memory budget of the '
+                       'streamline cache, in MB')
+
     input_info = PipelineInfo(datasets=['any'],
                               attribute_types=['any'],
                               attributes=['vectors'])
@@ -69,6 +92,13 @@ class Streamline(Module):
 
     _first = Bool(True)
 
+    # The streamlines traced in parallel.
+    _streamlines = Instance(tvtk.PolyData, args=())
+
+    # The tracer of the seeds and the key of the last tracing.
+    _seed_tracer = Any
+    _trace_key = Any
+
     ########################################
     # View related code.
 
@@ -114,15 +144,36 @@ class Streamline(Module):
                 Group(Item(name='stream_tracer', style='custom', resizable=True),
                       label='StreamTracer',
                       show_labels=False),
+                Group(Item(name='parallel_tracing'),
+                      Item(name='n_workers',
+                           enabled_when='parallel_tracing'),
+                      Item(name='use_processes',
+                           enabled_when='parallel_tracing'),
+                      Item(name='cache_size',
+                           enabled_when='parallel_tracing'),
+                      label='Parallel'),
                 Group(Item(name='actor', style='custom'),
                       label='Actor',
                       show_labels=False),
                 resizable=True
                 )
 
+    ######################################################################
+    # `object` interface
+    ######################################################################
+    def __get_pure_state__(self):
+        d = super(Streamline, self).__get_pure_state__()
+        for name in ('_streamlines', '_seed_tracer', '_trace_key'):
+            d.pop(name, None)
+        return d
+
     ######################################################################
     # `Module` interface
     ######################################################################
+    def stop(self):
+        super(Streamline, self).stop()
+        self._close_seed_tracer()
+
     def setup_pipeline(self):
         """Override this method so that it *creates* the tvtk
         pipeline.
@@ -189,6 +240,7 @@ class Streamline(Module):
         """
         # Just set data_changed, the components should do the rest if
         # they are connected.
+        self._trace()
         self.data_changed = True
 
     ######################################################################
@@ -197,23 +249,89 @@ class Streamline(Module):
     def _streamline_type_changed(self, value):
         if self.module_manager is None:
             return
-        st = self.stream_tracer
+        if self.parallel_tracing:
+            self._trace()
+            lines = self._streamlines
+        else:
+            lines = self.stream_tracer.output
         rf = self.ribbon_filter
         tf = self.tube_filter
         if value == 'line':
-            self.outputs = [st.output]
+            self.outputs = [lines]
         elif value == 'ribbon':
-            rf.input = st.output
+            rf.input = lines
             self.outputs = [rf.output]
         elif value == 'tube':
-            tf.input = st.output
+            tf.input = lines
             self.outputs = [tf.output]
         self.render()
 
     def _update_streamlines_fired(self):
         self.seed.update_poly_data()
+        self._trace()
         self.render()
 
+    def _trace(self):
+        """Traces the streamlines in parallel, if the seeds, the input
+        or the settings of the stream tracer changed since last time."""
+        mm = self.module_manager
+        if not self.parallel_tracing or mm is None:
+            return
+        data = mm.source.outputs[0]
+        seeds = self.seed.poly_data
+        settings = tracer_settings(self.stream_tracer)
+        key = (tvtk.to_vtk(data), tvtk.to_vtk(data).GetMTime(),
+               tvtk.to_vtk(seeds).GetMTime(), settings)
+        if key == self._trace_key:
+            return
+        self._trace_key = key
+        tracer = self._seed_tracer
+        if tracer is None:
+            tracer = self._seed_tracer = SeedTracer(
+                n_workers=self.n_workers, use_processes=self.use_processes,
+                cache_size=self.cache_size*2**20)
+        points = seeds.points
+        if points is None:
+            points = []
+        else:
+            points = points.to_array()
+        tracer.trace(data, points, settings, self._streamlines)
+
+    def _close_seed_tracer(self):
+        if self._seed_tracer is not None:
+            self._seed_tracer.close()
+        self._seed_tracer = None
+        self._trace_key = None
+
+    def _get_scene_observers(self, scene):
+        if not self.parallel_tracing:
+            return []
+        # The seeds are traced before rendering when they moved.
+        return [(scene.renderer, 'StartEvent',
+                 lambda obj, event: self._trace())]
+
+    def _parallel_tracing_changed(self, value):
+        if not value:
+            self._close_seed_tracer()
+        self._update_scene_observers()
+        self._streamline_type_changed(self.streamline_type)
+
+    def _n_workers_changed(self):
+        self._reset_seed_tracer()
+
+    def _use_processes_changed(self):
+        self._reset_seed_tracer()
+
+    def _cache_size_changed(self):
+        self._reset_seed_tracer()
+
+    def _reset_seed_tracer(self):
+        """Creates the seed tracer again, with the current options."""
+        self._close_seed_tracer()
+        if self.parallel_tracing:
+            self._trace()
+            self.render()
+
     def _stream_tracer_changed(self, old, new):
         if old is not None:
             old.on_trait_change(self.render, remove=True)
@@ -15,7 +15,7 @@ from vtk.util import vtkConstants
 
 # Enthought library imports.
 from traits.api import Instance, Property, List, ReadOnly, \
-     Str, Button, Tuple
+     Str, Button, Tuple, Bool, Int, Range, Any
 from traitsui.api import View, Group, Item, InstanceEditor
 from tvtk.api import tvtk
 from tvtk.util.gradient_editor import hsva_to_rgba, GradientTable
@@ -23,6 +23,7 @@ from tvtk.util.traitsui_gradient_editor import VolumePropertyEditor
 from tvtk.util.ctf import save_ctfs, load_ctfs, \
      rescale_ctfs, set_lut, PiecewiseFunction, ColorTransferFunction
 from apptools.persistence import state_pickler
+from pyface.timer.api import do_later
 
 # Local imports
 from mayavi.core.pipeline_info import PipelineInfo
@@ -30,6 +31,7 @@ from mayavi.core.module import Module
 from mayavi.core.common import error
 from mayavi.core.trait_defs import DEnum
 from mayavi.core.lut_manager import LUTManager
+from mayavi.core.volume_pyramid import VolumePyramid, opacity_nodes
 
 ######################################################################
 # Utility functions.
@@ -202,6 +204,27 @@ class Volume(Module):
     lut_manager = Instance(VolumeLUTManager, args=(), allow_none=False,
                            record=True)
 
+    # Render coarser levels of image data while the scene is interacted
+    # with and refine them, one level at a time, when the interaction
+    # ends.  The levels are built once for each version of the data.
+    multi_resolution = Bool(False, desc='if coarser levels of the data '
+                            'are rendered during interaction')
+
+    # The maximum number of voxels rendered during interaction.
+    interactive_budget = Int(2**21, desc='the maximum number of voxels '
+                             'rendered during interaction')
+
+    # The size, in voxels along each axis, of the bricks the levels are
+    # split in.
+    brick_size = Range(4, 256, 32, desc='the size of the bricks of the '
+                       'levels')
+
+    # Crop the volume to the bricks that are not fully transparent with
+    # the current opacity transfer function, when `multi_resolution` is
+    # on.  This uses the cropping of the volume mapper.
+    skip_empty_bricks = Bool(True, desc='if the fully transparent bricks '
+                             'are cropped away')
+
     input_info = PipelineInfo(datasets=['image_data',
                                         'unstructured_grid'],
                               attribute_types=['any'],
@@ -232,6 +255,15 @@ class Volume(Module):
                             show_labels=False),
                       label='Mapper',
                       ),
+                Group(Item(name='multi_resolution'),
+                      Item(name='interactive_budget',
+                           enabled_when='multi_resolution'),
+                      Item(name='brick_size',
+                           enabled_when='multi_resolution'),
+                      Item(name='skip_empty_bricks',
+                           enabled_when='multi_resolution'),
+                      label='Resolution',
+                      ),
                 Group(Item(name='_volume_property', style='custom',
                            resizable=True),
                       label='Property',
@@ -267,13 +299,32 @@ class Volume(Module):
     # The opacity values.
     _otf = Instance(PiecewiseFunction)
 
+    # The multi-resolution pyramid of the input and its key.
+    _pyramid = Any
+    _pyramid_key = Any
+
+    # The level of the pyramid rendered and the key of the cropping
+    # set for it.
+    _level = Int(0)
+    _cropping_key = Any
+
+    # The (cropping, region planes, region flags) of the mapper, set by
+    # the user, while they are replaced by the cropping to the visible
+    # bricks.
+    _user_cropping = Any
+
+    # Is the scene being interacted with?
+    _interacting = Bool(False)
+
     ######################################################################
     # `object` interface
     ######################################################################
     def __get_pure_state__(self):
         d = super(Volume, self).__get_pure_state__()
         d['ctf_state'] = save_ctfs(self._volume_property)
-        for name in ('current_range', '_ctf', '_otf'):
+        for name in ('current_range', '_ctf', '_otf', '_pyramid',
+                     '_pyramid_key', '_level', '_cropping_key',
+                     '_user_cropping', '_interacting'):
             d.pop(name, None)
         return d
 
@@ -366,6 +417,10 @@ class Volume(Module):
         """
         self._setup_mapper_types()
         self._setup_current_range()
+        if self.multi_resolution:
+            # The pyramid of the new data is only built when it is
+            # needed, by an interaction or the cropping of a render.
+            self._show_level(0)
         self._update_ctf_fired()
         self.data_changed = True
 
@@ -476,6 +531,9 @@ class Volume(Module):
             self._ray_cast_functions = ['']
 
         new_vm.input = mm.source.outputs[0]
+        self._cropping_key = self._user_cropping = None
+        if self.multi_resolution:
+            self._show_level(self._level)
         self.volume.mapper = new_vm
         new_vm.on_trait_change(self.render)
 
@@ -505,3 +563,149 @@ class Volume(Module):
     def _scene_changed(self, old, new):
         super(Volume, self)._scene_changed(old, new)
         self.lut_manager.scene = new
+
+    def _get_scene_observers(self, scene):
+        if not self.multi_resolution:
+            return []
+        iren = scene.interactor
+        observers = [(iren, event, self._on_interaction)
+                     for event in ('StartInteractionEvent',
+                                   'EndInteractionEvent')]
+        # The cropping follows the edits of the opacity function.
+        observers.append((scene.renderer, 'StartEvent',
+                          lambda obj, event: self._update_cropping()))
+        return observers
+
+    ######################################################################
+    # Multi-resolution rendering.
+    ######################################################################
+    def _get_pyramid(self):
+        """Returns the pyramid of the input, built if the input
+        changed, or None if the input has no pyramid."""
+        mm = self.module_manager
+        if not self.multi_resolution or mm is None:
+            return None
+        input = mm.source.outputs[0]
+        sc = input.point_data.scalars
+        if not input.is_a('vtkImageData') or sc is None or \
+               sc.number_of_components != 1:
+            self._pyramid = self._pyramid_key = None
+            return None
+        vtk_input = tvtk.to_vtk(input)
+        key = (vtk_input, vtk_input.GetMTime(), tvtk.to_vtk(sc).GetMTime(),
+               self.brick_size)
+        if key != self._pyramid_key:
+            # Release the previous levels first.
+            self._pyramid = None
+            self._pyramid = VolumePyramid(input, self.brick_size)
+            self._pyramid_key = key
+            self._cropping_key = None
+        return self._pyramid
+
+    def _show_level(self, level):
+        """Makes the mapper render the given level of the pyramid, or
+        the input if there is no pyramid.  The level 0 is the input, the
+        pyramid is not built for it."""
+        vm = self._volume_mapper
+        mm = self.module_manager
+        if vm is None or mm is None:
+            return
+        pyramid = None
+        if level > 0:
+            pyramid = self._get_pyramid()
+        if pyramid is None:
+            level, data = 0, mm.source.outputs[0]
+        else:
+            level = min(level, len(pyramid.levels) - 1)
+            data = pyramid.levels[level]
+        self._level = level
+        if vm.input is not data:
+            vm.input = data
+        # The cropping is updated by the next render.
+        self._cropping_key = None
+
+    def _update_cropping(self):
+        """Crops the mapper to the visible bricks of the level
+        rendered, if the opacity function, the level or the input
+        changed.  This builds the pyramid if needed."""
+        vm = self._volume_mapper
+        if vm is None or not vm.is_a('vtkVolumeMapper'):
+            return
+        pyramid = None
+        if self.multi_resolution and self.skip_empty_bricks:
+            pyramid = self._get_pyramid()
+        crop = pyramid is not None
+        otf = self._volume_property.get_scalar_opacity()
+        key = (crop, self._level, tvtk.to_vtk(otf).GetMTime(), vm)
+        if key == self._cropping_key:
+            return
+        self._cropping_key = key
+        vtk_vm = tvtk.to_vtk(vm)
+        bounds = None
+        if crop:
+            nodes, clamping = opacity_nodes(self._volume_property)
+            bounds = pyramid.visible_bounds(self._level, nodes, clamping)
+        if bounds is None:
+            self._restore_cropping()
+        else:
+            if self._user_cropping is None:
+                self._user_cropping = (vtk_vm.GetCropping(),
+                                       vtk_vm.GetCroppingRegionPlanes(),
+                                       vtk_vm.GetCroppingRegionFlags())
+            vtk_vm.SetCroppingRegionPlanes(bounds)
+            vtk_vm.SetCroppingRegionFlagsToSubVolume()
+            vtk_vm.SetCropping(1)
+        vm.update_traits()
+
+    def _restore_cropping(self):
+        """Restores the cropping of the mapper set by the user, if it
+        was replaced."""
+        saved = self._user_cropping
+        if saved is None:
+            return
+        self._user_cropping = None
+        cropping, planes, flags = saved
+        vtk_vm = tvtk.to_vtk(self._volume_mapper)
+        vtk_vm.SetCroppingRegionPlanes(planes)
+        vtk_vm.SetCroppingRegionFlags(flags)
+        vtk_vm.SetCropping(cropping)
+
+    def _on_interaction(self, vtk_obj, event):
+        if event == 'StartInteractionEvent':
+            self._interacting = True
+            pyramid = self._get_pyramid()
+            if pyramid is not None:
+                self._show_level(pyramid.level_for(self.interactive_budget))
+        else:
+            self._interacting = False
+            if self._level > 0:
+                do_later(self._refine)
+
+    def _refine(self):
+        """Renders the next finer level, until the finest one, unless
+        an interaction started in the meanwhile."""
+        if self._interacting or not self.running or self._level == 0:
+            return
+        self._show_level(self._level - 1)
+        self.render()
+        if self._level > 0:
+            do_later(self._refine)
+
+    def _multi_resolution_changed(self, value):
+        if not value:
+            self._pyramid = self._pyramid_key = None
+        if self.running:
+            self._update_scene_observers()
+            self._show_level(0)
+            self._update_cropping()
+            self.render()
+
+    def _brick_size_changed(self):
+        if self.multi_resolution and self.running:
+            self._show_level(self._level)
+            self.render()
+
+    def _skip_empty_bricks_changed(self):
+        if self.multi_resolution:
+            self._update_cropping()
+            self.render()
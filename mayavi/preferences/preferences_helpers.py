@@ -6,7 +6,7 @@
 
 # Enthought library imports
 from traits.api import (Bool, Enum, Tuple, Range, List,
-        Str, Instance, HasTraits)
+        Str, Instance, HasTraits, Int)
 from traitsui.api import (View, Group, Item, RGBColorEditor,
         InstanceEditor)
 from apptools.preferences.api import PreferencesHelper
@@ -107,6 +107,14 @@ class MlabPreferencesHelper(PreferencesHelper):
     offscreen = Bool(desc='if mlab should use offscreen rendering'
                           ' (no window will show up in this case)')
 
+    # The number of closed offscreen scenes kept warm for reuse.
+    scene_pool_size = Int(desc='the number of closed offscreen scenes'
+                               ' kept for reuse by new figures')
+
+    # Checking of the input arrays of the mlab functions.
+    validate_inputs = Bool(desc='if mlab should check the input arrays'
+                                ' for infinite values and invalid indices')
+
     ######################################################################
     # Traits UI view.
 
@@ -114,7 +122,10 @@ class MlabPreferencesHelper(PreferencesHelper):
                              Item('backend'),
                              Item('background_color'),
                              Item('foreground_color'),
-                             Item('offscreen')
+                             Item('offscreen'),
+                             Item('scene_pool_size',
+                                  enabled_when='offscreen'),
+                             Item('validate_inputs'),
                              ),
                        resizable=True
                       )
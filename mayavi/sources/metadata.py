@@ -234,6 +234,22 @@ open_volume = SourceMetadata(
                                attributes=['any'])
 )
 
+open_mmap_volume = SourceMetadata(
+    id            = "MMapVolumeFile",
+    class_name    = BASE + ".mmap_volume_reader.MMapVolumeReader",
+    menu_name     = "&Memory mapped volume file (RAW/MHA/MHD)",
+    tooltip       = "Open a large raw or MetaImage volume without reading it",
+    desc        = "Open a large raw or MetaImage volume without reading it",
+    help        = "Open a large raw or MetaImage volume without reading it",
+    extensions = [],
+    wildcard = 'Meta mha files (*.mha)|*.mha|'\
+               'Meta mhd files (*.mhd)|*.mhd|'\
+               'Raw files (*.raw)|*.raw',
+    output_info = PipelineInfo(datasets=['image_data'],
+                               attribute_types=['any'],
+                               attributes=['any'])
+)
+
 open_chaco = SourceMetadata(
     id            = "ChacoFile",
     class_name    = BASE + ".chaco_reader.ChacoReader",
@@ -264,6 +280,7 @@ sources = [open_3ds,
            open_poly_data,
            open_ugrid_data,
            open_volume,
+           open_mmap_volume,
            open_chaco,
            ]
 
@@ -0,0 +1,398 @@
+"""A reader for raw and MetaImage (mha/mhd) volumes that memory maps
+the file instead of reading it.
+
+Only the part of the volume selected with the `voi` and `sample_rate`
+traits is read from the disk, so volumes that are much larger than the
+available memory may be explored by looking at a subsampled overview
+and then at windows of the full resolution data.
+"""
+# Copyright (c) 2013, Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+from os.path import basename, dirname, getsize, join
+
+import numpy
+
+# Enthought library imports.
+from traits.api import Instance, Int, Str, Enum, Array, Bool, \
+     Property, Button, on_trait_change
+from traitsui.api import View, Group, Item, Include
+from tvtk.api import tvtk
+from tvtk import array_handler
+
+# Local imports.
+from mayavi.core.file_data_source import FileDataSource
+from mayavi.core.pipeline_info import PipelineInfo
+from mayavi.core.common import error
+
+
+# The numpy types for the MetaImage element types.
+META_TYPES = {'MET_CHAR': 'int8',
+              'MET_UCHAR': 'uint8',
+              'MET_SHORT': 'int16',
+              'MET_USHORT': 'uint16',
+              'MET_INT': 'int32',
+              'MET_UINT': 'uint32',
+              'MET_LONG_LONG': 'int64',
+              'MET_ULONG_LONG': 'uint64',
+              'MET_FLOAT': 'float32',
+              'MET_DOUBLE': 'float64'}
+
+
+######################################################################
+# Utility functions.
+######################################################################
+def read_meta_header(file_name):
+    """Parses the header of a MetaImage (mha/mhd) file and returns a
+    dictionary with the keyword arguments of `MMapVolumeReader`
+    describing the data along with the name of the data file.
+    """
+    header = {}
+    f = open(file_name, 'rb')
+    try:
+        while True:
+            line = f.readline()
+            if not line:
+                break
+            if '=' not in line:
+                continue
+            key, value = [x.strip() for x in line.split('=', 1)]
+            header[key] = value
+            if key == 'ElementDataFile':
+                header_end = f.tell()
+                break
+    finally:
+        f.close()
+
+    if 'ElementDataFile' not in header:
+        raise IOError('No ElementDataFile found in %s'%file_name)
+    if header.get('CompressedData', 'False').lower() == 'true':
+        raise IOError('Compressed MetaImage files cannot be memory mapped.')
+    etype = header.get('ElementType')
+    if etype not in META_TYPES:
+        raise IOError('Unsupported MetaImage ElementType: %s'%etype)
+
+    dims = [int(x) for x in header['DimSize'].split()]
+    ndim = int(header.get('NDims', len(dims)))
+    if ndim > 3:
+        raise IOError('Only 2D and 3D MetaImage files are supported.')
+    dims = (dims + [1, 1])[:3]
+
+    def _get_vector(keys, default):
+        for key in keys:
+            if key in header:
+                v = [float(x) for x in header[key].split()]
+                return (v + list(default[len(v):]))[:3]
+        return list(default)
+
+    spacing = _get_vector(['ElementSpacing', 'ElementSize'], (1.0, 1.0, 1.0))
+    origin = _get_vector(['Offset', 'Origin', 'Position'], (0.0, 0.0, 0.0))
+    msb = header.get('BinaryDataByteOrderMSB',
+                     header.get('ElementByteOrderMSB', 'False'))
+    n_comp = int(header.get('ElementNumberOfChannels', 1))
+
+    data_file = header['ElementDataFile']
+    if data_file == 'LOCAL':
+        data_file = file_name
+        offset = header_end
+    elif data_file.startswith('LIST') or '%' in data_file:
+        raise IOError('MetaImage files with a list of data files are '
+                      'not supported.')
+    else:
+        data_file = join(dirname(file_name), data_file)
+        offset = int(header.get('HeaderSize', 0))
+
+    data_type = META_TYPES[etype]
+    if offset < 0:
+        # The data is at the end of the file.
+        n_bytes = numpy.dtype(data_type).itemsize*n_comp*numpy.prod(dims)
+        offset = int(getsize(data_file) - n_bytes)
+
+    kw = dict(data_dimensions=dims, data_type=data_type,
+              data_spacing=spacing, data_origin=origin,
+              number_of_components=n_comp, header_size=offset,
+              byte_order=('big' if msb.lower() == 'true' else 'little'))
+    return data_file, kw
+
+
+def get_window(data, voi, sample_rate):
+    """Given a memory mapped array `data` of shape (nz, ny, nx[, nc])
+    returns a contiguous array with native byte order of the region
+    (x_min, x_max, y_min, y_max, z_min, z_max) in `voi`, taking every
+    `sample_rate` point along each axis.  Only the selected points are
+    read.  The array is not copied when the whole volume is selected
+    and the data has the native byte order.
+    """
+    x0, x1, y0, y1, z0, z1 = voi
+    sx, sy, sz = sample_rate
+    result = data[z0:z1+1:sz, y0:y1+1:sy, x0:x1+1:sx]
+    dtype = result.dtype.newbyteorder('=')
+    if result.flags.contiguous and result.dtype == dtype:
+        return result
+    # Copy and swap one z slice of the region at a time, so that only
+    # the selected points are read and no other temporary copy of the
+    # region is made.
+    out = numpy.empty(result.shape, dtype)
+    for k in range(len(result)):
+        out[k] = result[k]
+    return out
+
+
+########################################################################
+# `MMapVolumeReader` class
+########################################################################
+class MMapVolumeReader(FileDataSource):
+
+    """Reads raw volume data and MetaImage (mha/mhd) files by memory
+    mapping them.  Only the part of the volume given by `voi` and
+    `sample_rate` is loaded and handed to VTK without any further
+    copies.  For MetaImage files the data layout is read from the
+    header, for raw files it must be set using the `data_*` traits.
+    """
+
+    # The version of this class.  Used for persistence.
+    __version__ = 0
+
+    # The dimensions of the volume in the file.
+    data_dimensions = Array(int, value=(1, 1, 1), shape=(3,), cols=3,
+                            desc='the dimensions of the volume in the file')
+
+    # The type of the data in the file.
+    data_type = Enum('uint8', 'int8', 'uint16', 'int16', 'uint32',
+                     'int32', 'uint64', 'int64', 'float32', 'float64',
+                     desc='the type of the data in the file')
+
+    # The byte order of the data in the file.
+    byte_order = Enum('little', 'big', desc='the byte order of the data')
+
+    # The number of components of each point.
+    number_of_components = Int(1, desc='the number of components per point')
+
+    # The number of bytes to skip at the start of the file.
+    header_size = Int(0, desc='the number of bytes before the data')
+
+    # The spacing of the full resolution volume.
+    data_spacing = Array(float, value=(1.0, 1.0, 1.0), shape=(3,), cols=3,
+                         desc='the spacing of the volume')
+
+    # The origin of the volume.
+    data_origin = Array(float, value=(0.0, 0.0, 0.0), shape=(3,), cols=3,
+                        desc='the origin of the volume')
+
+    # The region of the volume to load as (x_min, x_max, y_min, y_max,
+    # z_min, z_max) point indices.  Negative maxima count from the end
+    # of the volume.  The default loads the whole volume.
+    voi = Array(int, value=(0, -1, 0, -1, 0, -1), shape=(6,), cols=6,
+                desc='the volume of interest to load')
+
+    # Load every `sample_rate` point along each axis.
+    sample_rate = Array(int, value=(1, 1, 1), shape=(3,), cols=3,
+                        desc='the sampling rate along each axis')
+
+    # Reload the data automatically when the traits above change.
+    auto_update = Bool(True, desc='if the data is reloaded on changes')
+
+    # Reload the data.
+    reload_data = Button('Reload')
+
+    # The whole extent of the volume in the file.
+    whole_extent = Property(depends_on='data_dimensions')
+
+    # The number of bytes of the data loaded into memory.  This is 0
+    # when the data is read directly from the memory map.
+    loaded_bytes = Int(0)
+
+    # Information about what this object can produce.
+    output_info = PipelineInfo(datasets=['image_data'],
+                               attribute_types=['any'],
+                               attributes=['any'])
+
+    # Our view.
+    view = View(Group(Include('time_step_group'),
+                      Item(name='base_file_name'),
+                      Group(Item(name='data_dimensions'),
+                            Item(name='data_type'),
+                            Item(name='byte_order'),
+                            Item(name='number_of_components'),
+                            Item(name='header_size'),
+                            Item(name='data_spacing'),
+                            Item(name='data_origin'),
+                            label='Data layout'),
+                      Group(Item(name='voi'),
+                            Item(name='sample_rate'),
+                            Item(name='auto_update'),
+                            Item(name='reload_data', show_label=False),
+                            Item(name='loaded_bytes', style='readonly'),
+                            label='Region'),
+                      ),
+                resizable=True)
+
+    ######################################################################
+    # Private traits.
+
+    # The output image data.
+    _image_data = Instance(tvtk.ImageData, args=())
+
+    # The file the data is read from.
+    _data_file = Str('')
+
+    # The current memory map of the data.
+    _mmap = Instance(numpy.ndarray, rich_compare=False)
+
+    ######################################################################
+    # `object` interface
+    ######################################################################
+    def __get_pure_state__(self):
+        d = super(MMapVolumeReader, self).__get_pure_state__()
+        for name in ('_image_data', '_data_file', '_mmap', 'loaded_bytes'):
+            d.pop(name, None)
+        return d
+
+    ######################################################################
+    # `FileDataSource` interface
+    ######################################################################
+    def update(self):
+        if len(self._data_file) == 0:
+            return
+        self._mmap = None
+        self.update_data()
+
+    ######################################################################
+    # `MMapVolumeReader` interface
+    ######################################################################
+    def get_array(self, voi=None, sample_rate=None):
+        """Returns the data in the given region of the volume as a
+        numpy array of shape (nz, ny, nx[, nc]).  `voi` and
+        `sample_rate` default to the traits of the same name.  This
+        does not change the output and is useful to get full resolution
+        windows of a volume shown subsampled.
+        """
+        data = self._get_mmap()
+        if voi is None:
+            voi = self.voi
+        if sample_rate is None:
+            sample_rate = self.sample_rate
+        return get_window(data, self._get_voi(voi),
+                          [max(int(x), 1) for x in sample_rate])
+
+    def update_data(self):
+        """Loads the selected region and updates the output."""
+        if len(self._data_file) == 0:
+            return
+        try:
+            data = self._get_mmap()
+        except (IOError, ValueError), msg:
+            error(str(msg))
+            return
+
+        voi = self._get_voi(self.voi)
+        rate = [max(int(x), 1) for x in self.sample_rate]
+        arr = get_window(data, voi, rate)
+        self.loaded_bytes = 0 if isinstance(arr, numpy.memmap) \
+                            else arr.nbytes
+
+        nc = self.number_of_components
+        n = arr.size//nc
+        img = self._image_data
+        img.dimensions = arr.shape[2::-1]
+        img.spacing = self.data_spacing*rate
+        img.origin = self.data_origin + \
+                     self.data_spacing*numpy.array(voi[::2])
+        if nc > 1:
+            scalars = array_handler.array2vtk(arr.reshape(n, nc))
+        else:
+            scalars = array_handler.array2vtk(arr.reshape(n))
+        img.point_data.scalars = scalars
+        img.point_data.scalars.name = 'scalars'
+        img.modified()
+        if self.outputs != [img]:
+            self.outputs = [img]
+        self.data_changed = True
+
+    ######################################################################
+    # Non-public interface
+    ######################################################################
+    def _file_path_changed(self, fpath):
+        value = fpath.get()
+        if len(value) == 0:
+            return
+        self._mmap = None
+        ext = value.strip().split('.')[-1].lower()
+        if ext in ('mha', 'mhd'):
+            try:
+                data_file, kw = read_meta_header(value)
+            except (IOError, KeyError, ValueError), msg:
+                error(str(msg))
+                return
+            # Avoid reloading for each trait.
+            self._data_file = ''
+            self.set(**kw)
+            self._data_file = data_file
+        else:
+            self._data_file = value
+        self.update_data()
+        self.name = self._get_name()
+
+    def _get_mmap(self):
+        """Returns the memory mapped data, creating the map if needed."""
+        if self._mmap is None:
+            nx, ny, nz = self.data_dimensions
+            shape = (nz, ny, nx)
+            if self.number_of_components > 1:
+                shape += (self.number_of_components,)
+            dtype = numpy.dtype(self.data_type)
+            if dtype.itemsize > 1:
+                dtype = dtype.newbyteorder('<' if self.byte_order == 'little'
+                                           else '>')
+            # VTK expects writable arrays, with a copy-on-write map
+            # any change made to the data stays in memory and the file
+            # is never written.
+            self._mmap = numpy.memmap(self._data_file, dtype=dtype,
+                                      mode='c', offset=self.header_size,
+                                      shape=shape)
+        return self._mmap
+
+    def _get_voi(self, voi):
+        """Returns the voi clipped to the whole extent with the negative
+        maxima resolved."""
+        result = []
+        for i, n in enumerate(self.data_dimensions):
+            lo, hi = int(voi[2*i]), int(voi[2*i+1])
+            if hi < 0:
+                hi += n
+            lo = min(max(lo, 0), n - 1)
+            hi = min(max(hi, lo), n - 1)
+            result.extend((lo, hi))
+        return result
+
+    def _get_whole_extent(self):
+        nx, ny, nz = self.data_dimensions
+        return (0, nx - 1, 0, ny - 1, 0, nz - 1)
+
+    def _get_name(self):
+        """ Returns the name to display on the tree view.  Note that
+        this is not a property getter.
+        """
+        fname = basename(self.file_path.get())
+        ret = "%s"%fname
+        if len(self.file_list) > 1:
+            ret += " (timeseries)"
+        if '[Hidden]' in self.name:
+            ret += ' [Hidden]'
+        return ret
+
+    @on_trait_change('data_dimensions,data_type,byte_order,'\
+                     'number_of_components,header_size')
+    def _layout_changed(self):
+        self._mmap = None
+        if self.auto_update:
+            self.update_data()
+
+    @on_trait_change('voi,sample_rate,data_spacing,data_origin')
+    def _region_changed(self):
+        if self.auto_update:
+            self.update_data()
+
+    def _reload_data_fired(self):
+        self.update()
@@ -8,7 +8,7 @@
 from os.path import basename
 
 # Enthought library imports.
-from traits.api import Instance, List, Str, Bool
+from traits.api import Instance, List, Str, Bool, Int, Float
 from traitsui.api import View, Group, Item, Include
 from tvtk.api import tvtk
 
@@ -18,6 +18,7 @@ from mayavi.core.common import error
 from mayavi.core.trait_defs import DEnum
 from mayavi.core.pipeline_info import (PipelineInfo,
         get_tvtk_dataset_name)
+from mayavi.sources.vtk_xml_pieces import load_pieces
 
 
 ######################################################################
@@ -134,6 +135,30 @@ class VTKXMLFileReader(FileDataSource):
     # The VTK data file reader.
     reader = Instance(tvtk.XMLReader)
 
+    # Read the pieces of partitioned files (.pvtu, .pvti etc.)
+    # concurrently instead of using the reader.
+    parallel_pieces = Bool(False, desc='if the pieces of partitioned '\
+                           'files are read concurrently')
+
+    # The number of threads or processes used to read the pieces, if 0
+    # the number of CPUs is used.
+    piece_workers = Int(0, desc='the number of workers reading pieces')
+
+    # Read the pieces in separate processes instead of threads.  With
+    # VTK 5 the threads read the pieces one after the other.
+    use_processes = Bool(False, desc='if pieces are read by processes')
+
+    # The indices of the pieces to read when `parallel_pieces` is set,
+    # all are read if empty.  This is useful for quick previews of
+    # large datasets.
+    pieces = List(Int, desc='the indices of the pieces to read')
+
+    # The files of the pieces that were read.
+    piece_files = List(Str)
+
+    # The time taken to read each of the pieces.
+    piece_times = List(Float)
+
     # Information about what this object can produce.
     output_info = PipelineInfo(datasets=['any'],
                                attribute_types=['any'],
@@ -148,6 +173,12 @@ class VTKXMLFileReader(FileDataSource):
                       Item(name='cell_vectors_name'),
                       Item(name='cell_tensors_name'),
                       Item(name='reader'),
+                      Group(Item(name='parallel_pieces'),
+                            Item(name='piece_workers'),
+                            Item(name='use_processes'),
+                            Item(name='pieces'),
+                            label='Pieces',
+                            enabled_when='object._is_partitioned'),
                       ))
 
     ########################################
@@ -172,12 +203,20 @@ class VTKXMLFileReader(FileDataSource):
     # Toggles if this is the first time this object has been used.
     _first = Bool(True)
 
+    # True if the reader reads a partitioned file.
+    _is_partitioned = Bool(False)
+
+    # The data assembled from the pieces when they are read
+    # concurrently.
+    _pieces_output = Instance(tvtk.DataSet)
+
     ######################################################################
     # `object` interface
     ######################################################################
     def __get_pure_state__(self):
         d = super(VTKXMLFileReader, self).__get_pure_state__()
-        for name in ('_assign_attribute', '_first'):
+        for name in ('_assign_attribute', '_first', '_is_partitioned',
+                     '_pieces_output', 'piece_files', 'piece_times'):
             d.pop(name, None)
         # Pickle the 'point_scalars_name' etc. since these are
         # properties and not in __dict__.
@@ -230,15 +269,16 @@ class VTKXMLFileReader(FileDataSource):
     def update(self):
         if len(self.file_path.get()) == 0:
             return
-        reader = self.reader
-        reader.update()
+        if self._pieces_output is None:
+            self.reader.update()
         self.render()
 
     def update_data(self):
         if len(self.file_path.get()) == 0:
             return
-        self.reader.update()
-        pnt_attr, cell_attr = get_all_attributes(self.reader.output)
+        if self._pieces_output is None:
+            self.reader.update()
+        pnt_attr, cell_attr = get_all_attributes(self._get_reader_output())
 
         def _setup_data_traits(obj, attributes, d_type):
             """Given the object, the dict of the attributes from the
@@ -247,7 +287,7 @@ class VTKXMLFileReader(FileDataSource):
             """
             attrs = ['scalars', 'vectors', 'tensors']
             aa = obj._assign_attribute
-            data = getattr(obj.reader.output, '%s_data'%d_type)
+            data = getattr(obj._get_reader_output(), '%s_data'%d_type)
             for attr in attrs:
                 values = attributes[attr]
                 values.append('')
@@ -286,18 +326,25 @@ class VTKXMLFileReader(FileDataSource):
                 self.reader = eval('tvtk.XML%sReader()'%d_type)
             reader = self.reader
             reader.file_name = value
-            reader.update()
-
-            # Setup the outputs by resetting self.outputs.  Changing
-            # the outputs automatically fires a pipeline_changed
-            # event.
-            try:
-                n = reader.number_of_outputs
-            except AttributeError: # for VTK >= 4.5
-                n = reader.number_of_output_ports
-            outputs = []
-            for i in range(n):
-                outputs.append(reader.get_output(i))
+            self._is_partitioned = \
+                    reader.__class__.__name__.startswith('XMLP')
+
+            if self.parallel_pieces and self._is_partitioned:
+                outputs = [self._read_pieces(value)]
+            else:
+                self._pieces_output = None
+                reader.update()
+
+                # Setup the outputs by resetting self.outputs.  Changing
+                # the outputs automatically fires a pipeline_changed
+                # event.
+                try:
+                    n = reader.number_of_outputs
+                except AttributeError: # for VTK >= 4.5
+                    n = reader.number_of_output_ports
+                outputs = []
+                for i in range(n):
+                    outputs.append(reader.get_output(i))
 
             # FIXME: Only the first output goes through the assign
             # attribute filter.
@@ -314,11 +361,47 @@ class VTKXMLFileReader(FileDataSource):
             # Change our name on the tree view
             self.name = self._get_name()
 
+    def _read_pieces(self, file_name):
+        """Reads the pieces of the given partitioned file concurrently
+        and returns the assembled data."""
+        data, files, times = load_pieces(file_name, self.pieces,
+                                         self.piece_workers,
+                                         self.use_processes)
+        self._pieces_output = data
+        self.set(piece_files=files, piece_times=times)
+        return data
+
+    def _get_reader_output(self):
+        """Returns the first output of the reader or the data read
+        from the pieces."""
+        if self._pieces_output is not None:
+            return self._pieces_output
+        return self.reader.output
+
+    def _reload_pieces(self):
+        if self._is_partitioned and len(self.file_path.get()) > 0:
+            self._file_path_changed(self.file_path)
+            self.render()
+
+    def _parallel_pieces_changed(self):
+        self._reload_pieces()
+
+    def _use_processes_changed(self):
+        if self.parallel_pieces:
+            self._reload_pieces()
+
+    def _pieces_changed(self):
+        if self.parallel_pieces:
+            self._reload_pieces()
+
+    def _pieces_items_changed(self):
+        self._pieces_changed()
+
     def _set_data_name(self, data_type, attr_type, value):
         if value is None:
             return
 
-        reader_output = self.reader.output
+        reader_output = self._get_reader_output()
         if len(value) == 0:
             # If the value is empty then we deactivate that attribute.
             d = getattr(reader_output, attr_type + '_data')
@@ -0,0 +1,284 @@
+"""Concurrent loading of the pieces of partitioned VTK XML datasets
+(.pvtu, .pvtp, .pvti, .pvts and .pvtr files).
+
+The pieces of a partitioned file are read with the serial VTK XML
+readers on a pool of threads or processes and the resulting datasets
+are assembled into a single dataset.  The VTK 5 Python wrappers keep
+the global interpreter lock while a reader executes, so with VTK 5 the
+threads read the pieces one after the other and only the processes
+read them concurrently.  Unstructured grids and poly data
+are appended, image data and structured grids are merged into a single
+extent.  Rectilinear grids are appended into an unstructured grid.
+"""
+# Copyright (c) 2013, Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import logging
+import time
+from os.path import dirname, join
+from xml.etree import ElementTree
+from multiprocessing import cpu_count, Pool
+from multiprocessing.pool import ThreadPool
+
+import numpy
+
+# Enthought library imports.
+from tvtk.api import tvtk
+from tvtk.array_handler import vtk2array, array2vtk
+import vtk
+
+# Setup a logger for this module.
+logger = logging.getLogger(__name__)
+
+
+######################################################################
+# Utility functions.
+######################################################################
+def get_piece_files(file_name):
+    """Parses the partitioned VTK XML file `file_name` and returns its
+    dataset type (for example 'UnstructuredGrid') and the list of the
+    file names of its pieces.
+    """
+    root = ElementTree.parse(file_name).getroot()
+    p_type = root.get('type', '')
+    if not p_type.startswith('P'):
+        raise IOError('%s is not a partitioned VTK XML file.'%file_name)
+    d_type = p_type[1:]
+    base = dirname(file_name)
+    files = []
+    for piece in root.find(p_type).findall('Piece'):
+        files.append(join(base, piece.get('Source')))
+    return d_type, files
+
+
+def read_piece(args):
+    """Reads the piece given as a (dataset type, file name) tuple and
+    returns the VTK dataset and the time taken to read it.
+    """
+    d_type, file_name = args
+    t1 = time.time()
+    reader = getattr(vtk, 'vtkXML%sReader'%d_type)()
+    reader.SetFileName(file_name)
+    reader.Update()
+    return reader.GetOutput(), time.time() - t1
+
+
+def read_piece_to_string(args):
+    """Reads a piece in a worker process and returns it as a (dataset
+    type, VTK XML string) tuple along with the time taken to read it.
+    The XML string keeps the type, the extents and the arrays of the
+    dataset exactly, the arrays are stored in base64 so that the string
+    has no null bytes.
+    """
+    d_type, file_name = args
+    data, t = read_piece(args)
+    writer = getattr(tvtk, 'XML%sWriter'%d_type)(write_to_output_string=True,
+                                                 data_mode='binary',
+                                                 compressor=None)
+    writer.input = tvtk.to_tvtk(data)
+    writer.write()
+    return (d_type, writer.output_string), t
+
+
+def data_from_string(args):
+    """Returns the VTK dataset given the (dataset type, VTK XML string)
+    tuple returned by `read_piece_to_string`."""
+    d_type, data_string = args
+    reader = getattr(vtk, 'vtkXML%sReader'%d_type)()
+    reader.ReadFromInputStringOn()
+    reader.SetInputString(data_string)
+    reader.Update()
+    return reader.GetOutput()
+
+
+def read_pieces(d_type, files, n_workers=0, use_processes=False):
+    """Reads the given piece files concurrently and returns the list
+    of VTK datasets and the list of times taken to read each piece.
+
+    Parameters
+    ----------
+
+    - d_type : str
+
+      The dataset type of the pieces, for example 'PolyData'.
+
+    - files : list of str
+
+      The names of the files of the pieces.
+
+    - n_workers : int (default: 0)
+
+      The number of threads or processes to use, if 0 the number of
+      CPUs is used.
+
+    - use_processes : bool (default: False)
+
+      Read the pieces in separate processes instead of threads.  The
+      pieces are sent back as VTK XML strings with uncompressed base64
+      arrays, which are cheap to parse again.  With VTK 5 only the
+      processes read the pieces concurrently, the threads do not
+      release the global interpreter lock while reading.
+    """
+    if n_workers <= 0:
+        n_workers = cpu_count()
+    n_workers = max(min(n_workers, len(files)), 1)
+    args = [(d_type, f) for f in files]
+    if use_processes:
+        pool = Pool(n_workers)
+        func = read_piece_to_string
+    else:
+        pool = ThreadPool(n_workers)
+        func = read_piece
+    try:
+        result = pool.map(func, args)
+    finally:
+        pool.close()
+        pool.join()
+
+    datasets = [x[0] for x in result]
+    if use_processes:
+        datasets = [data_from_string(x) for x in datasets]
+    times = [x[1] for x in result]
+    for f, t in zip(files, times):
+        logger.debug('Read piece %s in %.4f seconds', f, t)
+    return datasets, times
+
+
+def _copy_active_attributes(src, dest):
+    """Makes the arrays of `dest` that are active in `src` active."""
+    for attr in ('point_data', 'cell_data'):
+        s = getattr(src, attr)
+        d = getattr(dest, attr)
+        for name in ('scalars', 'vectors', 'tensors', 'normals'):
+            arr = getattr(s, name)
+            if arr is not None and arr.name is not None:
+                getattr(d, 'set_active_%s'%name)(arr.name)
+
+
+def _merge_arrays(datasets, extents, get_data, extent, offset):
+    """Merges the arrays of the data attributes returned by
+    `get_data` of the datasets with the given extents into new VTK
+    arrays for the given whole extent.  `offset` is 0 for points and 1
+    for cells.
+    """
+    def _shape(ext):
+        return tuple(max(ext[i+1] - ext[i] + 1 - offset, 1)
+                     for i in (4, 2, 0))
+
+    def _start(ext):
+        return tuple(ext[i] - extent[i] for i in (4, 2, 0))
+
+    first = get_data(datasets[0])
+    shape = _shape(extent)
+    result = []
+    for i in range(first.GetNumberOfArrays()):
+        arr = first.GetArray(i)
+        if arr is None:
+            continue
+        name = arr.GetName()
+        nc = arr.GetNumberOfComponents()
+        a = vtk2array(arr)
+        merged = numpy.zeros(shape + (nc,), a.dtype)
+        for data, ext in zip(datasets, extents):
+            piece = get_data(data).GetArray(name)
+            if piece is None:
+                continue
+            s = _shape(ext)
+            z, y, x = _start(ext)
+            merged[z:z+s[0], y:y+s[1], x:x+s[2]] = \
+                    vtk2array(piece).reshape(s + (nc,))
+        if nc == 1:
+            merged = merged.ravel()
+        else:
+            merged = merged.reshape(merged.size//nc, nc)
+        vtk_arr = array2vtk(merged)
+        vtk_arr.SetName(name)
+        result.append(vtk_arr)
+    return result
+
+
+def merge_structured(datasets):
+    """Merges image data or structured grid pieces into a single
+    dataset covering the extents of all the pieces.  The pieces need
+    not cover the whole extent of the partitioned file.
+    """
+    extents = [d.GetExtent() for d in datasets]
+    extent = []
+    for i in range(3):
+        extent.append(min(e[2*i] for e in extents))
+        extent.append(max(e[2*i+1] for e in extents))
+
+    first = datasets[0]
+    if first.IsA('vtkImageData'):
+        output = vtk.vtkImageData()
+        output.SetOrigin(first.GetOrigin())
+        output.SetSpacing(first.GetSpacing())
+    else:
+        output = vtk.vtkStructuredGrid()
+    output.SetExtent(extent)
+
+    if first.IsA('vtkStructuredGrid'):
+        points = vtk.vtkPoints()
+        pnts = _merge_arrays(datasets, extents,
+                             lambda d: _points_data(d), extent, 0)
+        points.SetData(pnts[0])
+        output.SetPoints(points)
+
+    for attr, offset in (('GetPointData', 0), ('GetCellData', 1)):
+        get_data = lambda d, attr=attr: getattr(d, attr)()
+        for arr in _merge_arrays(datasets, extents, get_data, extent, offset):
+            get_data(output).AddArray(arr)
+    return output
+
+
+def _points_data(data):
+    """Returns a field data with the points of `data` as its array."""
+    fd = vtk.vtkFieldData()
+    arr = data.GetPoints().GetData()
+    arr.SetName('Points')
+    fd.AddArray(arr)
+    return fd
+
+
+def append_pieces(datasets):
+    """Appends the pieces into a single poly data or unstructured
+    grid."""
+    if datasets[0].IsA('vtkPolyData'):
+        append = tvtk.AppendPolyData()
+    else:
+        append = tvtk.AppendFilter()
+    for data in datasets:
+        append.add_input(tvtk.to_tvtk(data))
+    append.update()
+    return tvtk.to_vtk(append.output)
+
+
+def assemble_pieces(datasets):
+    """Assembles the VTK datasets of the pieces into a single tvtk
+    dataset."""
+    first = datasets[0]
+    if first.IsA('vtkImageData') or first.IsA('vtkStructuredGrid'):
+        output = merge_structured(datasets)
+    else:
+        output = append_pieces(datasets)
+    output = tvtk.to_tvtk(output)
+    _copy_active_attributes(tvtk.to_tvtk(first), output)
+    return output
+
+
+def load_pieces(file_name, pieces=None, n_workers=0, use_processes=False):
+    """Loads the partitioned VTK XML file `file_name` concurrently and
+    returns the assembled tvtk dataset, the list of piece files read
+    and the time taken to read each of them.
+
+    `pieces` is an optional list of the indices of the pieces to load,
+    all the pieces are loaded by default.
+    """
+    d_type, files = get_piece_files(file_name)
+    if pieces:
+        files = [files[i] for i in pieces if 0 <= i < len(files)]
+    if len(files) == 0:
+        raise IOError('No pieces to read in %s.'%file_name)
+    datasets, times = read_pieces(d_type, files, n_workers, use_processes)
+    return assemble_pieces(datasets), files, times
@@ -0,0 +1,113 @@
+"""
+Tests for the parallel update of pipeline branches.
+"""
+# Copyright (c) 2013,  Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import threading
+import unittest
+
+# Enthought library imports.
+import numpy as np
+from tvtk.api import tvtk
+from mayavi.core.null_engine import NullEngine
+from mayavi.core.branch_executor import executor, get_branches, \
+     _get_mtime
+from mayavi.sources.array_source import ArraySource
+from mayavi.filters.threshold import Threshold
+from mayavi.filters.contour import Contour
+from mayavi.filters.extract_vector_norm import ExtractVectorNorm
+from mayavi.modules.surface import Surface
+
+
+def make_data(n=20, scale=1.0):
+    x, y, z = np.ogrid[-1:1:n*1j, -1:1:n*1j, -1:1:n*1j]
+    s = scale*(x*x + y*y + z*z)
+    v = np.empty((n, n, n, 3))
+    v[..., 0], v[..., 1], v[..., 2] = s*x, s*y, s*z
+    return s, v
+
+
+class TestBranchExecutor(unittest.TestCase):
+
+    def setUp(self):
+        e = NullEngine()
+        e.start()
+        e.new_scene()
+        self.e = e
+        s, v = make_data()
+        self.src = src = ArraySource(scalar_data=s, vector_data=v)
+        e.add_source(src)
+        self.filters = [Threshold(), Contour(), ExtractVectorNorm()]
+        for f in self.filters:
+            e.add_filter(f, src)
+            e.add_module(Surface(), f)
+        self.contour = self.filters[1]
+
+    def tearDown(self):
+        self.e.parallel_update = False
+        self.e.stop()
+
+    def get_sizes(self):
+        return [f.outputs[0].number_of_points for f in self.filters]
+
+    def change_data(self, scale):
+        s, v = make_data(scale=scale)
+        self.src.set(scalar_data=s, vector_data=v)
+
+    def test_get_branches(self):
+        branches = get_branches(self.src)
+        self.assertEqual(len(branches), 3)
+        for (filters, outputs), f in zip(branches, self.filters):
+            self.assertEqual(filters, [f])
+            self.assertEqual(outputs, f.outputs)
+
+    def test_same_result(self):
+        self.change_data(2.0)
+        expect = self.get_sizes()
+        self.change_data(1.0)
+        self.e.parallel_update = True
+        self.assertTrue(executor.is_active())
+        self.change_data(2.0)
+        self.assertEqual(self.get_sizes(), expect)
+
+    def test_worker_threads(self):
+        threads = []
+        vtk_filter = tvtk.to_vtk(self.filters[0].threshold_filter)
+        vtk_filter.AddObserver('StartEvent', lambda obj, event:
+                               threads.append(threading.current_thread()))
+        self.e.parallel_update = True
+        self.change_data(2.0)
+        self.assertTrue(len(threads) > 0)
+        self.assertFalse(isinstance(threads[0], threading._MainThread))
+
+    def test_changed_after_update(self):
+        # Two branches below the contour.
+        subs = [Threshold(), Threshold()]
+        for f in subs:
+            self.e.add_filter(f, self.contour)
+        self.e.parallel_update = True
+        self.change_data(2.0)
+        # A filter left as updated by its parent whose data changes
+        # later updates its own branches again.
+        executor._fresh[self.contour] = _get_mtime(self.contour)
+        threads = []
+        vtk_filter = tvtk.to_vtk(subs[0].threshold_filter)
+        vtk_filter.AddObserver('StartEvent', lambda obj, event:
+                               threads.append(threading.current_thread()))
+        self.contour.filter.contours = [0.5]
+        self.assertTrue(len(threads) > 0)
+        self.assertFalse(isinstance(threads[0], threading._MainThread))
+        self.assertFalse(self.contour in executor._fresh)
+
+    def test_disable(self):
+        self.e.parallel_update = True
+        self.e.parallel_update = False
+        self.assertFalse(executor.is_active())
+        self.change_data(2.0)
+        self.assertTrue(self.contour.outputs[0].number_of_points > 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
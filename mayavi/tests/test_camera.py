@@ -0,0 +1,99 @@
+"""
+Tests for the coordinate conversions of mayavi.tools.camera.
+"""
+# Copyright (c) 2013,  Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import unittest
+
+# Enthought library imports.
+import numpy as np
+from tvtk.api import tvtk
+from mayavi.tools.camera import world_to_display, display_to_world, \
+     get_world_to_display_matrix, get_outline_bounds, \
+     _project_outline_bounds
+
+
+class FakeScene(object):
+    """The parts of a scene used by the conversions, the window is never
+    rendered."""
+
+    def __init__(self):
+        self.render_window = tvtk.RenderWindow(size=(400, 300))
+        self._renderer = tvtk.Renderer(viewport=(0.1, 0.2, 0.9, 1.0))
+        self.render_window.add_renderer(self._renderer)
+        self.camera = self._renderer.active_camera
+        self.camera.set(position=(3, 4, 5), focal_point=(0.2, 0.1, 0),
+                        view_up=(0, 0, 1), clipping_range=(1, 20))
+
+    def get_size(self):
+        return self.render_window.size
+
+
+class FakeFigure(object):
+    def __init__(self):
+        self.scene = FakeScene()
+
+
+class TestCamera(unittest.TestCase):
+
+    def setUp(self):
+        self.fig = FakeFigure()
+        self.points = np.random.RandomState(0).rand(20, 3) * 2
+
+    def test_matrix(self):
+        m = get_world_to_display_matrix(self.fig)
+        self.assertEqual(m.shape, (4, 4))
+
+    def test_world_to_display(self):
+        ren = self.fig.scene._renderer
+        x, y, z = self.points.T
+        dx, dy, depth = world_to_display(x, y, z, figure=self.fig,
+                                         depth=True)
+        self.assertEqual(dx.shape, (20,))
+        for i, p in enumerate(self.points):
+            ren.world_point = list(p) + [1]
+            ren.world_to_display()
+            self.assertTrue(np.allclose(ren.display_point[:2],
+                                        (dx[i], dy[i])))
+            self.assertTrue(0 < depth[i] < 1)
+        # Scalars give scalars.
+        x0, y0 = world_to_display(1, 2, 3, figure=self.fig)
+        self.assertTrue(isinstance(x0, float))
+
+    def test_display_to_world(self):
+        x, y, z = self.points.T
+        dx, dy, depth = world_to_display(x, y, z, figure=self.fig,
+                                         depth=True)
+        wx, wy, wz = display_to_world(dx, dy, depth, figure=self.fig)
+        self.assertTrue(np.allclose(np.c_[wx, wy, wz], self.points))
+
+    def test_outline_bounds(self):
+        scene = self.fig.scene
+        self.assertEqual(_project_outline_bounds(self.fig, scene), None)
+        cube = tvtk.CubeSource(center=(0.5, 0.5, 0.5))
+        actor = tvtk.Actor(mapper=tvtk.PolyDataMapper())
+        actor.mapper.set_input_connection(cube.output_port)
+        # Hidden actors are ignored.
+        hidden = tvtk.Actor(mapper=tvtk.PolyDataMapper(), visibility=False)
+        hidden.mapper.set_input_connection(
+            tvtk.CubeSource(center=(-10, 0, 0)).output_port)
+        scene._renderer.add_actor(actor)
+        scene._renderer.add_actor(hidden)
+
+        x_min, x_max, y_min, y_max, w, h = get_outline_bounds(self.fig)
+        self.assertEqual((w, h), (400, 300))
+        corners = np.array([(x, y, z) for x in (0, 1) for y in (0, 1)
+                                      for z in (0, 1)], dtype=float)
+        dx, dy = world_to_display(corners[:, 0], corners[:, 1],
+                                  corners[:, 2], figure=self.fig)
+        self.assertTrue(x_min <= dx.min() and dx.max() <= x_max)
+        self.assertTrue(x_max - x_min <= dx.max() - dx.min() + 2)
+        # The rows are counted from the top.
+        self.assertTrue(y_min <= h - 1 - dy.max())
+        self.assertTrue(h - 1 - dy.min() <= y_max)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,6 +7,7 @@
 from os.path import abspath
 from StringIO import StringIO
 import copy
+import time
 import numpy
 import unittest
 import datasets
@@ -15,6 +16,7 @@ import datasets
 from mayavi.core.null_engine import NullEngine
 
 # Enthought library imports
+from tvtk.api import tvtk
 from mayavi.sources.vtk_data_source import VTKDataSource
 from mayavi.modules.outline import Outline
 from mayavi.modules.iso_surface import IsoSurface
@@ -118,6 +120,50 @@ class TestContour(unittest.TestCase):
         #from mayavi.tools.show import show
         #show()
 
+    def test_cache(self):
+        """Test the cache of the extracted contours."""
+        iso = self.iso
+        c = iso.contour
+        c.set(cache_size=10, precompute_neighbors=0)
+        n5 = iso.actor.mapper.input.number_of_points
+        c.contours = [6.0]
+        n6 = iso.actor.mapper.input.number_of_points
+        self.assertNotEqual(n5, n6)
+        self.assertEqual(len(c._cache), 2)
+        # Going back uses the cached contour.
+        c.contours = [5.0]
+        self.assertEqual(len(c._cache), 2)
+        self.assertEqual(iso.actor.mapper.input.number_of_points, n5)
+        self.check()
+
+        # Moving a single contour extracts its neighbours in the
+        # background.
+        c.precompute_neighbors = 2
+        c.contours[0] = 5.5
+        for i in range(500):
+            if len(c._cache) == 5:
+                break
+            time.sleep(0.01)
+        self.assertEqual(len(c._cache), 5)
+        # The thread reads its own copy of the scalars of the input.
+        inp = c.inputs[0].outputs[0]
+        data = c._precompute_input[2]
+        self.assertFalse(tvtk.to_vtk(data.point_data.scalars) is
+                         tvtk.to_vtk(inp.point_data.scalars))
+        self.assertTrue(numpy.all(data.point_data.scalars.to_array() ==
+                               inp.point_data.scalars.to_array()))
+        c.precompute_neighbors = 0
+        c.contours[0] = 6.5
+        self.assertEqual(len(c._cache), 5)
+        c.contours = [6.5, 7.0]
+        self.assertEqual(len(c._cache), 6)
+
+        # Disabling the cache gives the output of the filter back.
+        c.cache_size = 0
+        self.assertTrue(c._cache is None)
+        self.assertEqual(iso.actor.mapper.input.number_of_points,
+                         c.contour_filter.output.number_of_points)
+
     def test_components_changed(self):
         """Test if the modules respond correctly when the components
            are changed."""
@@ -12,10 +12,11 @@ import unittest
 import tempfile
 
 import nose
-from numpy import array, ndarray
+from numpy import array, ndarray, dtype, int64
 
 from mayavi.tools.data_wizards.csv_sniff import \
      Sniff, loadtxt, loadtxt_unknown, array2dict
+from mayavi.tools.data_wizards.loadtxt import _parse_numeric
 
 
 class Util(unittest.TestCase):
@@ -119,6 +120,74 @@ class Test(Util):
                      'formats': ('S5', float, float)}})
 
 
+    def test_chunks(self):
+        fo = tempfile.mktemp()
+        with open(fo, 'wb') as f:
+            f.write('A, B, C\n')
+            for i in xrange(1000):
+                f.write('%d, %d, %f  # comment\n' % (i, 2*i, 0.5*i))
+                if i % 100 == 0:
+                    f.write('\n')
+
+        kwds = dict(delimiter=',', skiprows=1,
+                    dtype={'names': ('A', 'B', 'C'),
+                           'formats': (int, float, float)})
+        x = loadtxt(fo, chunk_size=100, n_threads=3, **kwds)
+        self.assertEqual(x.shape, (1000,))
+        self.assertAllClose(x['A'], range(1000))
+        self.assertAllClose(x['C'], [0.5*i for i in xrange(1000)])
+        y = loadtxt(fo, n_threads=1, **kwds)
+        self.assertNamedClose(x, y)
+
+        x = loadtxt(fo, delimiter=',', skiprows=1, usecols=(0, 2),
+                    chunk_size=64)
+        self.assertEqual(x.shape, (1000, 2))
+        self.assertAllClose(x[:, 1], [0.5*i for i in xrange(1000)])
+
+    def test_chunks_fallback(self):
+        fo = tempfile.mktemp()
+        with open(fo, 'wb') as f:
+            f.write('1,2\n3,\n')
+        self.assertRaises(ValueError, loadtxt, fo, delimiter=',')
+        x = loadtxt(fo, delimiter=',',
+                    converters={1: lambda s: float(s or 0)})
+        self.assertAllClose(x[1], [3.0, 0.0])
+
+    def test_ragged_rows(self):
+        fo = tempfile.mktemp()
+        with open(fo, 'wb') as f:
+            f.write('1 2 3\n4\n5 6\n')
+        self.assertRaises(ValueError, loadtxt, fo)
+        with open(fo, 'wb') as f:
+            f.write('1,2\n3,4,5\n6\n')
+        self.assertRaises(IndexError, loadtxt, fo, delimiter=',')
+
+    def test_delimiters(self):
+        # Whitespace delimiters other than spaces use the vectorized
+        # parser.
+        x = _parse_numeric('1\t2\n3\t4\n', dtype(float), '#', '\t', None)
+        self.assertEqual(x.tolist(), [[1, 2], [3, 4]])
+        x = _parse_numeric('1::2\n3::4\n', dtype(float), '#', '::', None)
+        self.assertEqual(x.tolist(), [[1, 2], [3, 4]])
+        # An empty field and a field with a space on other lines are
+        # left to the line parser.
+        for text in ('1\t\t2 3\n4\t5\t6\n', '1,,2 3\n'):
+            self.assertEqual(_parse_numeric(text, dtype(float), '#',
+                                            text[1], None), None)
+
+    def test_integers(self):
+        fo = tempfile.mktemp()
+        with open(fo, 'wb') as f:
+            f.write('9007199254740993 1\n2 3\n')
+        x = loadtxt(fo, dtype=int64)
+        self.assertEqual(x[0, 0], 9007199254740993)
+        with open(fo, 'wb') as f:
+            f.write('2.0 1e3\n')
+        self.assertEqual(list(loadtxt(fo, dtype=int)), [2, 1000])
+        with open(fo, 'wb') as f:
+            f.write('1.5 2\n')
+        self.assertRaises(ValueError, loadtxt, fo, dtype=int)
+
     def test_empty_file(self):
         fo = tempfile.mktemp()
         with open(fo, 'wb') as f:
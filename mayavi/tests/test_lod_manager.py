@@ -0,0 +1,152 @@
+"""
+Tests for the level-of-detail manager.
+"""
+# Copyright (c) 2013,  Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import unittest
+
+# Enthought library imports.
+from tvtk.api import tvtk
+from mayavi.core.null_engine import NullEngine
+from mayavi.core.off_screen_engine import OffScreenEngine
+from mayavi.core.lod_manager import LODManager, reduce_dataset
+from mayavi.sources.vtk_data_source import VTKDataSource
+from mayavi.modules.surface import Surface
+
+
+def make_sphere(resolution=100):
+    src = tvtk.SphereSource(theta_resolution=resolution,
+                            phi_resolution=resolution)
+    src.update()
+    return src.output
+
+
+class TestReduceDataset(unittest.TestCase):
+
+    def test_within_budget(self):
+        data = make_sphere(10)
+        self.assertEqual(reduce_dataset(data, 10**6), None)
+
+    def test_poly_data_methods(self):
+        data = make_sphere()
+        n = data.number_of_cells
+        for method in ('quadric_clustering', 'quadric_decimation',
+                       'decimate_pro', 'mask_points'):
+            result = reduce_dataset(data, n/10, method)
+            self.assertTrue(result.is_a('vtkPolyData'))
+            self.assertTrue(0 < result.number_of_cells < n/2)
+
+    def test_image_data(self):
+        data = tvtk.ImageData(dimensions=(40, 40, 40))
+        data.point_data.scalars = range(40**3)
+        result = reduce_dataset(data, 1000)
+        self.assertTrue(result.is_a('vtkImageData'))
+        self.assertTrue(result.number_of_points <= 1000)
+
+
+class TestLODManager(unittest.TestCase):
+
+    def setUp(self):
+        e = NullEngine()
+        e.start()
+        e.new_scene()
+        self.e = e
+        self.scene = e.current_scene
+        self.data = make_sphere()
+        e.add_source(VTKDataSource(data=self.data))
+        self.surface = Surface()
+        e.add_module(self.surface)
+
+    def tearDown(self):
+        self.e.stop()
+
+    def test_scene_has_manager(self):
+        self.assertTrue(isinstance(self.scene.lod_manager, LODManager))
+        self.assertFalse(self.scene.lod_manager.enabled)
+
+    def test_swap_and_restore(self):
+        lod = self.scene.lod_manager
+        lod.default_budget = 100
+        lod.enabled = True
+        lod.prepare(wait=True)
+        mapper = self.surface.actor.mapper
+        full = mapper.input
+        lod.start_interaction()
+        self.assertTrue(lod.interacting)
+        self.assertFalse(mapper.input is full)
+        self.assertTrue(mapper.input.number_of_cells <
+                        full.number_of_cells)
+        lod.end_interaction()
+        self.assertTrue(mapper.input is full)
+
+    def test_module_budget(self):
+        lod = self.scene.lod_manager
+        self.surface.lod_budget = 0
+        lod.enabled = True
+        lod.prepare(wait=True)
+        mapper = self.surface.actor.mapper
+        full = mapper.input
+        lod.start_interaction()
+        self.assertTrue(mapper.input is full)
+        lod.end_interaction()
+
+    def test_clear(self):
+        lod = self.scene.lod_manager
+        lod._pending[0] = (0, 100, 'mask_points')
+        lod.clear()
+        self.assertEqual(len(lod._pending), 0)
+
+    def test_stop_without_manager(self):
+        e = NullEngine()
+        e.start()
+        e.new_scene()
+        scene = e.current_scene
+        e.stop()
+        self.assertFalse('lod_manager' in scene.__dict__)
+
+    def test_disabled(self):
+        lod = self.scene.lod_manager
+        lod.default_budget = 100
+        lod.prepare(wait=True)
+        mapper = self.surface.actor.mapper
+        full = mapper.input
+        lod.start_interaction()
+        self.assertTrue(mapper.input is full)
+        lod.end_interaction()
+
+
+class TestLODManagerObservers(unittest.TestCase):
+
+    def setUp(self):
+        e = OffScreenEngine()
+        e.start()
+        e.new_scene()
+        self.e = e
+        self.scene = e.current_scene
+
+    def tearDown(self):
+        self.e.stop()
+
+    def test_observers(self):
+        lod = self.scene.lod_manager
+        lod.enabled = True
+        iren = self.scene.scene.interactor
+        self.assertTrue(lod._interactor is iren)
+        self.assertEqual(len(lod._observer_ids), 2)
+        lod.enabled = False
+        self.assertEqual(lod._observer_ids, [])
+
+    def test_observers_set_later(self):
+        # Enabled before the manager had a scene.
+        lod = LODManager(enabled=True)
+        self.assertEqual(lod._observer_ids, [])
+        lod.scene = self.scene
+        self.assertTrue(lod._interactor is self.scene.scene.interactor)
+        self.assertEqual(len(lod._observer_ids), 2)
+        lod.enabled = False
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+"""
+Tests for the least recently used cache.
+"""
+# Copyright (c) 2013,  Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import unittest
+
+# Enthought library imports.
+import numpy as np
+from mayavi.core.lru_cache import LRUCache, data_size
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def test_budget(self):
+        c = LRUCache(250, size=len)
+        c.put('a', 'x'*100)
+        c.put('b', 'x'*100)
+        self.assertEqual(c.nbytes, 200)
+        # Using 'a' makes 'b' the least recently used.
+        self.assertEqual(c.get('a'), 'x'*100)
+        c.put('c', 'x'*100)
+        self.assertTrue('a' in c and 'c' in c)
+        self.assertFalse('b' in c)
+        self.assertEqual(c.get('b', 1), 1)
+        # Too large values are not cached.
+        c.put('d', 'x'*300)
+        self.assertFalse('d' in c)
+        self.assertEqual(len(c), 2)
+        # Replacing a value updates the size.
+        c.put('a', 'x'*10)
+        self.assertEqual(c.nbytes, 110)
+
+    def test_max_bytes(self):
+        c = LRUCache(300, size=len)
+        for key in 'abc':
+            c.put(key, 'x'*100)
+        c.max_bytes = 150
+        self.assertEqual(len(c), 1)
+        self.assertTrue('c' in c)
+
+    def test_discard(self):
+        c = LRUCache(1000, size=len)
+        for i in range(5):
+            c.put(i, 'x'*10)
+        c.discard(lambda k: k % 2)
+        self.assertEqual(sorted(c._entries), [0, 2, 4])
+        self.assertEqual(c.nbytes, 30)
+        c.clear()
+        self.assertEqual((len(c), c.nbytes), (0, 0))
+
+    def test_data_size(self):
+        self.assertEqual(data_size(np.zeros(10)), 80)
+        self.assertEqual(data_size('abc'), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
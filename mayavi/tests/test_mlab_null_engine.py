@@ -8,6 +8,9 @@ from mayavi import mlab
 from mayavi.core.engine import Engine
 from mayavi.tools.engine_manager import engine_manager
 from mayavi.core.registry import registry
+from mayavi.modules.glyph import Glyph
+from mayavi.modules.surface import Surface
+from mayavi.tools.helper_functions import Points3d
 from mayavi.tests.common import get_example_data
 
 ################################################################################
@@ -57,6 +60,42 @@ class TestRealMlabNullEngine(unittest.TestCase):
         mlab.pipeline.open(get_example_data('cube.vti'))
         mlab.clf()
 
+    def test_point_cloud_cells(self):
+        """Test if the cells of point clouds are only created when a
+        module needs them."""
+        mlab.options.backend = 'test'
+        src = mlab.pipeline.scalar_scatter([0, 1, 2], [0, 1, 2], [0, 1, 2])
+        self.assertEqual(src.mlab_source.vertex_cells, False)
+        self.assertEqual(src.outputs[0].number_of_cells, 0)
+        mlab.pipeline.glyph(src)
+        self.assertEqual(src.mlab_source.vertex_cells, False)
+        mlab.pipeline.surface(src)
+        self.assertEqual(src.mlab_source.vertex_cells, True)
+        self.assertEqual(src.outputs[0].number_of_cells, 3)
+        mlab.clf()
+
+    def test_point_cloud_cells_engine(self):
+        """Test if the cells of point clouds are created for modules not
+        added by mlab."""
+        mlab.options.backend = 'test'
+        src = mlab.pipeline.scalar_scatter([0, 1, 2], [0, 1, 2], [0, 1, 2])
+        engine = mlab.get_engine()
+        engine.add_module(Glyph(), obj=src)
+        self.assertEqual(src.outputs[0].number_of_cells, 0)
+        engine.add_module(Surface(), obj=src)
+        self.assertEqual(src.mlab_source.vertex_cells, True)
+        self.assertEqual(src.outputs[0].number_of_cells, 3)
+        mlab.clf()
+
+    def test_validate_default(self):
+        """Test if the helper functions leave the validation to the
+        validate_inputs option unless it is given."""
+        mlab.options.backend = 'test'
+        self.assertEqual(Points3d().validate, None)
+        mlab.points3d([0, 1], [0, 1], [0, 1], validate=None)
+        mlab.points3d([0, 1], [0, 1], [0, 1], validate=False)
+        mlab.clf()
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -161,6 +161,73 @@ class TestMGlyphSource(unittest.TestCase):
         self.check_traits()
         self.check_dataset()
 
+    def test_single_buffer(self):
+        "Test if the coordinates and components are views of the arrays."
+        x, y, z, v, s, src = self.get_data()
+        points, vectors = src.points, src.vectors
+        self.assertEqual(points.shape, (10, 3))
+        for name in 'xyz':
+            self.assertEqual(N.may_share_memory(getattr(src, name),
+                                                points), True)
+        for name in 'uvw':
+            self.assertEqual(N.may_share_memory(getattr(src, name),
+                                                vectors), True)
+        # In-place changes only need an update.
+        src.x[:] = 5
+        src.w *= 2
+        src.update()
+        self.assertEqual(N.all(src.dataset.points.to_array()[:, 0] == 5),
+                         True)
+        self.assertEqual(N.all(src.vectors[:, 2] == 20), True)
+        # Setting views does not copy, other arrays are copied in.
+        src.set(x=src.x)
+        new_y = N.arange(10.)
+        src.y = new_y
+        self.assertEqual(src.points is points, True)
+        self.assertEqual(N.all(points[:, 1] == new_y), True)
+        self.assertEqual(N.may_share_memory(src.y, points), True)
+        # A reset keeps the arrays if nothing changed.
+        src.reset(scalars=s*2)
+        self.assertEqual(src.points is points, True)
+        self.assertEqual(src.vectors is vectors, True)
+
+    def test_set_vectors(self):
+        "Test if setting the vectors makes u, v, w views of them."
+        x, y, z, v, s, src = self.get_data()
+        vectors = N.arange(30.).reshape(10, 3)
+        src.vectors = vectors
+        for name in 'uvw':
+            self.assertEqual(N.may_share_memory(getattr(src, name),
+                                                src.vectors), True)
+        self.assertEqual(N.all(src.v == vectors[:, 1]), True)
+        # In-place changes of the components only need an update.
+        src.u[:] = -1
+        src.update()
+        vec = src.dataset.point_data.vectors.to_array()
+        self.assertEqual(N.all(vec[:, 0] == -1), True)
+        self.assertEqual(N.all(vec[:, 1:] == vectors[:, 1:]), True)
+        # The vectors can be removed.
+        src.vectors = None
+        self.assertEqual(src.dataset.point_data.vectors, None)
+
+    def test_vertex_cells(self):
+        "Test if the vertex cells can be turned off."
+        x, y, z, v, s, src = self.get_data()
+        self.assertEqual(src.dataset.number_of_cells, 10)
+        src.vertex_cells = False
+        self.assertEqual(src.dataset.number_of_cells, 0)
+        a = N.zeros(20)
+        src.reset(x=a, y=a, z=a, u=a, v=a, w=a, scalars=a)
+        self.assertEqual(src.dataset.number_of_cells, 0)
+        self.assertEqual(src.dataset.number_of_points, 20)
+        src.vertex_cells = True
+        self.assertEqual(src.dataset.number_of_cells, 20)
+        # The connectivity is shared by the point clouds.
+        c1 = sources.vertex_cells(5).data.to_array()
+        c2 = sources.vertex_cells(3).data.to_array()
+        self.assertEqual(list(c1), [1, 0, 1, 1, 1, 2, 1, 3, 1, 4])
+        self.assertEqual(N.may_share_memory(c1, c2), True)
+
     def test_strange_shape(self):
         " Test the MGlyphSource with strange shapes for the arguments "
         x, y, z, v, s, src = self.get_data()
@@ -400,6 +467,53 @@ class TestMArraySource(unittest.TestCase):
         self.check_traits()
         self.check_dataset()
 
+    def test_grid(self):
+        "Test if the coordinates are only created when they are read."
+        s = N.random.random((5, 6, 7))
+        src = sources.MArraySource()
+        src.reset(scalars=s)
+        self.assertEqual(src._x, None)
+        self.assertEqual(src.grid.shape, (5, 6, 7))
+        self.assertEqual(N.all(src.m_data.origin == 0), True)
+        self.assertEqual(N.all(src.m_data.spacing == 1), True)
+        x, y, z = N.indices(s.shape)
+        self.assertEqual(N.all(src.x == x), True)
+        self.assertEqual(N.all(src.z == z), True)
+        self.assertEqual(src._y, None)
+        # Setting the grid updates the dataset.
+        src.grid = sources.RegularGrid(s.shape, (1, 2, 3), (0.5, 1, 2))
+        self.assertEqual(src._x, None)
+        self.assertEqual(src.dataset.origin, (1, 2, 3))
+        self.assertEqual(N.allclose(src.m_data.spacing, (0.5, 1, 2)), True)
+        # Setting one axis does not create the others.
+        src.x = src.x + 1
+        self.assertEqual(src._y, None)
+        self.assertEqual(src._z, None)
+        self.assertEqual(src.dataset.origin, (2, 2, 3))
+        self.assertEqual(N.allclose(src.m_data.spacing, (0.5, 1, 2)), True)
+        self.assertEqual(src.y[0, 1, 0], 3)
+        # A new shape keeps the origin and spacing.
+        src.reset(scalars=N.ones((2, 2, 2)))
+        self.assertEqual(src.grid.shape, (2, 2, 2))
+        self.assertEqual(src.x.shape, (2, 2, 2))
+        self.assertEqual(src.dataset.origin, (2, 2, 3))
+
+    def test_regular_grid(self):
+        "Test the regular grid descriptor."
+        x, y, z = self.x, self.y, self.z
+        grid = sources.RegularGrid.from_arrays(x, y, z)
+        self.assertEqual(grid.shape, (11, 12, 20))
+        self.assertEqual(grid.origin, (-10, -10, -10))
+        self.assertEqual(N.allclose(grid.coordinates(1),
+                                    N.broadcast_arrays(x, y, z)[1]), True)
+        bx, by, bz = grid.broadcast_arrays()
+        self.assertEqual(bz.shape, (11, 12, 20))
+        self.assertEqual(bz.strides[:2], (0, 0))
+        self.assertEqual(N.allclose(bz, grid.coordinates(2)), True)
+        # The functions do not create index arrays.
+        gx, gy, gz, s = sources.process_regular_scalars(N.ones((3, 4, 5)))
+        self.assertEqual(gx.strides, (8, 0, 0))
+        self.assertEqual(N.all(gx == N.indices((3, 4, 5))[0]), True)
 
 
 ################################################################################
@@ -900,6 +1014,128 @@ class TestMTriangularMeshSource(unittest.TestCase):
 
         self.check_traits()
 
+    def test_invalid_triangles(self):
+        "Test that invalid triangles are refused."
+        x, y, z, triangles, s, src = self.get_data()
+        self.assertRaises(ValueError, src.reset, triangles=N.array([[0, 1]]))
+        self.assertRaises(ValueError, src.reset,
+                          triangles=N.array([[0, 1, 3]]))
+
+
+################################################################################
+# `TestMRegularSurfaceSource`
+################################################################################
+class TestMRegularSurfaceSource(unittest.TestCase):
+    def setUp(self):
+        self.x = N.array([0., 1., 3., 4.])
+        self.y = N.array([0., 2., 3.])
+        self.s = N.arange(12.).reshape(4, 3)
+        src = sources.MRegularSurfaceSource()
+        src.reset(x=self.x, y=self.y, scalars=self.s, warp_scale=2)
+        self.src = src
+
+    def test_points(self):
+        "Test the warped points, numbered with x varying fastest."
+        p = self.src.points.reshape(3, 4, 3)
+        self.assertTrue(N.all(p[:, :, 0] == self.x))
+        self.assertTrue(N.all(p[:, :, 1] == self.y[:, None]))
+        self.assertTrue(N.all(p[:, :, 2] == 2*self.s.T))
+        self.assertEqual(self.src.dataset.number_of_cells, 6)
+
+    def test_plane_normals(self):
+        "Test that the normals of a plane are constant."
+        x, y = N.ogrid[0:1:5j, 0:2:4j]
+        src = self.src
+        src.reset(x=x, y=y, scalars=0.5*x + 0.25*y, warp_scale=1)
+        n = N.array([-0.5, -0.25, 1])/N.sqrt(1 + 0.25 + 0.0625)
+        self.assertTrue(N.allclose(src.normals, n))
+        src.warp_scale = 0
+        self.assertTrue(N.allclose(src.normals, [0, 0, 1]))
+
+    def test_update_region(self):
+        "Test that updating a region gives the same result as a reset."
+        src = self.src
+        src.update_region(slice(1, 3), slice(0, 1), [[5.], [-7.]])
+        full = sources.MRegularSurfaceSource()
+        full.reset(x=self.x, y=self.y, scalars=src.scalars.copy(),
+                   warp_scale=2)
+        self.assertTrue(N.allclose(src.points, full.points))
+        self.assertTrue(N.allclose(src.normals, full.normals))
+        self.assertRaises(ValueError, src.update_region, slice(0, 4, 2),
+                          slice(None))
+
+    def test_default_coordinates(self):
+        "Test the coordinates made from the shape of the scalars."
+        src = sources.MRegularSurfaceSource()
+        src.reset(scalars=self.s)
+        p = src.points.reshape(3, 4, 3)
+        self.assertTrue(N.all(p[0, :, 0] == [-2, -1, 0, 1]))
+        self.assertTrue(N.all(p[:, 0, 1] == [-1.5, -0.5, 0.5]))
+
+
+################################################################################
+# `TestValidation`
+################################################################################
+class TestValidation(unittest.TestCase):
+
+    def test_has_infinite(self):
+        "Test the chunked search of infinite values."
+        a = N.zeros((30, 20))
+        self.assertFalse(sources.has_infinite(a))
+        a[17, 3] = N.nan
+        self.assertFalse(sources.has_infinite(a))
+        a[29, 19] = -N.inf
+        self.assertTrue(sources.has_infinite(a))
+        # Non contiguous arrays.
+        self.assertTrue(sources.has_infinite(a.T[1::2]))
+        self.assertFalse(sources.has_infinite(a[:, :10]))
+        self.assertFalse(sources.has_infinite(N.arange(10)))
+
+    def test_iter_chunks(self):
+        "Test that the chunks cover the array."
+        a = N.arange(1000.).reshape(10, 100)
+        for arr in (a, a.T, a[:, ::3]):
+            chunks = list(sources.iter_chunks(arr, 64))
+            self.assertEqual(sum(c.size for c in chunks), arr.size)
+            self.assertEqual(sum(c.sum() for c in chunks), arr.sum())
+            self.assertTrue(max(c.size for c in chunks) <= 100)
+
+    def test_cache(self):
+        "Test that the checks of read-only arrays are cached."
+        a = N.ones(100)
+        a.flags.writeable = False
+        self.assertFalse(sources.has_infinite(a))
+        self.assertTrue(id(a) in sources._validation_cache)
+        # Writeable arrays, and views of them, are checked every time.
+        b = N.ones(100)
+        v = b[:]
+        v.flags.writeable = False
+        sources.has_infinite(b)
+        sources.has_infinite(v)
+        self.assertFalse(id(b) in sources._validation_cache)
+        self.assertFalse(id(v) in sources._validation_cache)
+        # The entries go away with the arrays.
+        key = id(a)
+        del a
+        self.assertFalse(key in sources._validation_cache)
+
+    def test_check_triangles(self):
+        "Test the checks of the triangles indices."
+        t = N.array([[0, 1, 2], [1, 2, 3]])
+        sources.check_triangles(t, 4, True)
+        self.assertRaises(ValueError, sources.check_triangles, t, 3, True)
+        self.assertRaises(ValueError, sources.check_triangles, -t, 4, True)
+        self.assertRaises(ValueError, sources.check_triangles, t.T, 4, True)
+        # The indices are not checked if the validation is off.
+        sources.check_triangles(t, 3, False)
+
+    def test_convert_to_arrays(self):
+        "Test the per call switch of the validation."
+        a = N.array([1., N.inf])
+        self.assertRaises(ValueError, sources.convert_to_arrays, [a], True)
+        x, = sources.convert_to_arrays([a], False)
+        self.assertTrue(x is a)
+
 
 
 if __name__ == '__main__':
@@ -274,6 +274,16 @@ class TestScalarField(BaseTestSource):
         self.check_positions(ss, x, y, z)
         self.check_scalars(ss, z)
 
+    def test_origin(self):
+        """ Check that the grid made from the indices of the data starts
+        at 1 """
+        s = np.random.random((4, 5, 6))
+        ss = sources.scalar_field(s, figure=None)
+        self.assertEqual(tuple(ss.origin), (1, 1, 1))
+        self.assertEqual(tuple(ss.spacing), (1, 1, 1))
+        ss = sources.vector_field(s, s, s, figure=None)
+        self.assertEqual(tuple(ss.origin), (1, 1, 1))
+
 
 ################################################################################
 # `TestVectorField`
@@ -436,6 +446,12 @@ class TestVerticalVectorsSource(unittest.TestCase):
                     sources.line_source, x[0, 0], y[0, 0], z[0, 0], s[0, 0],
                     figure=None)
 
+        # Unless the checks are switched off.
+        sources.scalar_field(x, y, z, s, figure=None, validate=False)
+        sources.vector_field(u, v, w, figure=None, validate=False)
+        self.assertRaises(ValueError,
+                    sources.vector_field, u, v, w, figure=None)
+
 
 
 if __name__ == '__main__':
@@ -0,0 +1,130 @@
+"""
+Tests for the memory mapped volume reader.
+"""
+# Copyright (c) 2013,  Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import os
+import shutil
+import tempfile
+import unittest
+
+# Enthought library imports.
+import numpy as np
+from tvtk.api import tvtk
+from mayavi.core.null_engine import NullEngine
+from mayavi.sources.mmap_volume_reader import MMapVolumeReader, \
+     read_meta_header
+from mayavi.modules.outline import Outline
+
+# Local imports.
+from common import get_example_data
+
+
+HEADER = """ObjectType = Image
+NDims = 3
+DimSize = 6 5 4
+ElementType = MET_SHORT
+ElementSpacing = 0.5 1.0 2.0
+Offset = 1.0 2.0 3.0
+BinaryDataByteOrderMSB = True
+HeaderSize = -1
+ElementDataFile = data.raw
+"""
+
+
+class TestMMapVolumeReader(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.data = np.arange(4*5*6, dtype='int16').reshape(4, 5, 6)
+        # Big endian data with some junk before it.
+        f = open(os.path.join(self.root, 'data.raw'), 'wb')
+        f.write('junk')
+        f.write(self.data.astype('>i2').tostring())
+        f.close()
+        self.mhd = os.path.join(self.root, 'data.mhd')
+        f = open(self.mhd, 'w')
+        f.write(HEADER)
+        f.close()
+
+        e = NullEngine()
+        e.start()
+        e.new_scene()
+        self.e = e
+
+    def tearDown(self):
+        self.e.stop()
+        shutil.rmtree(self.root)
+
+    def get_scalars(self, src):
+        img = src.outputs[0]
+        s = img.point_data.scalars.to_array()
+        return s.reshape(img.dimensions[::-1])
+
+    def test_read_meta_header(self):
+        data_file, kw = read_meta_header(self.mhd)
+        self.assertEqual(data_file, os.path.join(self.root, 'data.raw'))
+        self.assertEqual(list(kw['data_dimensions']), [6, 5, 4])
+        self.assertEqual(kw['data_type'], 'int16')
+        self.assertEqual(kw['byte_order'], 'big')
+        self.assertEqual(kw['header_size'], 4)
+        self.assertEqual(list(kw['data_origin']), [1.0, 2.0, 3.0])
+
+    def test_meta_image(self):
+        src = MMapVolumeReader()
+        src.initialize(self.mhd)
+        self.e.add_source(src)
+        src.add_module(Outline())
+        img = src.outputs[0]
+        self.assertEqual(img.dimensions, (6, 5, 4))
+        self.assertEqual(img.bounds, (1.0, 3.5, 2.0, 6.0, 3.0, 9.0))
+        self.assertTrue(np.all(self.get_scalars(src) == self.data))
+
+    def test_voi_and_sample_rate(self):
+        src = MMapVolumeReader()
+        src.initialize(self.mhd)
+        self.e.add_source(src)
+        src.set(voi=[1, 4, 0, -1, 1, 3], sample_rate=[2, 1, 2])
+        img = src.outputs[0]
+        expect = self.data[1:4:2, :, 1:5:2]
+        self.assertEqual(img.dimensions, expect.shape[::-1])
+        self.assertEqual(img.spacing, (1.0, 1.0, 4.0))
+        self.assertEqual(img.origin, (1.5, 2.0, 5.0))
+        self.assertTrue(np.all(self.get_scalars(src) == expect))
+        self.assertEqual(src.loaded_bytes, expect.nbytes)
+        # Full resolution windows can be read without changing the output.
+        arr = src.get_array(voi=[0, 1, 0, 1, 0, 1], sample_rate=[1, 1, 1])
+        self.assertTrue(np.all(arr == self.data[:2, :2, :2]))
+        self.assertEqual(img.dimensions, expect.shape[::-1])
+
+    def test_raw(self):
+        data = self.data.astype('float32')
+        fname = os.path.join(self.root, 'data2.raw')
+        data.tofile(fname)
+        src = MMapVolumeReader(data_dimensions=[6, 5, 4], data_type='float32')
+        src.initialize(fname)
+        self.e.add_source(src)
+        self.assertTrue(np.all(self.get_scalars(src) == data))
+        # The whole native volume is used directly from the map.
+        self.assertEqual(src.loaded_bytes, 0)
+        # The map is writable but changes do not reach the file.
+        arr = src.outputs[0].point_data.scalars.to_array()
+        self.assertTrue(arr.flags.writeable)
+        arr[0] = -1
+        self.assertTrue(np.all(np.fromfile(fname, 'float32') ==
+                               data.ravel()))
+
+    def test_compare_with_image_reader(self):
+        src = MMapVolumeReader()
+        src.initialize(get_example_data('foot.mha'))
+        r = tvtk.MetaImageReader(file_name=get_example_data('foot.mha'))
+        r.update()
+        self.assertEqual(src.outputs[0].dimensions, r.output.dimensions)
+        self.assertTrue(np.all(src.outputs[0].point_data.scalars.to_array() ==
+                               r.output.point_data.scalars.to_array()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+"""
+Tests for the pipeline profiler.
+"""
+# Copyright (c) 2013,  Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import unittest
+
+# Enthought library imports.
+from tvtk.api import tvtk
+from mayavi.core.null_engine import NullEngine
+from mayavi.core.profiler import profiler
+from mayavi.sources.vtk_data_source import VTKDataSource
+from mayavi.filters.poly_data_normals import PolyDataNormals
+from mayavi.modules.surface import Surface
+
+
+class TestProfiler(unittest.TestCase):
+
+    def setUp(self):
+        e = NullEngine()
+        e.start()
+        e.new_scene()
+        self.e = e
+        e.start_profiling()
+        src = tvtk.SphereSource(theta_resolution=50, phi_resolution=50)
+        src.update()
+        self.src = VTKDataSource(data=src.output)
+        e.add_source(self.src)
+        self.filter = PolyDataNormals()
+        e.add_filter(self.filter)
+        self.surface = Surface()
+        e.add_module(self.surface)
+
+    def tearDown(self):
+        self.e.stop_profiling()
+        profiler.uninstrument()
+        profiler.reset()
+        self.e.stop()
+
+    def get_record(self, obj, method):
+        for record in self.e.get_profile():
+            if record.object is obj and record.method == method:
+                return record
+
+    def test_records(self):
+        self.src.update()
+        r = self.get_record(self.filter, 'update_pipeline')
+        self.assertTrue(r.calls >= 1)
+        self.assertTrue(r.bytes > 0)
+        self.assertTrue(0 <= r.last_time <= r.total_time)
+        self.assertTrue(r.total_time <= r.inclusive_time)
+        r = self.get_record(self.filter, 'update_data')
+        self.assertEqual(r.calls, 1)
+        r = self.get_record(self.surface, 'update_data')
+        self.assertEqual(r.calls, 1)
+        r = self.get_record(self.surface.module_manager, 'update')
+        self.assertTrue(r.calls >= 1)
+        r = self.get_record(self.src, 'update')
+        self.assertEqual(r.calls, 1)
+        self.assertTrue(r.bytes > 0)
+
+    def test_sorted(self):
+        self.src.update()
+        times = [r.total_time for r in self.e.get_profile()]
+        self.assertEqual(times, sorted(times, reverse=True))
+        calls = [r.calls for r in self.e.get_profile('calls')]
+        self.assertEqual(calls, sorted(calls, reverse=True))
+
+    def test_stop_and_reset(self):
+        self.e.stop_profiling()
+        self.src.update()
+        self.assertEqual(self.get_record(self.src, 'update'), None)
+        self.e.start_profiling(reset=False)
+        self.src.update()
+        self.assertEqual(self.get_record(self.src, 'update').calls, 1)
+        self.e.start_profiling()
+        self.assertEqual(self.e.get_profile(), [])
+
+    def test_other_engine(self):
+        e = NullEngine()
+        e.start()
+        e.new_scene()
+        src = VTKDataSource(data=tvtk.PolyData())
+        e.add_source(src)
+        src.update()
+        records = self.e.get_profile()
+        self.assertFalse([r for r in records if r.object is src])
+        self.assertTrue(e.get_profile())
+        e.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+"""
+Tests for the process pool of the render farm.
+"""
+# Copyright (c) 2013,  Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+# Local imports.
+from mayavi.tools.render_farm import process_map, render_farm
+
+
+def square(param, index):
+    return param*param
+
+
+def fail(param, index):
+    if param == 3:
+        raise ValueError('oops')
+    return param
+
+
+def crash_once(param, index):
+    """Kills the worker the first time an item is run."""
+    marker = os.path.join(param, str(index))
+    if not os.path.exists(marker):
+        open(marker, 'w').close()
+        os._exit(1)
+    return index
+
+
+def hang_once(param, index):
+    marker = os.path.join(param, str(index))
+    if index == 1 and not os.path.exists(marker):
+        open(marker, 'w').close()
+        time.sleep(60)
+    return index
+
+
+def build_sphere(param):
+    """Builds a scene whose background records the parameter."""
+    from mayavi import mlab
+    if param < 0:
+        raise ValueError('negative parameter')
+    fig = mlab.gcf()
+    fig.scene.background = (param/10.0, 0, 0)
+    mlab.points3d([0], [0], [0], scale_factor=0.1, color=(1, 1, 1))
+
+
+class TestProcessMap(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_order(self):
+        result = list(process_map(square, xrange(20), n_workers=3))
+        self.assertEqual(result, [x*x for x in range(20)])
+        # Generators are read lazily.
+        it = process_map(square, (x for x in xrange(1000)), n_workers=2)
+        self.assertEqual(next(it), 0)
+        it.close()
+
+    def test_error(self):
+        it = process_map(fail, range(5), n_workers=2)
+        self.assertRaises(RuntimeError, list, it)
+
+    def test_restart(self):
+        result = list(process_map(crash_once, [self.root]*6, n_workers=2))
+        self.assertEqual(result, range(6))
+        # Items crashing every time give up.
+        it = process_map(crash_once, [self.root], n_workers=1,
+                         max_retries=0)
+        os.remove(os.path.join(self.root, '0'))
+        self.assertRaises(RuntimeError, list, it)
+
+    def test_timeout(self):
+        result = list(process_map(hang_once, [self.root]*3, n_workers=2,
+                                  timeout=1.0))
+        self.assertEqual(result, range(3))
+
+
+class TestRenderFarm(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_images(self):
+        params = [1, 9, 5, 3]
+        images = list(render_farm(build_sphere, params, size=(40, 30),
+                                  n_workers=2))
+        self.assertEqual(len(images), len(params))
+        for param, image in zip(params, images):
+            self.assertEqual(image.shape, (30, 40, 3))
+            # The corner pixel is the background of the right frame.
+            self.assertAlmostEqual(image[0, 0, 0]/255.0, param/10.0,
+                                   places=1)
+        images = list(render_farm(build_sphere, params[:2], size=(40, 30),
+                                  mode='rgba', n_workers=1))
+        self.assertEqual(images[0].shape, (30, 40, 4))
+
+    def test_files(self):
+        pattern = os.path.join(self.root, 'frame%03d.png')
+        names = list(render_farm(build_sphere, range(5), size=(40, 30),
+                                 file_pattern=pattern, n_workers=2))
+        self.assertEqual(names, [pattern%i for i in range(5)])
+        for name in names:
+            self.assertTrue(os.path.getsize(name) > 0)
+        self.assertEqual(sorted(os.listdir(self.root)),
+                         ['frame%03d.png'%i for i in range(5)])
+
+    def test_error(self):
+        it = render_farm(build_sphere, [1, 2, -1, 4], size=(40, 30),
+                         n_workers=2)
+        self.assertEqual(next(it).shape, (30, 40, 3))
+        try:
+            list(it)
+        except RuntimeError as e:
+            self.assertTrue('Item 2 failed' in str(e))
+            self.assertTrue('negative parameter' in str(e))
+        else:
+            self.fail('No error raised for a failing frame.')
+
+
+if __name__ == '__main__':
+    unittest.main()
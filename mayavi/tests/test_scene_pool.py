@@ -0,0 +1,138 @@
+"""
+Tests for the pool of offscreen scenes.
+"""
+# Copyright (c) 2013,  Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import unittest
+
+# Enthought library imports.
+from traits.api import HasTraits, Bool
+from tvtk.api import tvtk
+from mayavi.core.off_screen_engine import ScenePool, reset_scene, \
+     OffScreenEngine
+
+
+class FakeScene(HasTraits):
+    """A scene that is never rendered."""
+
+    disable_render = Bool(False)
+
+    parallel_projection = Bool(False)
+
+    def __init__(self, size):
+        super(FakeScene, self).__init__()
+        self.renderer = tvtk.Renderer()
+        self.size = size
+        self.closed = False
+
+    def _get_camera(self):
+        return self.renderer.active_camera
+
+    camera = property(_get_camera)
+
+    def get_size(self):
+        return self.size
+
+    def set_size(self, size):
+        self.size = size
+
+    def close(self):
+        self.closed = True
+
+
+class FakeViewer(object):
+    def __init__(self, size):
+        self.scene = FakeScene(size)
+
+
+class TestScenePool(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = ScenePool(max_size=2, factory=FakeViewer)
+
+    def test_reuse(self):
+        pool = self.pool
+        v1 = pool.get((100, 100))
+        v2 = pool.get((200, 100))
+        self.assertEqual(pool.n_created, 2)
+        self.assertTrue(pool.release(v1))
+        self.assertTrue(pool.release(v2))
+        self.assertEqual(len(pool), 2)
+        # A viewer of the same size is preferred.
+        self.assertTrue(pool.get((100, 100)) is v1)
+        # Otherwise an idle viewer is resized.
+        v = pool.get((50, 50))
+        self.assertTrue(v is v2)
+        self.assertEqual(v.scene.get_size(), (50, 50))
+        self.assertEqual(pool.n_reused, 2)
+        self.assertEqual(len(pool), 0)
+
+    def test_limits(self):
+        pool = self.pool
+        viewers = [pool.get((10, 10)) for i in range(3)]
+        self.assertTrue(pool.release(viewers[0]))
+        self.assertFalse(pool.release(viewers[0]))
+        self.assertTrue(pool.release(viewers[1]))
+        self.assertFalse(pool.release(viewers[2]))
+        pool.max_size = 1
+        self.assertEqual(len(pool), 1)
+        self.assertTrue(viewers[0].scene.closed)
+        pool.clear()
+        self.assertEqual(len(pool), 0)
+        self.assertTrue(viewers[1].scene.closed)
+
+    def test_reset(self):
+        v = self.pool.get((10, 10))
+        scene = v.scene
+        actor = tvtk.Actor()
+        scene.renderer.add_actor(actor)
+        scene.camera.set(position=(5, 5, 5), view_angle=10)
+        scene.parallel_projection = True
+        reset_scene(scene)
+        self.assertEqual(scene.renderer.view_props.number_of_items, 0)
+        self.assertEqual(scene.camera.position, (0, 0, 1))
+        self.assertEqual(scene.camera.view_angle, 30.0)
+        self.assertFalse(scene.parallel_projection)
+        self.assertFalse(scene.disable_render)
+
+
+class TestOffScreenEnginePool(unittest.TestCase):
+
+    def setUp(self):
+        e = OffScreenEngine(scene_pool=ScenePool(max_size=1))
+        e.start()
+        self.e = e
+
+    def tearDown(self):
+        self.e.stop()
+
+    def test_new_and_close_scene(self):
+        e = self.e
+        pool = e.scene_pool
+        v1 = e.new_scene()
+        e.close_scene(e.current_scene)
+        self.assertEqual(len(e.scenes), 0)
+        self.assertEqual(len(pool), 1)
+        v2 = e.new_scene()
+        self.assertTrue(v2 is v1)
+        self.assertEqual(pool.n_created, 1)
+        self.assertEqual(pool.n_reused, 1)
+        self.assertEqual(len(e.scenes), 1)
+        self.assertTrue(e.current_scene.scene is v1.scene)
+        # The events of the viewer are observed once.
+        for name in ('closing', 'activated'):
+            notifiers = v2._trait(name, 2)._notifiers(1)
+            self.assertEqual(len(notifiers), 1)
+        # The pool is full, the second viewer is closed.
+        v3 = e.new_scene()
+        self.assertFalse(v3 is v1)
+        e.close_scene(e.scenes[0])
+        e.close_scene(e.scenes[0])
+        self.assertEqual(len(pool), 1)
+        self.assertEqual(len(e.scenes), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
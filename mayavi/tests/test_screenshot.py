@@ -0,0 +1,160 @@
+"""
+Tests for reading screenshots into preallocated buffers.
+"""
+# Copyright (c) 2013,  Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import threading
+import time
+import unittest
+
+# Enthought library imports.
+import numpy as np
+from tvtk import array_handler
+from mayavi.tools.figure import screenshot, FrameGrabber
+
+
+class FakeRenderWindow(object):
+    """A render window filling the pixels with the frame number, the
+    rows are numbered from the bottom as with OpenGL."""
+
+    def __init__(self, size):
+        self.size = size
+        self.frame = 0
+        self.aa_frames = 0
+
+    def _fill(self, arr, n):
+        x, y = self.size
+        a = array_handler.vtk2array(arr).reshape(y, x, n)
+        a[:] = self.frame
+        a[0] = 0
+
+    def get_pixel_data(self, x0, y0, x1, y1, front, arr):
+        self._fill(arr, 3)
+
+    def get_rgba_char_pixel_data(self, x0, y0, x1, y1, front, arr):
+        self._fill(arr, 4)
+
+    def get_rgba_pixel_data(self, x0, y0, x1, y1, front, arr):
+        self._fill(arr, 4)
+
+    def get_zbuffer_data(self, x0, y0, x1, y1, arr):
+        array_handler.vtk2array(arr)[:] = 0.5
+
+
+class FakeScene(object):
+    anti_aliasing_frames = 8
+
+    def __init__(self, size):
+        self.render_window = FakeRenderWindow(size)
+
+    def get_size(self):
+        return self.render_window.size
+
+    def render(self):
+        pass
+
+    def _lift(self):
+        pass
+
+
+class FakeFigure(object):
+    def __init__(self, size=(8, 6)):
+        self.scene = FakeScene(size)
+
+
+class TestScreenshot(unittest.TestCase):
+
+    def setUp(self):
+        self.fig = FakeFigure()
+        self.fig.scene.render_window.frame = 7
+
+    def test_default(self):
+        arr = screenshot(self.fig)
+        self.assertEqual(arr.shape, (6, 8, 3))
+        self.assertEqual(arr.dtype, np.uint8)
+        # The bottom row is last.
+        self.assertTrue(np.all(arr[-1] == 0))
+        self.assertTrue(np.all(arr[0] == 7))
+        arr = screenshot(self.fig, mode='rgba')
+        self.assertEqual(arr.shape, (6, 8, 4))
+        self.assertEqual(arr.dtype, np.float32)
+
+    def test_out(self):
+        for n, dtype in ((3, np.uint8), (4, np.uint8), (4, np.float32)):
+            out = np.zeros((6, 8, n), dtype)
+            arr = screenshot(self.fig, out=out)
+            # The result is a flipped view of the buffer.
+            self.assertTrue(arr.base is out)
+            self.assertTrue(np.all(out[0] == 0))
+            self.assertTrue(np.all(out[1:] == 7))
+
+    def test_depth(self):
+        out = np.zeros((6, 8, 4), np.uint8)
+        depth = np.zeros((6, 8), np.float32)
+        arr, d = screenshot(self.fig, out=out, depth=depth)
+        self.assertTrue(d.base is depth)
+        self.assertTrue(np.all(depth == 0.5))
+
+    def test_bad_buffers(self):
+        self.assertRaises(ValueError, screenshot, self.fig,
+                          out=np.zeros((6, 8, 3), np.float32))
+        self.assertRaises(ValueError, screenshot, self.fig,
+                          out=np.zeros((8, 6, 3), np.uint8))
+        self.assertRaises(ValueError, screenshot, self.fig,
+                          out=np.zeros((6, 8, 3), np.uint8),
+                          depth=np.zeros((6, 8)))
+
+
+class TestFrameGrabber(unittest.TestCase):
+
+    def setUp(self):
+        self.fig = FakeFigure()
+
+    def test_no_callback(self):
+        g = FrameGrabber(self.fig, mode='rgba')
+        rw = self.fig.scene.render_window
+        rw.frame = 1
+        f1 = g.grab()
+        rw.frame = 2
+        f2 = g.grab()
+        # Double buffered: both frames are still valid.
+        self.assertTrue(np.all(f1[0] == 1))
+        self.assertTrue(np.all(f2[0] == 2))
+        rw.frame = 3
+        f3 = g.grab()
+        self.assertTrue(f3.base is f1.base)
+        g.close()
+
+    def test_callback(self):
+        result = []
+        lock = threading.Lock()
+
+        def callback(frame):
+            time.sleep(0.01)
+            with lock:
+                result.append(int(frame[0, 0, 0]))
+
+        g = FrameGrabber(self.fig, callback=callback, depth=True)
+        # With depth the callback gets a tuple.
+        g.callback = lambda f: callback(f[0])
+        rw = self.fig.scene.render_window
+        for i in range(10):
+            rw.frame = i
+            g.grab()
+        g.flush()
+        self.assertEqual(result, range(10))
+        g.close()
+
+    def test_callback_error(self):
+        def callback(frame):
+            raise RuntimeError('oops')
+        g = FrameGrabber(self.fig, callback=callback)
+        g.grab()
+        self.assertRaises(RuntimeError, g.flush)
+        g.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,6 +6,7 @@
 # Standard library imports.
 from os.path import abspath
 from StringIO import StringIO
+from multiprocessing.pool import ThreadPool
 import copy
 import numpy
 import unittest
@@ -143,7 +144,49 @@ class TestStreamline(unittest.TestCase):
         st.stream_tracer = tracer
         self.check()
 
-
+    def test_parallel_tracing(self):
+        """Test if the seeds traced in parallel give the same
+        streamlines and are cached."""
+        st = self.scene.children[0].children[0].children[1]
+        st.seed.update_poly_data()
+        tracer = st.stream_tracer
+        tracer.update()
+        n_points = tracer.output.number_of_points
+        n_lines = tracer.output.number_of_lines
+        self.assertTrue(n_lines > 0)
+
+        st.n_workers = 2
+        st.parallel_tracing = True
+        output = st.outputs[0]
+        self.assertTrue(output is st._streamlines)
+        self.assertEqual(output.number_of_points, n_points)
+        self.assertEqual(output.number_of_lines, n_lines)
+        # By default the seeds are traced by two worker threads, each
+        # with its own copy of the dataset.
+        seed_tracer = st._seed_tracer
+        self.assertFalse(seed_tracer.use_processes)
+        self.assertTrue(isinstance(seed_tracer._pool, ThreadPool))
+        self.assertEqual(seed_tracer._copies.qsize(), 2)
+
+        # Only the seeds that moved are traced.
+        cache = st._seed_tracer.cache
+        n_seeds = len(cache)
+        st.seed.widget.center = (-3.9, -3.8, -3.7)
+        st.seed.update_poly_data()
+        st._trace()
+        self.assertEqual(len(cache), 2*n_seeds)
+        n_lines = output.number_of_lines
+        self.assertTrue(n_lines > 0)
+
+        # Worker processes, where they can be forked, trace the same
+        # streamlines.
+        st.use_processes = True
+        self.assertEqual(output.number_of_lines, n_lines)
+        st.use_processes = False
+
+        st.parallel_tracing = False
+        self.assertTrue(st.outputs[0] is tracer.output)
+        self.assertEqual(st._seed_tracer, None)
 
     def test_save_and_restore(self):
         """Test if saving a visualization and restoring it works."""
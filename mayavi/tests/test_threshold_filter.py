@@ -72,6 +72,47 @@ class TestThresholdFilter(unittest.TestCase):
                          ))
         return
 
+    def check_sorted_index(self, threshold):
+        """Checks the output of the sorted index against the one of the
+        threshold filter."""
+        threshold.use_sorted_index = False
+        output = threshold.outputs[0]
+        expect = (output.number_of_cells, output.number_of_points,
+                  np.sort(output.point_data.scalars.to_array()),
+                  output.bounds)
+        threshold.use_sorted_index = True
+        output = threshold.outputs[0]
+        self.assertFalse(output is threshold.threshold_filter.output)
+        self.assertEqual(output.number_of_cells, expect[0])
+        self.assertEqual(output.number_of_points, expect[1])
+        self.assertTrue(np.all(
+            np.sort(output.point_data.scalars.to_array()) == expect[2]))
+        self.assertTrue(np.allclose(output.bounds, expect[3]))
+
+    def test_sorted_index(self):
+        src = self.make_src(nan=True)
+        self.e.add_source(src)
+        threshold = Threshold(use_sorted_index=True)
+        self.e.add_filter(threshold)
+        self.assertEqual([threshold._data_min, threshold._data_max],
+                         [np.nanmin(src.scalar_data),
+                          np.nanmax(src.scalar_data)])
+        threshold.upper_threshold = 20.
+        threshold.lower_threshold = 1.
+        self.check_sorted_index(threshold)
+        # The output is kept while scrubbing.
+        output = threshold.outputs[0]
+        threshold.lower_threshold = 3.5
+        self.assertTrue(threshold.outputs[0] is output)
+        self.check_sorted_index(threshold)
+        threshold.filter_type = 'points'
+        self.check_sorted_index(threshold)
+        # Settings of the threshold filter the index cannot handle.
+        threshold.filter_type = 'cells'
+        threshold.threshold_filter.all_scalars = False
+        self.assertTrue(threshold.outputs[0] is
+                        threshold.threshold_filter.output)
+
 
 
 if __name__ == '__main__':
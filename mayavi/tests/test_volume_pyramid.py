@@ -0,0 +1,183 @@
+"""
+Tests for the multi-resolution volume pyramid.
+"""
+# Copyright (c) 2013,  Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import unittest
+
+# Enthought library imports.
+import numpy as np
+from tvtk.api import tvtk
+from mayavi.core.null_engine import NullEngine
+from mayavi.sources.array_source import ArraySource
+from mayavi.modules.volume import Volume
+from mayavi.core.volume_pyramid import VolumePyramid, brick_ranges, \
+     max_opacity
+
+
+def make_image(shape=(20, 30, 40)):
+    """Returns image data with values increasing along x, and the
+    values as a (z, y, x) array."""
+    nz, ny, nx = shape
+    values = np.empty(shape, dtype=np.uint8)
+    values[...] = (np.arange(nx)*255//(nx - 1))[None, None, :]
+    img = tvtk.ImageData(dimensions=(nx, ny, nz), spacing=(1, 2, 3),
+                         origin=(-1, 0, 1))
+    img.point_data.scalars = values.ravel()
+    return img, values
+
+
+class TestVolumePyramid(unittest.TestCase):
+
+    def test_brick_ranges(self):
+        values = np.random.RandomState(0).rand(9, 13, 6)
+        values[4, 4, 4] = np.nan
+        lo, hi = brick_ranges(values, 4)
+        self.assertEqual(lo.shape, (3, 4, 2))
+        for k, j, i in np.ndindex(*lo.shape):
+            # The bricks overlap their next neighbours by one voxel.
+            brick = values[4*k:4*k + 5, 4*j:4*j + 5, 4*i:4*i + 5]
+            if np.isnan(brick).any():
+                self.assertTrue(np.isnan(lo[k, j, i]))
+                self.assertTrue(np.isnan(hi[k, j, i]))
+            else:
+                self.assertEqual(lo[k, j, i], brick.min())
+                self.assertEqual(hi[k, j, i], brick.max())
+
+    def test_max_opacity(self):
+        nodes = [(0.2, 0.0), (0.5, 0.3), (0.8, 0.0)]
+        lo = np.array([0.0, 0.3, 0.6, 0.9, 0.1])
+        hi = np.array([0.1, 0.4, 0.95, 1.0, 0.9])
+        expect = [0.0, 0.2, 0.2, 0.0, 0.3]
+        self.assertTrue(np.allclose(max_opacity(lo, hi, nodes), expect))
+        # Without clamping the function is zero outside the nodes.
+        nodes = [(0.2, 0.1), (0.5, 0.3)]
+        self.assertTrue(np.allclose(max_opacity(lo, hi, nodes, False),
+                                    [0.0, 0.7/3, 0.0, 0.0, 0.3]))
+        self.assertTrue(np.allclose(max_opacity(lo, hi, nodes, True),
+                                    [0.1, 0.7/3, 0.3, 0.3, 0.3]))
+
+    def test_levels(self):
+        img, values = make_image()
+        pyramid = VolumePyramid(img, brick_size=8, min_size=8)
+        levels = pyramid.levels
+        self.assertTrue(levels[0] is img)
+        self.assertEqual([l.dimensions[0] for l in levels], [40, 20, 10, 5])
+        self.assertEqual(tuple(levels[2].spacing), (4, 8, 12))
+        self.assertTrue(np.all(levels[1].point_data.scalars.to_array() ==
+                               values[::2, ::2, ::2].ravel()))
+        self.assertEqual(tuple(levels[1].origin), (-1, 0, 1))
+        self.assertEqual(pyramid.level_for(10**6), 0)
+        self.assertEqual(pyramid.level_for(2999), 2)
+        self.assertEqual(pyramid.level_for(1), 3)
+
+    def test_visible_bounds(self):
+        img, values = make_image()
+        pyramid = VolumePyramid(img, brick_size=8, min_size=8)
+        # Only the values above 128, at x >= 20, are visible.
+        nodes = [(0, 0.0), (128, 0.0), (255, 1.0)]
+        self.assertEqual(pyramid.visible_bricks(0, nodes).shape, (3, 4, 5))
+        bounds = pyramid.visible_bounds(0, nodes)
+        self.assertEqual(bounds, (-1 + 16, -1 + 39) + img.bounds[2:])
+        bounds = pyramid.visible_bounds(1, nodes)
+        self.assertEqual(bounds[:2], (-1 + 16, -1 + 38))
+        self.assertEqual(pyramid.visible_bounds(0, [(0, 0.0)]), None)
+
+
+class FakeScene(object):
+    """The renderer and interactor of a scene."""
+
+    def __init__(self):
+        self.renderer = tvtk.Renderer()
+        self.interactor = tvtk.RenderWindowInteractor()
+
+
+class TestVolumeMultiResolution(unittest.TestCase):
+
+    def setUp(self):
+        e = NullEngine()
+        e.start()
+        e.new_scene()
+        self.e = e
+        values = np.zeros((64, 64, 64), dtype=np.uint8)
+        values[40:, 10:20, :] = 200
+        self.src = ArraySource(scalar_data=values)
+        e.add_source(self.src)
+        self.volume = Volume(multi_resolution=True, brick_size=16,
+                             interactive_budget=40**3)
+        e.add_module(self.volume)
+
+    def tearDown(self):
+        self.e.stop()
+
+    def test_interaction(self):
+        volume = self.volume
+        mapper = volume.volume_mapper
+        data = self.src.outputs[0]
+        self.assertTrue(mapper.input is data)
+        volume._on_interaction(None, 'StartInteractionEvent')
+        self.assertEqual(volume._level, 1)
+        self.assertEqual(tuple(mapper.input.dimensions), (32, 32, 32))
+        # The end of the interaction schedules the refinement on the
+        # GUI event loop, which is not running here.
+        volume._interacting = False
+        volume._refine()
+        self.assertEqual(volume._level, 0)
+        self.assertTrue(mapper.input is data)
+        volume.multi_resolution = False
+        self.assertEqual(volume._pyramid, None)
+
+    def test_lazy_pyramid(self):
+        volume = self.volume
+        self.assertEqual(volume._pyramid, None)
+        # Changing the data does not build the pyramid.
+        self.src.scalar_data = self.src.scalar_data + 1
+        self.assertEqual(volume._pyramid, None)
+        self.assertTrue(volume.volume_mapper.input is self.src.outputs[0])
+        volume._on_interaction(None, 'StartInteractionEvent')
+        self.assertNotEqual(volume._pyramid, None)
+
+    def test_cropping(self):
+        volume = self.volume
+        volume.volume_property.get_scalar_opacity().add_point(128, 0.0)
+        volume._update_cropping()
+        mapper = volume.volume_mapper
+        self.assertTrue(mapper.cropping)
+        planes = mapper.cropping_region_planes
+        self.assertEqual(tuple(planes[2:4]), (0, 32))
+        volume.skip_empty_bricks = False
+        self.assertFalse(mapper.cropping)
+
+    def test_user_cropping(self):
+        volume = self.volume
+        mapper = volume.volume_mapper
+        user_planes = (0, 10, 0, 20, 0, 30)
+        vtk_mapper = tvtk.to_vtk(mapper)
+        vtk_mapper.SetCroppingRegionPlanes(user_planes)
+        vtk_mapper.SetCropping(1)
+        volume.volume_property.get_scalar_opacity().add_point(128, 0.0)
+        volume._update_cropping()
+        self.assertEqual(tuple(vtk_mapper.GetCroppingRegionPlanes()[2:4]),
+                         (0, 32))
+        # The cropping of the user is restored.
+        volume.multi_resolution = False
+        self.assertTrue(vtk_mapper.GetCropping())
+        self.assertEqual(tuple(vtk_mapper.GetCroppingRegionPlanes()),
+                         user_planes)
+
+    def test_scene_observers(self):
+        volume = self.volume
+        scene = FakeScene()
+        observers = volume._get_scene_observers(scene)
+        self.assertEqual([(obj, event) for obj, event, cb in observers],
+                         [(scene.interactor, 'StartInteractionEvent'),
+                          (scene.interactor, 'EndInteractionEvent'),
+                          (scene.renderer, 'StartEvent')])
+        volume.multi_resolution = False
+        self.assertEqual(volume._get_scene_observers(scene), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
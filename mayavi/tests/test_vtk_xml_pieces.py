@@ -0,0 +1,112 @@
+"""
+Tests for the concurrent loading of partitioned VTK XML files.
+"""
+# Copyright (c) 2013,  Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import os
+import shutil
+import tempfile
+import unittest
+
+# Enthought library imports.
+import numpy as np
+from tvtk.api import tvtk
+from mayavi.core.null_engine import NullEngine
+from mayavi.sources.vtk_xml_file_reader import VTKXMLFileReader
+from mayavi.sources.vtk_xml_pieces import load_pieces, \
+     read_piece_to_string, data_from_string
+from mayavi.modules.outline import Outline
+
+
+def write_pieces(writer, source, file_name, n_pieces=4):
+    w = writer(file_name=file_name, number_of_pieces=n_pieces,
+               start_piece=0, end_piece=n_pieces - 1)
+    w.set_input_connection(source.output_port)
+    w.write()
+
+
+class TestVTKXMLPieces(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.image = tvtk.RTAnalyticSource(whole_extent=(0, 20, 0, 20, 0, 20))
+        self.pvti = os.path.join(self.root, 'image.pvti')
+        write_pieces(tvtk.XMLPImageDataWriter, self.image, self.pvti)
+        self.sphere = tvtk.SphereSource(theta_resolution=30)
+        self.pvtp = os.path.join(self.root, 'sphere.pvtp')
+        write_pieces(tvtk.XMLPPolyDataWriter, self.sphere, self.pvtp, 3)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def get_image_scalars(self):
+        self.image.update()
+        return self.image.output.point_data.scalars.to_array()
+
+    def test_image_data(self):
+        expect = self.get_image_scalars()
+        for use_processes in (False, True):
+            data, files, times = load_pieces(self.pvti,
+                                             use_processes=use_processes)
+            self.assertEqual(len(files), 4)
+            self.assertEqual(len(times), 4)
+            self.assertEqual(data.extent, (0, 20, 0, 20, 0, 20))
+            self.assertTrue(np.allclose(data.point_data.scalars.to_array(),
+                                        expect))
+
+    def test_poly_data(self):
+        self.sphere.update()
+        expect = self.sphere.output
+        data, files, times = load_pieces(self.pvtp, n_workers=2)
+        self.assertEqual(data.number_of_cells, expect.number_of_cells)
+        self.assertTrue(data.point_data.normals is not None)
+
+    def test_piece_string(self):
+        x = np.array([0.0, 0.1, 0.5])
+        y = np.array([1.0, 2.0])
+        z = np.array([-1.0, 0.0, 1.0, 3.0])
+        grid = tvtk.RectilinearGrid(dimensions=(3, 2, 4), x_coordinates=x,
+                                    y_coordinates=y, z_coordinates=z)
+        values = np.random.RandomState(0).rand(24)
+        grid.point_data.scalars = values
+        file_name = os.path.join(self.root, 'grid.vtr')
+        w = tvtk.XMLRectilinearGridWriter(file_name=file_name, input=grid)
+        w.write()
+        (d_type, s), t = read_piece_to_string(('RectilinearGrid', file_name))
+        data = tvtk.to_tvtk(data_from_string((d_type, s)))
+        # The dataset type and the values are kept exactly.
+        self.assertTrue(data.is_a('vtkRectilinearGrid'))
+        self.assertEqual(tuple(data.dimensions), (3, 2, 4))
+        self.assertTrue(np.all(data.z_coordinates.to_array() == z))
+        self.assertTrue(np.all(data.point_data.scalars.to_array() ==
+                               values))
+
+    def test_subset(self):
+        data, files, times = load_pieces(self.pvti, pieces=[1, 3])
+        self.assertEqual(len(files), 2)
+        self.assertEqual(data.extent, (0, 20, 10, 20, 0, 20))
+
+    def test_reader(self):
+        e = NullEngine()
+        e.start()
+        e.new_scene()
+        r = VTKXMLFileReader(parallel_pieces=True)
+        r.initialize(self.pvti)
+        e.add_source(r)
+        e.add_module(Outline())
+        self.assertEqual(len(r.piece_times), 4)
+        self.assertEqual(r.point_scalars_name, 'RTData')
+        self.assertEqual(r.outputs[0].number_of_points, 21**3)
+        r.pieces = [0]
+        self.assertEqual(r.piece_files, [os.path.join(self.root,
+                                                      'image_0.vti')])
+        self.assertEqual(r.outputs[0].number_of_points, 21*11*11)
+        r.parallel_pieces = False
+        self.assertEqual(r.outputs[0].number_of_points, 21**3)
+        e.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -25,38 +25,139 @@ from numpy import pi
 from engine_manager import get_engine
 
 
-def world_to_display(x, y, z, figure=None):
+def _get_scene(figure):
+    """ Returns the scene of the given figure or the current one, or None.
+    """
+    if figure is None:
+        f = get_engine().current_scene
+    else:
+        f = figure
+    if f is None or f.scene is None:
+        return None
+    return f.scene
+
+
+def get_world_to_display_matrix(figure=None):
+    """ Returns the 4x4 matrix transforming homogeneous world
+        coordinates to homogeneous display coordinates for the current
+        camera and viewport of the figure.
+
+        The display coordinates are pixels from the bottom left corner
+        of the window and the depth, between 0 at the near clipping
+        plane and 1 at the far one, as in the depth buffer.  The
+        coordinates are obtained by dividing by the fourth homogeneous
+        coordinate.
+
+        **Parameters**
+
+        :figure: Mayavi figure or None
+            The figure to use. If None, the current one is used.
+    """
+    scene = _get_scene(figure)
+    if scene is None:
+        return None
+    width, height = [float(v) for v in scene.get_size()]
+    vp = scene._renderer.viewport
+    vp_width = width * (vp[2] - vp[0])
+    vp_height = height * (vp[3] - vp[1])
+    aspect = vp_width / max(vp_height, 1)
+
+    # World to normalized view coordinates, with the depth in [0, 1].
+    view = scene.camera.get_composite_projection_transform_matrix(
+                                                    aspect, 0, 1).to_array()
+    # Normalized view coordinates to display coordinates.
+    display = np.array([[.5 * vp_width, 0, 0, .5 * vp_width + width * vp[0]],
+                        [0, .5 * vp_height, 0, .5 * vp_height + height * vp[1]],
+                        [0, 0, 1, 0],
+                        [0, 0, 0, 1]])
+    return np.dot(display, view)
+
+
+def world_to_display(x, y, z, figure=None, depth=False):
     """ Converts 3D world coordinates to screenshot pixel coordinates.
 
+        The coordinates may be arrays, in which case all the points are
+        converted at once.
+
         **Parameters**
 
-        :x: float
+        :x: float or array
             World x coordinate
-        :y: float
+        :y: float or array
             World y coordinate
-        :z: float
+        :z: float or array
             World z coordinate
         :figure: Mayavi figure or None
             The figure to use for the conversion. If None, the
             current one is used.
+        :depth: bool
+            If True the depth of the points is also returned.
 
         **Output**
-        :x: float
+        :x: float or array
             Screenshot x coordinate
-        :y: float
+        :y: float or array
             Screenshot y coordinate
+        :depth: float or array
+            The depth of the points, between 0 at the near clipping
+            plane and 1 at the far one, only if `depth` is True.
     """
-    if figure is None:
-        f = get_engine().current_scene
-    else:
-        f = figure
-    if f is None or f.scene is None:
+    matrix = get_world_to_display_matrix(figure)
+    if matrix is None:
+        if depth:
+            return 0, 0, 0
         return 0, 0
 
-    f.scene._renderer.world_point = [x, y, z, 1]
-    f.scene._renderer.world_to_display()
-    x, y, _ = f.scene._renderer.display_point
-    return x, y
+    x, y, z = np.broadcast_arrays(*[np.asarray(v, dtype=float)
+                                    for v in (x, y, z)])
+    w = matrix[3, 0] * x + matrix[3, 1] * y + matrix[3, 2] * z + matrix[3, 3]
+    result = [(matrix[i, 0] * x + matrix[i, 1] * y + matrix[i, 2] * z
+               + matrix[i, 3]) / w for i in range(3 if depth else 2)]
+    if result[0].ndim == 0:
+        result = [float(v) for v in result]
+    return tuple(result)
+
+
+def display_to_world(x, y, depth=0, figure=None):
+    """ Converts screenshot pixel coordinates to 3D world coordinates.
+
+        This is the inverse of `world_to_display`.  The coordinates may
+        be arrays, in which case all the points are converted at once.
+
+        **Parameters**
+
+        :x: float or array
+            Screenshot x coordinate
+        :y: float or array
+            Screenshot y coordinate
+        :depth: float or array
+            The depth of the points, between 0 at the near clipping
+            plane and 1 at the far one.
+        :figure: Mayavi figure or None
+            The figure to use for the conversion. If None, the
+            current one is used.
+
+        **Output**
+        :x: float or array
+            World x coordinate
+        :y: float or array
+            World y coordinate
+        :z: float or array
+            World z coordinate
+    """
+    matrix = get_world_to_display_matrix(figure)
+    if matrix is None:
+        return 0, 0, 0
+    matrix = np.linalg.inv(matrix)
+
+    x, y, d = np.broadcast_arrays(*[np.asarray(v, dtype=float)
+                                    for v in (x, y, depth)])
+    w = matrix[3, 0] * x + matrix[3, 1] * y + matrix[3, 2] * d + matrix[3, 3]
+    result = [(matrix[i, 0] * x + matrix[i, 1] * y + matrix[i, 2] * d
+               + matrix[i, 3]) / w for i in range(3)]
+    if result[0].ndim == 0:
+        result = [float(v) for v in result]
+    return tuple(result)
 
 
 def roll(roll=None, figure=None):
@@ -112,8 +213,57 @@ def get_camera_direction(cam):
     return r, theta, phi, fp
 
 
-def get_outline_bounds(figure=None):
+def _get_visible_bounds(scene):
+    """ Returns the corners of the bounding boxes of the visible 3D
+        props of the scene as an (N, 3) array.
+    """
+    # Lazy import, to avoid loading tvtk when importing the module.
+    from tvtk.api import tvtk
+    corners = []
+    for prop in scene._renderer.view_props:
+        if not isinstance(prop, tvtk.Prop3D) or not prop.visibility or \
+                not getattr(prop, 'use_bounds', True):
+            continue
+        b = prop.bounds
+        if b is None or b[0] > b[1]:
+            continue
+        corners.extend([(x, y, z) for x in b[:2] for y in b[2:4]
+                                  for z in b[4:]])
+    return np.array(corners, dtype=float).reshape(-1, 3)
+
+
+def _project_outline_bounds(figure, scene):
+    """ Returns the pixel bounds of the visible objects obtained by
+        projecting their bounding boxes, or None if this is not possible.
+    """
+    corners = _get_visible_bounds(scene)
+    matrix = get_world_to_display_matrix(figure)
+    if len(corners) == 0 or matrix is None:
+        return None
+    points = np.dot(np.c_[corners, np.ones(len(corners))], matrix.T)
+    if np.any(points[:, 3] <= 0):
+        # Some corners are behind the camera.
+        return None
+    x = points[:, 0] / points[:, 3]
+    y = points[:, 1] / points[:, 3]
+    width, height = [float(v) for v in scene.get_size()]
+    x_min = np.clip(np.floor(x.min()), 0, width - 1)
+    x_max = np.clip(np.ceil(x.max()), 0, width - 1)
+    # The rows are counted from the top of the window, as in a
+    # screenshot.
+    y_min = np.clip(height - 1 - np.ceil(y.max()), 0, height - 1)
+    y_max = np.clip(height - 1 - np.floor(y.min()), 0, height - 1)
+    return x_min, x_max, y_min, y_max, width, height
+
+
+def get_outline_bounds(figure=None, exact=False):
     """ Return the pixel bounds of the objects visible on the figure.
+
+        The bounds are computed by projecting the bounding boxes of the
+        visible 3D objects on the screen, which is cheap but may give
+        somewhat larger bounds.  If `exact` is True, or if the boxes
+        cannot be projected, a screenshot is taken and the pixels that
+        differ from the background are used.
     """
     if figure is None:
         f = get_engine().current_scene
@@ -125,12 +275,17 @@ def get_outline_bounds(figure=None):
     if scene is None:
         return 1, 1, 1, 1
 
+    if not exact:
+        bounds = _project_outline_bounds(f, scene)
+        if bounds is not None:
+            return bounds
+
     # Lazy import, to avoid circular imports
     from figure import screenshot
     red, green, blue = scene.background
 
     # Use mode='rgba' to have float values, as with fig.scene.background
-    outline = screenshot(mode='rgba')
+    outline = screenshot(figure=f, mode='rgba')
     outline = ((outline[..., 0] != red)
                 + (outline[..., 1] != green)
                 + (outline[..., 2] != blue)
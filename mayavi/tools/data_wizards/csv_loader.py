@@ -3,8 +3,10 @@
 # License: BSD Style.
 
 
+from StringIO import StringIO
+
 from traits.api import HasTraits, Str, Int, Array, List, \
-    Instance, on_trait_change, Property, Button
+    Instance, on_trait_change, Property, Button, Bool
 
 from pyface.api import GUI
 
@@ -65,7 +67,17 @@ class CSVLoader(HasTraits):
 
     data_dict = Property(depends_on='data')
 
+    # The number of bytes at the start of the file loaded for the
+    # preview, the whole file is loaded when `data_dict` is needed.
+    preview_size = Int(1024*1024,
+        desc="The number of bytes of the file loaded for the preview")
+
+    # True if `data` only holds the start of the file.
+    is_preview = Bool(False)
+
     def _get_data_dict(self):
+        if self.is_preview:
+            self.load_data()
         return array2dict(self.data)
 
     def guess_defaults(self):
@@ -91,9 +103,13 @@ class CSVLoader(HasTraits):
                                  column_number=i,
                                  my_name=val)
                         for i, val in enumerate(self.names)]
-        self.load_data()
+        self.load_data(preview=True)
 
-    def load_data(self):
+    def load_data(self, preview=False):
+        """ Load the data using the current settings.  If `preview`
+            is True only the first `preview_size` bytes of the file
+            are loaded.
+        """
         kwds = {}
         kwds['delimiter'] = self.delimiter
         kwds['comments'] = self.comments
@@ -101,8 +117,20 @@ class CSVLoader(HasTraits):
         kwds['dtype'] = dict(names=self.names,
                              formats=self.formats)
 
+        fname = self.filename
+        if preview:
+            f = open(fname, 'rb')
+            text = f.read(self.preview_size)
+            # Complete the last line.
+            text += f.readline()
+            preview = len(f.read(1)) > 0
+            f.close()
+            if preview:
+                fname = StringIO(text)
+
         try:
-            self.data = loadtxt(self.filename, **kwds)
+            self.data = loadtxt(fname, **kwds)
+            self.is_preview = preview
         except:
             pass
 
@@ -129,7 +157,7 @@ class CSVLoaderController(Controller):
 
     @on_trait_change('update_preview')
     def load_data(self):
-        self.model.load_data()
+        self.model.load_data(preview=True)
 
     @on_trait_change('model.columns.my_name,model.data')
     def update_table_editor(self, object, name, old, new):
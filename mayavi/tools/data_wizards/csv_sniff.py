@@ -31,6 +31,10 @@ class Sniff(object):
     """
     def __init__(self, filename):
         self._filename = filename
+        # The results of splitting and typing the sample lines, which
+        # are looked at several times.
+        self._split_cache = {}
+        self._datatypes_cache = {}
         self._lines = self._read_few_lines()
         self._reallines = [line for line in self._lines if line.strip()]
         self._dialect = csv.Sniffer().sniff(self._reallines[-1])
@@ -68,10 +72,14 @@ class Sniff(object):
         return res
 
     def _split(self, line):
-        if self._usePySplit:
-            return line.split()
-        else:
-            return csv.reader([line], self._dialect).next()
+        key = (line, self._usePySplit)
+        if key not in self._split_cache:
+            if self._usePySplit:
+                res = line.split()
+            else:
+                res = csv.reader([line], self._dialect).next()
+            self._split_cache[key] = res
+        return self._split_cache[key]
 
     def _names(self):
         if self._datatypes != self._numcols * (str,):
@@ -102,6 +110,12 @@ class Sniff(object):
         return tuple(res)
 
     def _datatypes_of_line(self, line):
+        key = (line, self._usePySplit)
+        if key not in self._datatypes_cache:
+            self._datatypes_cache[key] = self._get_datatypes(line)
+        return self._datatypes_cache[key]
+
+    def _get_datatypes(self, line):
 
         def isFloat(s):
             try:
@@ -3,9 +3,30 @@
 #   is a bug the loadtxt function of numpy 1.0.4.
 #   In the future this file can be removed, once Mayavi depends on
 #   numpy 1.1.0 (or higher).
+#
+#   The function has since been changed to read the file in chunks of
+#   lines which are parsed with vectorized numpy calls on a pool of
+#   threads whenever all the columns are numeric.
+
+import os
+import re
+from itertools import islice
+from multiprocessing import cpu_count
+from multiprocessing.pool import ThreadPool
+from StringIO import StringIO
 
 import numpy as np
 
+# The default size in bytes of the chunks the file is read in.
+CHUNK_SIZE = 4*1024*1024
+
+# A lookup table of the byte values of the whitespace characters.
+_IS_SPACE = np.zeros(256, bool)
+_IS_SPACE[[ord(c) for c in ' \t\n\r\v\f']] = True
+
+# Matches the characters that are not part of integers.
+_NOT_INTEGER = re.compile(r'[^-+0-9\s]')
+
 
 def _string_like(obj):
     try:
@@ -15,12 +36,24 @@ def _string_like(obj):
     return 1
 
 
+def _to_int(x):
+    """Converts the string `x` to an integer exactly.  Integers written
+    as real numbers, such as '2.0' or '1e3', are accepted."""
+    try:
+        return int(x)
+    except ValueError:
+        value = float(x)
+        if value != int(value):
+            raise ValueError('invalid literal for an integer: %r' % x)
+        return int(value)
+
+
 def _getconv(dtype):
     typ = dtype.type
     if issubclass(typ, np.bool_):
         return lambda x: bool(int(x))
     if issubclass(typ, np.integer):
-        return lambda x: int(float(x))
+        return _to_int
     elif issubclass(typ, np.floating):
         return float
     elif issubclass(typ, np.complex):
@@ -30,7 +63,8 @@ def _getconv(dtype):
 
 
 def loadtxt(fname, dtype=float, comments='#', delimiter=None, converters=None,
-            skiprows=0, usecols=None, unpack=False):
+            skiprows=0, usecols=None, unpack=False, chunk_size=CHUNK_SIZE,
+            n_threads=0):
     """
     Load ASCII data from fname into an array and return the array.
 
@@ -71,6 +105,16 @@ def loadtxt(fname, dtype=float, comments='#', delimiter=None, converters=None,
       If True, will transpose the matrix allowing you to unpack into named
       arguments on the left hand side.
 
+    chunk_size : int
+      The approximate size in bytes of the chunks of lines the file is
+      read and parsed in.
+
+    n_threads : int
+      The number of threads parsing the chunks, if 0 the number of CPUs
+      is used.  Chunks are parsed with vectorized numpy calls when all
+      the columns are numeric and no converters are given, otherwise
+      they are parsed line by line.
+
     Examples
     --------
       >>> X = loadtxt('test.dat')  # data in two columns
@@ -86,13 +130,15 @@ def loadtxt(fname, dtype=float, comments='#', delimiter=None, converters=None,
         if fname.endswith('.gz'):
             import gzip
             fh = gzip.open(fname)
+            size = 0
         else:
-            fh = file(fname)
+            fh = file(fname, 'rb')
+            size = os.path.getsize(fname)
     elif hasattr(fname, 'seek'):
         fh = fname
+        size = 0
     else:
         raise ValueError('fname must be a string or file handle')
-    X = []
 
     dtype = np.dtype(dtype)
     defconv = _getconv(dtype)
@@ -102,10 +148,212 @@ def loadtxt(fname, dtype=float, comments='#', delimiter=None, converters=None,
         if dtype.names is not None:
             converterseq = [_getconv(dtype.fields[name][0]) \
                             for name in dtype.names]
+        vectorize = _is_numeric(dtype)
+    else:
+        vectorize = False
 
-    for i, line in enumerate(fh):
-        if i < skiprows:
-            continue
+    for i in xrange(skiprows):
+        fh.readline()
+
+    parse = lambda chunk: _parse_chunk(chunk, dtype, comments, delimiter,
+                                       usecols, vectorize, converters,
+                                       defconv, converterseq)
+    if n_threads <= 0:
+        n_threads = cpu_count()
+    pool = None
+    if n_threads > 1:
+        pool = ThreadPool(n_threads)
+
+    # The output is preallocated from an estimate of the number of
+    # lines, made from the first chunk, and grown when needed.
+    X = None
+    n = 0
+    try:
+        chunks = _read_chunks(fh, chunk_size)
+        while True:
+            # Read only a few chunks at a time to bound the memory used.
+            batch = list(islice(chunks, 2*n_threads))
+            if len(batch) == 0:
+                break
+            if pool is None:
+                arrays = [parse(c) for c in batch]
+            else:
+                arrays = pool.map(parse, batch)
+            for chunk, arr in zip(batch, arrays):
+                if len(arr) == 0:
+                    continue
+                if X is None:
+                    estimate = len(arr)
+                    if size > 0:
+                        estimate = int(1.05*len(arr)*size/len(chunk)) + 1
+                    X = np.empty((max(estimate, len(arr)),) + arr.shape[1:],
+                                 arr.dtype)
+                elif arr.shape[1:] != X.shape[1:]:
+                    raise ValueError('Wrong number of columns in the file.')
+                if n + len(arr) > len(X):
+                    new = np.empty((max(2*len(X), n + len(arr)),) +
+                                   X.shape[1:], X.dtype)
+                    new[:n] = X[:n]
+                    X = new
+                X[n:n+len(arr)] = arr
+                n += len(arr)
+    finally:
+        if pool is not None:
+            pool.close()
+        if fh is not fname:
+            fh.close()
+
+    if X is None:
+        X = np.array([], dtype)
+    elif n < len(X):
+        # No views of X exist so it can be shrunk in place.
+        X.resize((n,) + X.shape[1:], refcheck=False)
+    X = np.squeeze(X)
+    if unpack:
+        return X.T
+    else:
+        return X
+
+
+def _field_types(dtype):
+    """Returns the list of the dtypes of the fields of `dtype`."""
+    if dtype.names is None:
+        return [dtype]
+    return [dtype.fields[name][0] for name in dtype.names]
+
+
+def _is_numeric(dtype):
+    """Returns True if all the fields of `dtype` are integer or real
+    numbers."""
+    for t in _field_types(dtype):
+        if t.shape or not (issubclass(t.type, np.floating) or
+                           (issubclass(t.type, np.integer) and
+                            not issubclass(t.type, np.bool_))):
+            return False
+    return True
+
+
+def _read_chunks(fh, chunk_size):
+    """Yields chunks of about `chunk_size` bytes of complete lines from
+    the file."""
+    while True:
+        chunk = fh.read(chunk_size)
+        if not chunk:
+            break
+        if not chunk.endswith('\n'):
+            chunk += fh.readline()
+        yield chunk
+
+
+def _line_tokens(text, delimiter=None):
+    """Returns the number of whitespace separated tokens of each of the
+    non blank lines of `text`.  If a single character `delimiter` is
+    given it also separates the tokens, and the tokens of each line
+    must be separated by exactly one delimiter, with none before the
+    first or after the last: the number of tokens is None otherwise.
+    """
+    if len(text) == 0:
+        return np.zeros(0, int)
+    b = np.frombuffer(text, np.uint8)
+    space = _IS_SPACE[b]
+    if delimiter is not None:
+        is_delim = b == ord(delimiter)
+        space = space | is_delim
+    # A token starts at a non space preceded by a space.
+    starts = np.flatnonzero(~space[1:] & space[:-1]) + 1
+    if not space[0]:
+        starts = np.r_[0, starts]
+    lines = np.cumsum(b == ord('\n'))[starts]
+    # The tokens are sorted by line, count the runs of equal lines.
+    first = np.flatnonzero(np.r_[True, lines[1:] != lines[:-1]])
+    counts = np.diff(np.r_[first, len(lines)])
+    if delimiter is not None:
+        n_delims = np.cumsum(is_delim)
+        gaps = np.diff(n_delims[starts])[lines[1:] == lines[:-1]]
+        if (gaps != 1).any() or n_delims[-1] != len(gaps):
+            return None
+    return counts
+
+
+def _parse_chunk(chunk, dtype, comments, delimiter, usecols, vectorize,
+                 converters, defconv, converterseq):
+    """Parses a chunk of lines and returns the array of its rows.  This
+    is called on the worker threads."""
+    if vectorize:
+        arr = _parse_numeric(chunk, dtype, comments, delimiter, usecols)
+        if arr is not None:
+            return arr
+    # Fall back to parsing the lines one by one.
+    X = _parse_lines(StringIO(chunk), comments, delimiter, usecols,
+                     converters, defconv, converterseq, dtype.names)
+    return np.array(X, dtype)
+
+
+def _parse_numeric(chunk, dtype, comments, delimiter, usecols):
+    """Parses a chunk of numeric data with vectorized calls.  Returns
+    None if the chunk cannot be parsed this way."""
+    text = chunk
+    if comments and comments in text:
+        text = re.sub(re.escape(comments) + '[^\n]*', '', text)
+    if delimiter is not None and len(delimiter) > 1:
+        # A single character stands for the delimiter.
+        if '\0' in text:
+            return None
+        text = text.replace(delimiter, '\0')
+        delimiter = '\0'
+
+    # Empty fields, fields with spaces and delimiters at the ends of
+    # lines are left to the line parser, which strips the lines and
+    # reports the errors.
+    line_tokens = _line_tokens(text, delimiter)
+    if line_tokens is None or len(line_tokens) == 0:
+        return None
+    ncols = int(line_tokens[0])
+    if (line_tokens != ncols).any():
+        # Ragged lines, which are errors.
+        return None
+    nrows = len(line_tokens)
+    n_tokens = nrows*ncols
+    if delimiter is not None:
+        text = text.replace(delimiter, ' ')
+    is_int = [issubclass(t.type, np.integer) for t in _field_types(dtype)]
+    if all(is_int):
+        # Integers are parsed as such, not through doubles.  Integers
+        # written as real numbers are left to the line parser.
+        if _NOT_INTEGER.search(text):
+            return None
+        values = np.fromstring(text, np.int64, sep=' ')
+    else:
+        values = np.fromstring(text, sep=' ')
+    if len(values) != n_tokens:
+        return None
+    values = values.reshape(nrows, ncols)
+    if usecols is not None:
+        values = values[:, list(usecols)]
+
+    if dtype.names is None:
+        return values.astype(dtype)
+    if values.shape[1] != len(dtype.names):
+        return None
+    result = np.empty(nrows, dtype)
+    for i, name in enumerate(dtype.names):
+        column = values[:, i]
+        if is_int[i] and not all(is_int) and \
+               ((column != np.floor(column)).any() or
+                (abs(column) >= 2**53).any()):
+            # Not exactly integers, the line parser reports the error
+            # or reads large integers exactly.
+            return None
+        result[name] = column
+    return result
+
+
+def _parse_lines(fh, comments, delimiter, usecols, converters, defconv,
+                 converterseq, names):
+    """Parses the lines of `fh` one by one and returns the list of
+    rows."""
+    X = []
+    for line in fh:
         comment_start = line.find(comments)
         if comment_start != -1:
             line = line[:comment_start].strip()
@@ -121,13 +369,7 @@ def loadtxt(fname, dtype=float, comments='#', delimiter=None, converters=None,
             row = [converterseq[j](vals[j]) for j in usecols]
         else:
             row = [converterseq[j](val) for j, val in enumerate(vals)]
-        if dtype.names is not None:
+        if names is not None:
             row = tuple(row)
         X.append(row)
-
-    X = np.array(X, dtype)
-    X = np.squeeze(X)
-    if unpack:
-        return X.T
-    else:
-        return X
+    return X
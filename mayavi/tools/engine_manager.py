@@ -12,7 +12,7 @@ from traits.api import HasTraits, Instance
 from mayavi.preferences.api import preference_manager
 from mayavi.core.registry import registry
 from mayavi.core.engine import Engine
-from mayavi.core.off_screen_engine import OffScreenEngine
+from mayavi.core.off_screen_engine import OffScreenEngine, ScenePool
 from mayavi.core.null_engine import NullEngine
 from mayavi.core.common import process_ui_events
 from preferences_mirror import PreferencesMirror
@@ -153,6 +153,9 @@ class EngineManager(HasTraits):
         else:
             if options.offscreen:
                 engine = OffScreenEngine(name='Mlab offscreen Engine')
+                if options.scene_pool_size > 0:
+                    engine.scene_pool = ScenePool(
+                                    max_size=options.scene_pool_size)
                 engine.start()
             else:
                 engine = Engine(name='Mlab Engine')
@@ -12,6 +12,8 @@ from types import IntType
 import gc
 import warnings
 import copy
+import threading
+import Queue
 
 import numpy as np
 
@@ -20,6 +22,7 @@ from pyface.timer.api import do_later
 
 #  imports
 from tvtk.api import tvtk
+from tvtk import array_handler
 from mayavi.core.scene import Scene
 from mayavi.core.registry import registry
 from .camera import view
@@ -261,7 +264,39 @@ def sync_camera(reference_figure, target_figure):
             lambda: do_later(target_figure.scene.render))
 
 
-def screenshot(figure=None, mode='rgb', antialiased=False):
+def _check_buffer(arr, shape, dtypes, name):
+    """ Check that a buffer given to screenshot can be written into
+        directly.
+    """
+    if not isinstance(arr, np.ndarray) or tuple(arr.shape) != shape or \
+            arr.dtype not in dtypes or not arr.flags.c_contiguous or \
+            not arr.flags.writeable:
+        raise ValueError('%s must be a writeable contiguous array of shape '
+                         '%s and type %s' % (name, shape,
+                                ' or '.join(str(d) for d in dtypes)))
+
+
+def _read_pixels(figure, out, depth=None):
+    """ Read the pixels of the figure into the numpy array out, and the
+        depth buffer into the array depth if given, without copies.
+    """
+    rw = figure.scene.render_window
+    y, x, n = out.shape
+    # The VTK arrays point to the memory of the numpy arrays.
+    vtk_out = array_handler.array2vtk(out.reshape(x * y, n))
+    if out.dtype == np.float32:
+        rw.get_rgba_pixel_data(0, 0, x - 1, y - 1, 1, vtk_out)
+    elif n == 4:
+        rw.get_rgba_char_pixel_data(0, 0, x - 1, y - 1, 1, vtk_out)
+    else:
+        rw.get_pixel_data(0, 0, x - 1, y - 1, 1, vtk_out)
+    if depth is not None:
+        vtk_depth = array_handler.array2vtk(depth.reshape(x * y))
+        rw.get_zbuffer_data(0, 0, x - 1, y - 1, vtk_depth)
+
+
+def screenshot(figure=None, mode='rgb', antialiased=False, out=None,
+               depth=None):
     """ Return the current figure pixmap as an array.
 
         **Parameters**
@@ -274,6 +309,17 @@ def screenshot(figure=None, mode='rgb', antialiased=False):
             Use anti-aliasing for rendering the screenshot.
             Uses the number of aa frames set by
             figure.scene.anti_aliasing_frames
+        :out: a numpy array or None, optional
+            A preallocated array the pixels are read into, of shape
+            (height, width, 3) or (height, width, 4) and of type uint8,
+            or of shape (height, width, 4) and of type float32.  The
+            mode is given by its shape.  The pixels are read directly
+            into this array and the returned array is a vertically
+            flipped view of it.
+        :depth: a numpy array or None, optional
+            A preallocated float32 array of shape (height, width) the
+            depth buffer is read into.  If given, a tuple of the image
+            and a flipped view of the depth buffer is returned.
 
         **Notes**
 
@@ -282,6 +328,11 @@ def screenshot(figure=None, mode='rgb', antialiased=False):
         will capture the other window. This limitation is due to the
         heavy use of the hardware graphics system.
 
+        The returned arrays are views of the buffers they are read
+        into, so grabbing many frames into the same `out` array does not
+        allocate any memory.  See `FrameGrabber` to overlap the
+        processing of a frame with the rendering of the next one.
+
         **Examples**
 
         This function can be useful for integrating 3D plotting with
@@ -295,27 +346,35 @@ def screenshot(figure=None, mode='rgb', antialiased=False):
         >>> pl.axis('off')
         >>> pl.show()
 
+        Reading many frames into the same buffer:
+
+        >>> x, y = mlab.gcf().scene.get_size()
+        >>> buf = np.empty((y, x, 4), np.uint8)
+        >>> arr = mlab.screenshot(out=buf)
+
     """
     if figure is None:
         figure = gcf()
     x, y = tuple(figure.scene.get_size())
 
+    if out is None:
+        if mode == 'rgb':
+            out = np.empty((y, x, 3), np.uint8)
+        elif mode == 'rgba':
+            out = np.empty((y, x, 4), np.float32)
+        else:
+            raise ValueError('mode type not understood')
+    elif out.dtype == np.float32:
+        _check_buffer(out, (y, x, 4), (np.float32,), 'out')
+    elif len(out.shape) == 3 and out.shape[-1] == 3:
+        _check_buffer(out, (y, x, 3), (np.uint8,), 'out')
+    else:
+        _check_buffer(out, (y, x, 4), (np.uint8,), 'out')
+    if depth is not None:
+        _check_buffer(depth, (y, x), (np.float32,), 'depth')
+
     # Try to lift the window
     figure.scene._lift()
-    if mode == 'rgb':
-        out = tvtk.UnsignedCharArray()
-        shape = (y, x, 3)
-        pixel_getter = figure.scene.render_window.get_pixel_data
-        pg_args = (0, 0, x - 1, y - 1, 1, out)
-
-    elif mode == 'rgba':
-        out = tvtk.FloatArray()
-        shape = (y, x, 4)
-        pixel_getter = figure.scene.render_window.get_rgba_pixel_data
-        pg_args = (0, 0, x - 1, y - 1, 1, out)
-
-    else:
-        raise ValueError('mode type not understood')
 
     if antialiased:
         # save the current aa value to restore it later
@@ -323,15 +382,135 @@ def screenshot(figure=None, mode='rgb', antialiased=False):
 
         figure.scene.render_window.aa_frames = figure.scene.anti_aliasing_frames
         figure.scene.render()
-        pixel_getter(*pg_args)
+        _read_pixels(figure, out, depth)
         figure.scene.render_window.aa_frames = old_aa
         figure.scene.render()
 
     else:
-        pixel_getter(*pg_args)
+        _read_pixels(figure, out, depth)
 
     # Return the array in a way that pylab.imshow plots it right:
-    out = out.to_array()
-    out.shape = shape
-    out = np.flipud(out)
-    return out
+    if depth is not None:
+        return out[::-1], depth[::-1]
+    return out[::-1]
+
+
+class FrameGrabber(object):
+    """ Grabs the frames of a figure into a ring of preallocated buffers
+        and hands them to a callback on a background thread.
+
+        With two buffers (double buffering), the callback processing or
+        saving frame N runs while frame N + 1 is rendered and read back
+        into the other buffer.  The frames given to the callback are
+        views of the buffers and are only valid until the callback
+        returns.
+
+        **Parameters**
+
+        :figure: a figure instance or None, optional
+            The figure to grab the frames of, the current figure by
+            default.
+        :mode: {'rgb', 'rgba'}
+            The color mode of the frames.
+        :dtype: {numpy.uint8, numpy.float32}
+            The type of the frames, float32 is only possible for 'rgba'.
+        :depth: {False, True}
+            Also grab the depth buffer.  The callback is then given a
+            tuple of the image and the depth buffer.
+        :n_buffers: integer
+            The number of buffers to use.
+        :callback: a callable or None
+            Called with each frame on a background thread.  If None,
+            `grab` simply returns the frames, which then stay valid
+            until `n_buffers` more frames have been grabbed.
+
+        **Example**
+
+        >>> frames = []
+        >>> grabber = FrameGrabber(callback=lambda f: frames.append(f.sum()))
+        >>> for i in range(100):
+        ...     mlab.view(azimuth=i)
+        ...     grabber.grab()
+        >>> grabber.close()
+    """
+
+    def __init__(self, figure=None, mode='rgb', dtype=np.uint8, depth=False,
+                 n_buffers=2, callback=None):
+        if figure is None:
+            figure = gcf()
+        self.figure = figure
+        self.callback = callback
+        x, y = tuple(figure.scene.get_size())
+        n = {'rgb': 3, 'rgba': 4}.get(mode)
+        dtype = np.dtype(dtype)
+        if n is None or dtype not in (np.uint8, np.float32) or \
+                (dtype == np.float32 and n == 3):
+            raise ValueError('mode and dtype not understood')
+        self._buffers = [np.empty((y, x, n), dtype)
+                         for i in range(max(n_buffers, 1))]
+        self._depths = [None] * len(self._buffers)
+        if depth:
+            self._depths = [np.empty((y, x), np.float32)
+                            for b in self._buffers]
+        # Set when a buffer may be written into.
+        self._free = [threading.Event() for b in self._buffers]
+        for event in self._free:
+            event.set()
+        self._index = 0
+        self._errors = []
+        self._queue = None
+        if callback is not None:
+            self._queue = Queue.Queue()
+            self._thread = threading.Thread(target=self._run)
+            self._thread.daemon = True
+            self._thread.start()
+
+    def grab(self):
+        """ Read the current frame into the next buffer and return it.
+        """
+        i = self._index
+        self._index = (i + 1) % len(self._buffers)
+        # Wait for the callback to be done with the buffer.
+        self._free[i].wait()
+        self._raise_errors()
+        out, depth = self._buffers[i], self._depths[i]
+        frame = screenshot(self.figure, out=out, depth=depth)
+        if self._queue is not None:
+            self._free[i].clear()
+            self._queue.put((i, frame))
+        return frame
+
+    def flush(self):
+        """ Wait for the callback to process all the grabbed frames.
+        """
+        for event in self._free:
+            event.wait()
+        self._raise_errors()
+
+    def close(self):
+        """ Process the remaining frames and stop the background thread.
+        """
+        if self._queue is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._queue = None
+        self._raise_errors()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            i, frame = item
+            try:
+                self.callback(frame)
+            except Exception as e:
+                self._errors.append(e)
+            finally:
+                self._free[i].set()
+
+    def _raise_errors(self):
+        if self._errors:
+            error = self._errors.pop(0)
+            del self._errors[:]
+            raise error
@@ -18,7 +18,8 @@ from modules import VectorsFactory, StreamlineFactory, GlyphFactory, \
             ImageActorFactory, glyph_mode_dict
 from sources import vector_scatter, vector_field, scalar_scatter, \
             scalar_field, line_source, array2d_source, grid_source, \
-            triangular_mesh_source, vertical_vectors_source
+            triangular_mesh_source, vertical_vectors_source, \
+            regular_surface_source
 from filters import ExtractVectorNormFactory, WarpScalarFactory, \
             TubeFactory, ExtractEdgesFactory, PolyDataNormalsFactory, \
             StripperFactory
@@ -27,7 +28,7 @@ from mayavi.core.scene import Scene
 from auto_doc import traits_doc, dedent
 import tools
 from traits.api import Array, Callable, CFloat, HasTraits, \
-    List, Trait, Any, Instance, TraitError, true
+    List, Trait, Any, Instance, TraitError, true, false, Either, Bool
 import numpy
 
 
@@ -64,6 +65,11 @@ class Pipeline(HasTraits):
     figure = Instance('mayavi.core.scene.Scene',
                 help='Figure to populate.')
 
+    validate = Either(None, Bool,
+                help='whether to check the input arrays for '
+                     'infinite values. If not given, the validate_inputs '
+                     'mlab option is used.')
+
     def __call__(self, *args, **kwargs):
         """ Calls the logics of the factory, but only after disabling
             rendering, if needed.
@@ -629,12 +635,26 @@ class Surf(Pipeline):
 
     If 3 positional arguments are passed the last one must be an array s,
     or a callable, f, that returns an array. x and y give the
-    coordinates of positions corresponding to the s values."""
+    coordinates of positions corresponding to the s values.
+
+    With `analytic_normals=True` the warped surface and its normals are
+    computed directly on the grid, which is much faster for large or
+    animated surfaces. Parts of such a surface can be updated with the
+    `update_region` method of its `mlab_source`::
+
+        s = surf(z, analytic_normals=True)
+        z[10:20, :5] += 1
+        s.mlab_source.update_region(slice(10, 20), slice(0, 5))"""
 
     _source_function = Callable(array2d_source)
 
     _pipeline = [WarpScalarFactory, PolyDataNormalsFactory, SurfaceFactory]
 
+    # The source function and pipeline used with analytic normals.
+    _regular_source_function = Callable(regular_surface_source)
+
+    _regular_pipeline = [SurfaceFactory]
+
     warp_scale = Any(1, help="""scale of the z axis (warped from
                         the value of the scalar). By default this scale
                         is a float value.
@@ -661,10 +681,29 @@ class Surf(Pipeline):
                  not work if you specify a solid color using the
                  `color` keyword.""")
 
+    analytic_normals = false(help="""compute the warped points and
+                        the normals of the surface directly on the
+                        regular grid, with finite differences, instead
+                        of warping the data and computing the normals
+                        with VTK filters. This is much faster for large
+                        or animated surfaces. Not compatible with
+                        `mask`.""")
+
     def __call_internal__(self, *args, **kwargs):
         """ Override the call to be able to scale automatically the axis.
         """
-        self.source = self._source_function(*args, **kwargs)
+        regular = kwargs.get('analytic_normals', False)
+        if regular:
+            if 'mask' in kwargs:
+                raise ValueError('The mask keyword argument can not be '
+                                 'used with analytic normals.')
+            # The warp scale is set once it is known.
+            source_kwargs = kwargs.copy()
+            source_kwargs.pop('warp_scale', None)
+            self.source = self._regular_source_function(*args,
+                                                        **source_kwargs)
+        else:
+            self.source = self._source_function(*args, **kwargs)
         kwargs.pop('name', None)
         # Deal with both explicit warp scale and extent, this is
         # slightly hairy. The wigner example is a good test case for
@@ -719,7 +758,11 @@ class Surf(Pipeline):
         self.store_kwargs(kwargs)
 
         # Copy the pipeline so as not to modify it for the next call
-        self.pipeline = self._pipeline[:]
+        if regular:
+            self.source.mlab_source.warp_scale = self.kwargs['warp_scale']
+            self.pipeline = self._regular_pipeline[:]
+        else:
+            self.pipeline = self._pipeline[:]
         return self.build_pipeline()
 
 
@@ -0,0 +1,274 @@
+"""
+Rendering of parameter sweeps on a pool of offscreen worker processes.
+
+Each worker process runs its own `OffScreenEngine`.  The items are
+rendered in parallel and the images or file names are returned in
+the order of the parameters.  Workers that die or hang are restarted
+and their item is rendered again.
+"""
+# Copyright (c) 2013, Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+import collections
+import itertools
+import logging
+import time
+import traceback
+from functools import partial
+from multiprocessing import cpu_count, Process, Pipe
+
+# Setup a logger for this module.
+logger = logging.getLogger(__name__)
+
+
+######################################################################
+# Process management.
+######################################################################
+class _Worker(object):
+    """A worker process, the connection to it and the task it is
+    running.  Each worker has its own pipe so a worker dying while
+    sending a result cannot block the others."""
+
+    def __init__(self, setup, run):
+        self.conn, child_conn = Pipe()
+        self.task = None
+        self.started = 0.0
+        self.process = Process(target=_worker_loop,
+                               args=(child_conn, setup, run))
+        self.process.daemon = True
+        self.process.start()
+        child_conn.close()
+
+    def submit(self, task):
+        self.task = task
+        self.started = time.time()
+        try:
+            self.conn.send((task[0], task[1]))
+        except (EOFError, IOError):
+            # The worker died, its task is requeued when this is noticed.
+            pass
+
+    def receive(self):
+        """Returns the (index, ok, value) message sent by the worker or
+        None if there is none."""
+        try:
+            if self.conn.poll():
+                return self.conn.recv()
+        except (EOFError, IOError):
+            pass
+        return None
+
+    def stop(self, wait=1.0):
+        try:
+            self.conn.send(None)
+        except (EOFError, IOError):
+            pass
+        self.process.join(wait)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self.conn.close()
+
+
+def _worker_loop(conn, setup, run):
+    """The main loop of a worker process.  `setup` is called once and
+    `run(param, index)` for each task until a `None` task is
+    received."""
+    try:
+        if setup is not None:
+            setup()
+    except Exception:
+        conn.send((None, False, traceback.format_exc()))
+        return
+    while True:
+        task = conn.recv()
+        if task is None:
+            break
+        index, param = task
+        try:
+            value = run(param, index)
+        except Exception:
+            conn.send((index, False, traceback.format_exc()))
+        else:
+            conn.send((index, True, value))
+
+
+def process_map(run, params, setup=None, n_workers=0, max_retries=2,
+                timeout=None, poll_interval=0.01):
+    """A generator returning `run(param, index)` for each of the
+    `params` computed on a pool of worker processes, in the order of
+    the parameters.
+
+    `setup` is called once in each worker process when it is started.
+    A worker that dies, or takes more than `timeout` seconds on a
+    task, is restarted and its task is run again, at most
+    `max_retries` times.  An exception raised by `run` or `setup` is
+    raised as a `RuntimeError` with the traceback of the worker.
+
+    The parameters are read lazily and at most twice as many tasks as
+    there are workers are run ahead of the results returned.
+    """
+    if n_workers <= 0:
+        n_workers = cpu_count()
+    params = enumerate(params)
+    workers = {}
+    ids = itertools.count()
+    pending = collections.deque()
+    done = {}
+    n_submitted = 0
+    next_index = 0
+    exhausted = False
+
+    def start_worker():
+        workers[next(ids)] = _Worker(setup, run)
+
+    try:
+        for i in range(n_workers):
+            start_worker()
+
+        while True:
+            while next_index in done:
+                yield done.pop(next_index)
+                next_index += 1
+
+            while not exhausted and n_submitted - next_index < 2*n_workers:
+                try:
+                    index, param = next(params)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending.append([index, param, 0])
+                n_submitted += 1
+            if exhausted and next_index == n_submitted:
+                break
+
+            for worker in workers.values():
+                if worker.task is None and pending:
+                    worker.submit(pending.popleft())
+
+            received = False
+            for worker in workers.values():
+                msg = worker.receive()
+                if msg is None:
+                    continue
+                received = True
+                index, ok, value = msg
+                if not ok:
+                    if index is None:
+                        msg = 'Worker setup failed:\n%s'%value
+                    else:
+                        msg = 'Item %d failed:\n%s'%(index, value)
+                    raise RuntimeError(msg)
+                worker.task = None
+                if index >= next_index and index not in done:
+                    done[index] = value
+            if received:
+                continue
+
+            now = time.time()
+            for worker_id, worker in workers.items():
+                expired = timeout is not None and worker.task is not None \
+                          and now - worker.started > timeout
+                if worker.process.is_alive() and not expired:
+                    continue
+                if expired:
+                    worker.process.terminate()
+                worker.process.join()
+                del workers[worker_id]
+                task = worker.task
+                if task is not None:
+                    task[2] += 1
+                    if task[2] > max_retries:
+                        raise RuntimeError('Item %d failed after %d '
+                                           'retries.'%(task[0], max_retries))
+                    logger.warning('Worker failed on item %d, restarting',
+                                   task[0])
+                    pending.appendleft(task)
+                start_worker()
+            time.sleep(poll_interval)
+    finally:
+        for worker in workers.values():
+            worker.stop()
+
+
+######################################################################
+# Offscreen rendering.
+######################################################################
+def _setup_offscreen():
+    """Sets up an offscreen mlab engine in a worker process."""
+    from mayavi.core.off_screen_engine import OffScreenEngine, ScenePool
+    from mayavi.tools.engine_manager import options, set_engine
+    options.offscreen = True
+    engine = OffScreenEngine(name='Mlab render farm Engine',
+                             scene_pool=ScenePool(max_size=1))
+    engine.start()
+    set_engine(engine)
+
+
+def _render_item(func, size, file_pattern, mode, param, index):
+    """Renders one item in a worker process and returns the image or
+    the name of the file saved."""
+    from mayavi.tools.figure import figure, close, savefig, screenshot
+    fig = figure(size=size)
+    try:
+        func(param)
+        if file_pattern is not None:
+            file_name = file_pattern%index
+            savefig(file_name, figure=fig)
+            return file_name
+        return screenshot(figure=fig, mode=mode)
+    finally:
+        close(fig)
+
+
+def render_farm(func, params, size=(400, 350), file_pattern=None,
+                mode='rgb', n_workers=0, max_retries=2, timeout=None):
+    """ Renders a parameter sweep on a pool of offscreen worker
+    processes and returns a generator of the images, or of the file
+    names saved, in the order of the parameters.
+
+    For each parameter a new figure is created in a worker and
+    `func(param)` is called to build the scene with mlab.
+
+    **Keyword arguments**
+
+        :func: A picklable function (defined at the top level of a
+               module) building the scene for a parameter.
+
+        :params: An iterable of the parameters, read lazily.
+
+        :size: The size of the figures, in pixels.
+
+        :file_pattern: If given, the figures are saved with
+                       `savefig` to `file_pattern % index` and the
+                       file names are returned instead of the images.
+
+        :mode: 'rgb' or 'rgba', the mode of the images returned.
+
+        :n_workers: The number of worker processes, the number of CPUs
+                    is used if 0.
+
+        :max_retries: The number of times an item is retried if its
+                      worker dies.
+
+        :timeout: The time, in seconds, after which a worker rendering
+                  an item is considered hung and is restarted.
+
+    **Example**
+
+    ::
+
+        def build(phase):
+            x = np.linspace(0, 4*np.pi, 100)
+            mlab.plot3d(x, np.sin(x + phase), np.cos(x + phase))
+
+        for image in mlab.render_farm(build, np.linspace(0, np.pi, 50)):
+            ...
+
+    Errors raised by `func` are raised as a `RuntimeError`.
+    """
+    run = partial(_render_item, func, tuple(size), file_pattern, mode)
+    return process_map(run, params, setup=_setup_offscreen,
+                       n_workers=n_workers, max_retries=max_retries,
+                       timeout=timeout)
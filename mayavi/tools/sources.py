@@ -8,23 +8,26 @@ Data sources classes and their associated functions for mlab.
 # License: BSD Style.
 
 import operator
+import weakref
 
 import numpy as np
 
 from traits.api import (HasTraits, Instance, CArray, Either,
-            Bool, on_trait_change, NO_COMPARE)
+            Any, Bool, Float, on_trait_change, NO_COMPARE, Property)
 from tvtk.api import tvtk
+from tvtk.array_handler import ids2vtkCellArray, ID_TYPE_CODE
 from tvtk.common import camel2enthought
 
 from mayavi.sources.array_source import ArraySource
 from mayavi.core.registry import registry
 
 import tools
-from engine_manager import get_null_engine, engine_manager
+from engine_manager import get_null_engine, engine_manager, options
 
 __all__ = ['vector_scatter', 'vector_field', 'scalar_scatter',
     'scalar_field', 'line_source', 'array2d_source', 'grid_source',
     'open', 'triangular_mesh_source', 'vertical_vectors_source',
+    'regular_surface_source',
 ]
 
 
@@ -39,6 +42,77 @@ class CArrayOrNumber(CArray):
         return CArray.validate(self, object, name, value)
 
 
+###############################################################################
+# `RegularGrid` class.
+###############################################################################
+class RegularGrid(object):
+    """
+    A lazy description of a regular grid by its shape, origin and
+    spacing.  The coordinate arrays are only created when they are
+    asked for.
+    """
+
+    def __init__(self, shape, origin=(0., 0., 0.), spacing=(1., 1., 1.)):
+        self.shape = tuple(int(n) for n in shape)
+        self.origin = tuple(float(o) for o in origin)
+        self.spacing = tuple(float(d) for d in spacing)
+
+    @classmethod
+    def from_arrays(cls, x, y, z):
+        """ Returns the grid of the x, y, z arrays, generated by
+        `numpy.mgrid` or `numpy.ogrid`.
+        """
+        return cls((1, 1, 1)).replace_axes(x, y, z)
+
+    def replace_axes(self, x=None, y=None, z=None):
+        """ Returns a new grid whose axes are those of the given x, y, z
+        coordinate arrays, and those of this grid for the arrays that
+        are None.
+        """
+        shape = list(self.shape)
+        origin = list(self.origin)
+        spacing = list(self.spacing)
+        for index, a in enumerate((x, y, z)):
+            if a is None:
+                continue
+            a = np.atleast_3d(a)
+            shape[index] = n = a.shape[index]
+            origin[index] = a.min()
+            spacing[index] = 1
+            if n > 1:
+                second = [0, 0, 0]
+                second[index] = 1
+                spacing[index] = a[tuple(second)] - a[0, 0, 0]
+        return RegularGrid(shape, origin, spacing)
+
+    def axis(self, index):
+        """ Returns the 1D coordinates along the given axis. """
+        return self.origin[index] + \
+                    self.spacing[index]*np.arange(self.shape[index])
+
+    def coordinates(self, index):
+        """ Returns the full coordinate array for the given axis,
+        as `numpy.mgrid` would.
+        """
+        shape = [1, 1, 1]
+        shape[index] = self.shape[index]
+        out = np.empty(self.shape)
+        out[...] = self.axis(index).reshape(shape)
+        return out
+
+    def broadcast_arrays(self):
+        """ Returns the x, y, z coordinates as read-only views of the
+        shape of the grid that do not use more memory than their axes.
+        """
+        x = self.axis(0)[:, np.newaxis, np.newaxis]
+        y = self.axis(1)[np.newaxis, :, np.newaxis]
+        z = self.axis(2)[np.newaxis, np.newaxis, :]
+        arrays = np.broadcast_arrays(x, y, z)
+        for a in arrays:
+            a.flags.writeable = False
+        return arrays
+
+
 ###############################################################################
 # `MlabSource` class.
 ###############################################################################
@@ -131,6 +205,82 @@ ArrayOrNone = Either(None, CArray, comparison_mode=NO_COMPARE)
 ArrayNumberOrNone = Either(None, CArrayOrNumber, comparison_mode=NO_COMPARE)
 
 
+###############################################################################
+# Utility functions for sources storing coordinates in a single (N, 3) array.
+###############################################################################
+def _column(buf, index, shape=None):
+    """Returns the column `index` of the (N, 3) array `buf` as a view,
+    reshaped to `shape` if given."""
+    col = buf[:, index]
+    if shape is not None:
+        col = col.reshape(shape)
+    return col
+
+
+def _is_column(arr, buf, index):
+    """Returns True if `arr` is a view, of any shape, of the column
+    `index` of the (N, 3) array `buf`."""
+    if buf is None or not isinstance(arr, np.ndarray) or \
+            arr.size != len(buf) or arr.size == 0 or arr.dtype != buf.dtype:
+        return False
+    col = buf[:, index]
+    if arr.__array_interface__['data'][0] != \
+            col.__array_interface__['data'][0]:
+        return False
+    stride = col.strides[0]
+    for n, st in reversed(zip(arr.shape, arr.strides)):
+        if n > 1 and st != stride:
+            return False
+        stride *= n
+    return True
+
+
+def _pack_columns(arrays, buf=None):
+    """Returns an (N, 3) array holding the three given arrays as its
+    columns, and views of its columns with the shapes of the arrays.
+    `buf` is returned unchanged if the arrays are already its columns,
+    otherwise a new array is created.  Arrays smaller than the others
+    are broadcast and returned as they are.
+    """
+    arrays = [np.atleast_1d(a) for a in arrays]
+    if all(_is_column(a, buf, i) for i, a in enumerate(arrays)):
+        return buf, arrays
+    n = max(a.size for a in arrays)
+    buf = np.empty((n, 3))
+    views = []
+    for i, a in enumerate(arrays):
+        buf[:, i] = a.ravel()
+        if a.size == n:
+            a = _column(buf, i, a.shape)
+        views.append(a)
+    return buf, views
+
+
+# The connectivity of vertex cells, (1, i) for each point i, shared by
+# the point clouds and grown as needed.
+_vertex_ids = np.empty(0, ID_TYPE_CODE)
+
+
+def vertex_cells(n):
+    """Returns a `tvtk.CellArray` with a vertex cell for each of the `n`
+    first points.  The connectivity is a view of a shared array, so no
+    per-point conversion is done.
+
+    The cell arrays of all the point clouds use the same memory, they
+    must not be changed in place (with `replace_cell` or `reverse_cell`
+    for example) or all the point clouds are changed.  Set a new cell
+    array on the dataset instead.
+    """
+    global _vertex_ids
+    if 2*n > len(_vertex_ids):
+        size = max(2*n, 2*len(_vertex_ids))
+        ids = np.empty(size, ID_TYPE_CODE)
+        ids[::2] = 1
+        ids[1::2] = np.arange(size//2)
+        _vertex_ids = ids
+    return tvtk.to_tvtk(ids2vtkCellArray(_vertex_ids[:2*n], n))
+
+
 ###############################################################################
 # `MGlyphSource` class.
 ###############################################################################
@@ -155,6 +305,13 @@ class MGlyphSource(MlabSource):
     w = ArrayNumberOrNone
     vectors = ArrayOrNone
 
+    # Whether each point is also a vertex cell of the dataset.  Glyphs
+    # only need the points, modules drawing the cells of the dataset
+    # need the cells.  They are created when this is turned on, which
+    # is done when a filter or a module other than glyphs is added to
+    # the Mayavi data source.
+    vertex_cells = Bool(True)
+
     ######################################################################
     # `MlabSource` interface.
     ######################################################################
@@ -172,45 +329,24 @@ class MGlyphSource(MlabSource):
         vectors = self.vectors
         scalars = self.scalars
         points = self.points
-        x, y, z = self.x, self.y, self.z
-        x = np.atleast_1d(x)
-        y = np.atleast_1d(y)
-        z = np.atleast_1d(z)
 
+        # The points and vectors are single (N, 3) arrays shared with
+        # VTK, x, y, z and u, v, w are views of their columns.
         if 'points' in traits:
-            x = points[:, 0].ravel()
-            y = points[:, 1].ravel()
-            z = points[:, 2].ravel()
-            self.set(x=x, y=y, z=z, trait_change_notify=False)
-
+            x, y, z = [_column(points, i) for i in range(3)]
         else:
-            points = np.c_[x.ravel(), y.ravel(), z.ravel()].ravel()
-            points.shape = (points.size / 3, 3)
-            self.set(points=points, trait_change_notify=False)
+            points, (x, y, z) = _pack_columns((self.x, self.y, self.z),
+                                              points)
+        self.set(points=points, x=x, y=y, z=z, trait_change_notify=False)
 
         u, v, w = self.u, self.v, self.w
-        if u is not None:
-            u = np.atleast_1d(u)
-            v = np.atleast_1d(v)
-            w = np.atleast_1d(w)
-            if len(u) > 0:
-                vectors = np.c_[u.ravel(), v.ravel(),
-                                w.ravel()].ravel()
-                vectors.shape = (vectors.size / 3, 3)
-                self.set(vectors=vectors, trait_change_notify=False)
-
         if 'vectors' in traits:
-            u = vectors[:, 0].ravel()
-            v = vectors[:, 1].ravel()
-            w = vectors[:, 2].ravel()
+            u, v, w = [_column(vectors, i) for i in range(3)]
             self.set(u=u, v=v, w=w, trait_change_notify=False)
-
-        else:
-            if u is not None and len(u) > 0:
-                vectors = np.c_[u.ravel(), v.ravel(),
-                                w.ravel()].ravel()
-                vectors.shape = (vectors.size / 3, 3)
-                self.set(vectors=vectors, trait_change_notify=False)
+        elif u is not None and len(np.atleast_1d(u)) > 0:
+            vectors, (u, v, w) = _pack_columns((u, v, w), vectors)
+            self.set(vectors=vectors, u=u, v=v, w=w,
+                     trait_change_notify=False)
 
         if vectors is not None and len(vectors) > 0:
             assert len(points) == len(vectors)
@@ -220,15 +356,13 @@ class MGlyphSource(MlabSource):
                 assert len(points) == len(scalars.ravel())
 
         # Create the dataset.
-        polys = np.arange(0, len(points), 1, 'l')
-        polys = np.reshape(polys, (len(points), 1))
         if self.dataset is None:
             # Create new dataset if none exists
             pd = tvtk.PolyData()
         else:
             # Modify existing one.
             pd = self.dataset
-        pd.set(points=points, polys=polys)
+        pd.set(points=points, polys=self._get_polys(len(points)))
 
         if self.vectors is not None:
             pd.point_data.vectors = self.vectors
@@ -242,41 +376,101 @@ class MGlyphSource(MlabSource):
     ######################################################################
     # Non-public interface.
     ######################################################################
-    def _x_changed(self, x):
-        x = np.atleast_1d(x)
-        self.points[:, 0] = x.ravel()
+    def _get_polys(self, n):
+        if self.vertex_cells:
+            return vertex_cells(n)
+        return tvtk.CellArray()
+
+    def _vertex_cells_changed(self):
+        if self.dataset is not None and self.points is not None:
+            self.dataset.polys = self._get_polys(len(self.points))
+            self.update()
+
+    def _m_data_changed(self, old, new):
+        super(MGlyphSource, self)._m_data_changed(new)
+        if old is not None:
+            old.on_trait_change(self._update_vertex_cells,
+                                'children.children', remove=True)
+        if new is not None:
+            new.on_trait_change(self._update_vertex_cells,
+                                'children.children')
+            self._update_vertex_cells()
+
+    def _update_vertex_cells(self):
+        """Turns the vertex cells on if the Mayavi data source has a
+        filter or a module using them."""
+        if self.vertex_cells or self.m_data is None:
+            return
+        from mayavi.core.module_manager import ModuleManager
+        from mayavi.modules.glyph import Glyph
+        for child in self.m_data.children:
+            if not isinstance(child, ModuleManager) or \
+                    [m for m in child.children
+                     if not isinstance(m, Glyph)]:
+                self.vertex_cells = True
+                return
+
+    def _set_column(self, buf_name, name, index, value):
+        """Copies `value` in the column `index` of the array `buf_name`,
+        unless it is already a view of it, and makes the trait `name`
+        a view of the column."""
+        buf = getattr(self, buf_name)
+        value = np.atleast_1d(value)
+        if not _is_column(value, buf, index):
+            buf[:, index] = value.ravel()
+            if value.size == len(buf):
+                self.trait_setq(**{name: _column(buf, index, value.shape)})
         self.update()
 
+    def _set_columns(self, names, buf):
+        """Makes the traits `names` views of the columns of `buf`."""
+        values = {}
+        for index, name in enumerate(names):
+            old = getattr(self, name)
+            shape = None
+            if old is not None and np.size(old) == len(buf):
+                shape = np.shape(old)
+            values[name] = _column(buf, index, shape)
+        self.trait_setq(**values)
+
+    def _x_changed(self, x):
+        self._set_column('points', 'x', 0, x)
+
     def _y_changed(self, y):
-        y = np.atleast_1d(y)
-        self.points[:, 1] = y.ravel()
-        self.update()
+        self._set_column('points', 'y', 1, y)
 
     def _z_changed(self, z):
-        z = np.atleast_1d(z)
-        self.points[:, 2] = z.ravel()
-        self.update()
+        self._set_column('points', 'z', 2, z)
 
     def _u_changed(self, u):
-        u = np.atleast_1d(u)
-        self.vectors[:, 0] = u.ravel()
-        self.update()
+        self._set_column('vectors', 'u', 0, u)
 
     def _v_changed(self, v):
-        v = np.atleast_1d(v)
-        self.vectors[:, 1] = v.ravel()
-        self.update()
+        self._set_column('vectors', 'v', 1, v)
 
     def _w_changed(self, w):
-        w = np.atleast_1d(w)
-        self.vectors[:, 2] = w.ravel()
-        self.update()
+        self._set_column('vectors', 'w', 2, w)
 
     def _points_changed(self, p):
         p = np.atleast_2d(p)
+        self.trait_setq(points=p)
+        self._set_columns(('x', 'y', 'z'), p)
         self.dataset.points = p
         self.update()
 
+    def _vectors_changed(self, v):
+        if v is None:
+            self.dataset.point_data.vectors = None
+            self.dataset.point_data.remove_array('vectors')
+            self.update()
+            return
+        v = np.atleast_2d(v)
+        self.trait_setq(vectors=v)
+        self._set_columns(('u', 'v', 'w'), v)
+        self.dataset.point_data.vectors = v
+        self.dataset.point_data.vectors.name = 'vectors'
+        self.update()
+
     def _scalars_changed(self, s):
         if s is None:
             self.dataset.point_data.scalars = None
@@ -287,11 +481,6 @@ class MGlyphSource(MlabSource):
             self.dataset.point_data.scalars.name = 'scalars'
         self.update()
 
-    def _vectors_changed(self, v):
-        self.dataset.point_data.vectors = v
-        self.dataset.point_data.vectors.name = 'vectors'
-        self.update()
-
 
 ###############################################################################
 # `MVerticalGlyphSource` class.
@@ -331,10 +520,15 @@ class MArraySource(MlabSource):
     allows the user to set the x, y, z, scalar/vector attributes.
     """
 
-    # The x, y, z arrays for the volume.
-    x = ArrayOrNone
-    y = ArrayOrNone
-    z = ArrayOrNone
+    # The x, y, z arrays for the volume.  If they are not given they
+    # are created from the `grid` the first time they are read.
+    x = Property
+    y = Property
+    z = Property
+
+    # The regular grid of the volume.  It is used instead of the x, y,
+    # z arrays when these are not given.
+    grid = Instance(RegularGrid)
 
     # The scalars shown on the glyphs.
     scalars = ArrayOrNone
@@ -345,6 +539,13 @@ class MArraySource(MlabSource):
     w = ArrayOrNone
     vectors = ArrayOrNone
 
+    ########################################
+    # Private traits.
+
+    _x = ArrayOrNone
+    _y = ArrayOrNone
+    _z = ArrayOrNone
+
     ######################################################################
     # `MlabSource` interface.
     ######################################################################
@@ -357,7 +558,6 @@ class MArraySource(MlabSource):
 
         vectors = self.vectors
         scalars = self.scalars
-        x, y, z = [np.atleast_3d(a) for a in self.x, self.y, self.z]
 
         u, v, w = self.u, self.v, self.w
         if 'vectors' in traits:
@@ -380,18 +580,25 @@ class MArraySource(MlabSource):
         if vectors is not None and len(vectors) > 0 and scalars is not None:
             assert len(scalars) == len(vectors)
 
-        if x.shape[0] <= 1:
-            dx = 1
-        else:
-            dx = x[1, 0, 0] - x[0, 0, 0]
-        if y.shape[1] <= 1:
-            dy = 1
-        else:
-            dy = y[0, 1, 0] - y[0, 0, 0]
-        if z.shape[2] <= 1:
-            dz = 1
+        x, y, z = self._x, self._y, self._z
+        if x is not None and y is not None and z is not None:
+            grid = RegularGrid.from_arrays(x, y, z)
         else:
-            dz = z[0, 0, 1] - z[0, 0, 0]
+            # The coordinates are not given, use the grid, or the
+            # indices of the data.
+            if scalars is not None:
+                shape = np.atleast_3d(scalars).shape
+            else:
+                shape = vectors.shape[:3]
+            grid = self.grid
+            if grid is None:
+                grid = RegularGrid(shape)
+            elif grid.shape != shape:
+                grid = RegularGrid(shape, grid.origin, grid.spacing)
+                # The coordinates read before are those of the old shape.
+                self.set(_x=None, _y=None, _z=None,
+                         trait_change_notify=False)
+            self.set(grid=grid, trait_change_notify=False)
 
         if self.m_data is None:
             ds = ArraySource(transpose_input_array=True)
@@ -399,8 +606,8 @@ class MArraySource(MlabSource):
             ds = self.m_data
         old_scalar = ds.scalar_data
         ds.set(vector_data=vectors,
-               origin=[x.min(), y.min(), z.min()],
-               spacing=[dx, dy, dz],
+               origin=grid.origin,
+               spacing=grid.spacing,
                scalar_data=scalars)
         if scalars is old_scalar:
             ds._scalar_data_changed(scalars)
@@ -411,19 +618,62 @@ class MArraySource(MlabSource):
     ######################################################################
     # Non-public interface.
     ######################################################################
-    @on_trait_change('[x, y, z]')
-    def _xyz_changed(self):
-        x, y, z = self.x, self.y, self.z
-        dx = x[1, 0, 0] - x[0, 0, 0]
-        dy = y[0, 1, 0] - y[0, 0, 0]
-        dz = z[0, 0, 1] - z[0, 0, 0]
+    def _get_coordinate(self, name, index):
+        value = getattr(self, name)
+        if value is None and self.grid is not None:
+            value = self.grid.coordinates(index)
+            self.set(trait_change_notify=False, **{name: value})
+        return value
+
+    def _set_coordinate(self, name, value):
+        old = getattr(self, '_' + name)
+        setattr(self, '_' + name, value)
+        self.trait_property_changed(name, old, value)
+
+    def _get_x(self):
+        return self._get_coordinate('_x', 0)
+
+    def _set_x(self, value):
+        self._set_coordinate('x', value)
+
+    def _get_y(self):
+        return self._get_coordinate('_y', 1)
+
+    def _set_y(self, value):
+        self._set_coordinate('y', value)
+
+    def _get_z(self):
+        return self._get_coordinate('_z', 2)
+
+    def _set_z(self, value):
+        self._set_coordinate('z', value)
+
+    def _set_grid_data(self, grid):
         ds = self.dataset
-        ds.origin = [x.min(), y.min(), z.min()]
-        ds.spacing = [dx, dy, dz]
+        ds.origin = grid.origin
+        ds.spacing = grid.spacing
         if self.m_data is not None:
             self.m_data.set(origin=ds.origin, spacing=ds.spacing)
         self.update()
 
+    @on_trait_change('[x, y, z]')
+    def _xyz_changed(self):
+        grid = self.grid
+        if grid is None:
+            grid = RegularGrid.from_arrays(self.x, self.y, self.z)
+        else:
+            # The axes not set are those of the grid, their coordinate
+            # arrays are not created.
+            grid = grid.replace_axes(self._x, self._y, self._z)
+            self.set(grid=grid, trait_change_notify=False)
+        self._set_grid_data(grid)
+
+    def _grid_changed(self, grid):
+        # The coordinates are those of the new grid.
+        self.set(_x=None, _y=None, _z=None, trait_change_notify=False)
+        if self.dataset is not None:
+            self._set_grid_data(grid)
+
     def _u_changed(self, u):
         self.vectors[..., 0] = u
         self.m_data._vector_data_changed(self.vectors)
@@ -737,21 +987,31 @@ class MGridSource(MlabSource):
     # Non-public interface.
     ######################################################################
     def _x_changed(self, x):
-        self.trait_setq(x=x)
-        self.points[:, 0] = x.ravel()
-        self.update()
+        self._set_column(0, 'x', x)
 
     def _y_changed(self, y):
-        self.trait_setq(y=y)
-        self.points[:, 1] = y.ravel()
-        self.update()
+        self._set_column(1, 'y', y)
 
     def _z_changed(self, z):
-        self.trait_setq(z=z)
-        self.points[:, 2] = z.ravel()
+        self._set_column(2, 'z', z)
+
+    def _set_column(self, index, name, value):
+        """Copies `value` in the column `index` of the points, unless it
+        is already a view of it."""
+        points = self.points
+        if not _is_column(value, points, index):
+            points[:, index] = value.ravel()
+            if value.size == len(points):
+                self.trait_setq(**{name: _column(points, index,
+                                                 value.shape)})
         self.update()
 
     def _points_changed(self, p):
+        shape = self.x.shape
+        if self.x.size != len(p):
+            shape = None
+        self.trait_setq(x=_column(p, 0, shape), y=_column(p, 1, shape),
+                        z=_column(p, 2, shape))
         self.dataset.points = p
         self.update()
 
@@ -787,6 +1047,10 @@ class MTriangularMeshSource(MlabSource):
     # The scalars shown on the glyphs.
     scalars = ArrayOrNone
 
+    # Whether the triangles are checked to be valid indices of the
+    # points, the `validate_inputs` mlab option is used if None.
+    validate = Either(None, Bool)
+
     ######################################################################
     # `MlabSource` interface.
     ######################################################################
@@ -800,18 +1064,13 @@ class MTriangularMeshSource(MlabSource):
         points = self.points
         scalars = self.scalars
 
-        x, y, z = self.x, self.y, self.z
-        points = np.c_[x.ravel(), y.ravel(), z.ravel()].ravel()
-        points.shape = (points.size / 3, 3)
-        self.set(points=points, trait_change_notify=False)
+        # The points are a single (N, 3) array shared with VTK, x, y, z
+        # are views of its columns.
+        points, (x, y, z) = _pack_columns((self.x, self.y, self.z), points)
+        self.set(points=points, x=x, y=y, z=z, trait_change_notify=False)
 
         triangles = self.triangles
-        assert triangles.shape[1] == 3, \
-            "The shape of the triangles array must be (X, 3)"
-        assert triangles.max() < len(points), \
-            "The triangles indices must be smaller that the number of points"
-        assert triangles.min() >= 0, \
-            "The triangles indices must be positive or null"
+        check_triangles(triangles, len(points), self.validate)
 
         if self.dataset is None:
             pd = tvtk.PolyData()
@@ -867,29 +1126,337 @@ class MTriangularMeshSource(MlabSource):
         self.update()
 
     def _triangles_changed(self, triangles):
-        if triangles.min() < 0:
-            raise ValueError('The triangles array has negative values')
-        if triangles.max() > self.x.size:
-            raise ValueError('The triangles array has values larger than' \
-                                        'the number of points')
+        check_triangles(triangles, len(self.points), self.validate)
         self.dataset.polys = triangles
         self.update()
 
 
+##############################################################################
+# `MRegularSurfaceSource` class.
+##############################################################################
+def _grid_axis(arr, n, axis):
+    """Returns the 1D coordinates along `axis` of a regular grid with `n`
+    points along that axis, from a 1D array or an array returned by
+    `numpy.ogrid` or `numpy.mgrid`.  The coordinates are centered on 0
+    if `arr` is None, as for `MArray2DSource`."""
+    if arr is None:
+        return np.arange(n) - n/2.
+    arr = np.asarray(arr, dtype=float)
+    if arr.ndim == 2 and arr.shape[axis] == n:
+        index = [0, 0]
+        index[axis] = slice(None)
+        arr = arr[tuple(index)]
+    arr = arr.ravel()
+    if len(arr) != n:
+        raise ValueError('The coordinates do not match the shape of the '
+                         'scalars.')
+    return arr
+
+
+def _derivative(z, coord, axis, start, stop):
+    """Returns the derivative of the 2D array `z` with respect to the 1D
+    coordinates `coord` along `axis`, for the indices `start` to `stop`
+    along that axis.  Central differences are used inside the grid and
+    one-sided differences on its borders."""
+    n = z.shape[axis]
+    if n == 1:
+        shape = list(z.shape)
+        shape[axis] = stop - start
+        return np.zeros(shape)
+    index = np.arange(start, stop)
+    low = np.maximum(index - 1, 0)
+    high = np.minimum(index + 1, n - 1)
+    step = coord[high] - coord[low]
+    if axis == 0:
+        step = step[:, np.newaxis]
+    return (z.take(high, axis) - z.take(low, axis))/step
+
+
+def _grid_quads(nx, ny):
+    """Returns the connectivity of the quads of a grid of `nx` by `ny`
+    points numbered with x varying fastest, as a flat array of cells
+    in the layout of a `vtkCellArray`."""
+    i = np.arange(nx - 1)
+    j = np.arange(ny - 1)
+    first = (j[:, np.newaxis]*nx + i).ravel()
+    cells = np.empty((len(first), 5), ID_TYPE_CODE)
+    cells[:, 0] = 4
+    cells[:, 1] = first
+    cells[:, 2] = first + 1
+    cells[:, 3] = first + nx + 1
+    cells[:, 4] = first + nx
+    return cells.ravel()
+
+
+class MRegularSurfaceSource(MlabSource):
+    """
+    This class represents a surface warped from regularly-spaced
+    elevation data, with its normals.  The warped points and the normals
+    are computed directly on the grid with finite differences into
+    buffers shared with VTK, instead of running the WarpScalar and
+    PolyDataNormals filters on the triangulated surface.
+
+    After changing a part of the scalars in place, `update_region`
+    updates only the corresponding points and normals.
+    """
+
+    # The coordinates of the grid, 1D arrays or arrays returned by
+    # `numpy.ogrid` or `numpy.mgrid`.  If None they are made from the
+    # indices of the scalars.
+    x = ArrayOrNone
+    y = ArrayOrNone
+
+    # The elevation, a 2D array indexed by x and y.
+    scalars = ArrayOrNone
+
+    # The scale of the elevation.
+    warp_scale = Float(1.0)
+
+    # The warped points and the normals, as (N, 3) arrays with x varying
+    # fastest, shared with the dataset.
+    points = ArrayOrNone
+    normals = ArrayOrNone
+
+    ########################################
+    # Private traits.
+
+    # The shape of the grid the buffers were allocated for.
+    _shape = Any
+
+    # The scalars, with x varying fastest, shared with the dataset.
+    _values = Any
+
+    # The connectivity of the quads, shared with the dataset.
+    _cells = Any
+
+    ######################################################################
+    # `MlabSource` interface.
+    ######################################################################
+    def reset(self, **traits):
+        """Creates the dataset afresh or resets existing data source."""
+
+        # First set the attributes without really doing anything since
+        # the notification handlers are not called.
+        self.set(trait_change_notify=False, **traits)
+        scalars = np.atleast_2d(self.scalars)
+        self.set(scalars=scalars, trait_change_notify=False)
+        nx, ny = scalars.shape
+
+        if self._shape != (nx, ny) or self._values.dtype != scalars.dtype:
+            self.set(points=np.empty((nx*ny, 3)),
+                     normals=np.empty((nx*ny, 3)),
+                     _values=np.empty(nx*ny, scalars.dtype),
+                     _cells=_grid_quads(nx, ny), _shape=(nx, ny),
+                     trait_change_notify=False)
+        points = self.points
+        self._set_axes()
+        self._update_block(0, nx, 0, ny)
+
+        if self.dataset is None:
+            pd = tvtk.PolyData()
+        else:
+            pd = self.dataset
+        polys = tvtk.to_tvtk(ids2vtkCellArray(self._cells,
+                                              (nx - 1)*(ny - 1)))
+        pd.set(points=points)
+        pd.set(polys=polys)
+        pd.point_data.normals = self.normals
+        pd.point_data.normals.name = 'normals'
+        pd.point_data.scalars = self._values
+        pd.point_data.scalars.name = 'scalars'
+        self.dataset = pd
+
+    def update_region(self, x_slice, y_slice, values=None):
+        """Updates the points and the normals of the part of the surface
+        given by the slices of the x and y indices of the scalars, after
+        the scalars have been changed there.  If `values` is given, it
+        is first assigned to that part of the scalars.
+        """
+        nx, ny = self.scalars.shape
+        i0, i1, step_x = x_slice.indices(nx)
+        j0, j1, step_y = y_slice.indices(ny)
+        if step_x != 1 or step_y != 1:
+            raise ValueError('The region slices must have a step of 1.')
+        if values is not None:
+            self.scalars[i0:i1, j0:j1] = values
+        if i1 > i0 and j1 > j0:
+            self._update_block(i0, i1, j0, j1)
+            self.update()
+
+    ######################################################################
+    # Non-public interface.
+    ######################################################################
+    def _set_axes(self):
+        nx, ny = self.scalars.shape
+        self._x_axis = _grid_axis(self.x, nx, 0)
+        self._y_axis = _grid_axis(self.y, ny, 1)
+        p = self.points.reshape(ny, nx, 3)
+        p[:, :, 0] = self._x_axis
+        p[:, :, 1] = self._y_axis[:, np.newaxis]
+
+    def _update_block(self, i0, i1, j0, j1):
+        """Updates the elevation of the points with x indices i0 to i1
+        and y indices j0 to j1, and the normals around them."""
+        nx, ny = self.scalars.shape
+        # Rows are along y and columns along x, as VTK numbers the
+        # points with x varying fastest.
+        s = self.scalars[i0:i1, j0:j1].T
+        self._values.reshape(ny, nx)[j0:j1, i0:i1] = s
+        z = self.points.reshape(ny, nx, 3)[:, :, 2]
+        z[j0:j1, i0:i1] = s
+        z[j0:j1, i0:i1] *= self.warp_scale
+
+        # The normals depend on the neighbouring points.
+        r0, r1 = max(j0 - 1, 0), min(j1 + 1, ny)
+        c0, c1 = max(i0 - 1, 0), min(i1 + 1, nx)
+        dx = _derivative(z[r0:r1], self._x_axis, 1, c0, c1)
+        dy = _derivative(z[:, c0:c1], self._y_axis, 0, r0, r1)
+        norm = np.sqrt(dx*dx + dy*dy + 1)
+        n = self.normals.reshape(ny, nx, 3)[r0:r1, c0:c1]
+        n[:, :, 0] = -dx/norm
+        n[:, :, 1] = -dy/norm
+        n[:, :, 2] = 1/norm
+
+    def _update_all(self):
+        nx, ny = self.scalars.shape
+        self._update_block(0, nx, 0, ny)
+        self.update()
+
+    @on_trait_change('[x, y]')
+    def _xy_changed(self):
+        self._set_axes()
+        self._update_all()
+
+    def _scalars_changed(self, s):
+        self.trait_setq(scalars=np.atleast_2d(s))
+        self._update_all()
+
+    def _warp_scale_changed(self):
+        self._update_all()
+
+
 ############################################################################
 # Argument processing
 ############################################################################
 
-def convert_to_arrays(args):
+# The number of elements of the input arrays checked at a time, the
+# checks never allocate temporaries larger than this.
+VALIDATION_CHUNK_SIZE = 2**16
+
+# The results of the checks of read-only arrays, keyed by the id of the
+# arrays: {id: (weak reference, {check name: result})}.
+_validation_cache = {}
+
+
+def validation_enabled(validate=None):
+    """ Returns whether the input arrays should be checked: `validate`
+        if it is given, the `validate_inputs` mlab option otherwise.
+    """
+    if validate is None:
+        return options.validate_inputs
+    return bool(validate)
+
+
+def _is_immutable(arr):
+    """ Returns True if neither the array nor any of the arrays it is a
+        view of can be modified.
+    """
+    while isinstance(arr, np.ndarray):
+        if arr.flags.writeable:
+            return False
+        arr = arr.base
+    return True
+
+
+def _cached_check(arr, name, check):
+    """ Returns check(arr).  The result is cached for read-only arrays,
+        which can't have changed since they were last checked.
+    """
+    if not _is_immutable(arr):
+        return check(arr)
+    key = id(arr)
+    entry = _validation_cache.get(key)
+    if entry is None or entry[0]() is not arr:
+        ref = weakref.ref(arr, lambda r: _validation_cache.pop(key, None))
+        entry = _validation_cache[key] = (ref, {})
+    results = entry[1]
+    if name not in results:
+        results[name] = check(arr)
+    return results[name]
+
+
+def iter_chunks(arr, size=None):
+    """ Iterates over views of `arr` of about `size` elements at most,
+        `VALIDATION_CHUNK_SIZE` by default.
+    """
+    if size is None:
+        size = VALIDATION_CHUNK_SIZE
+    arr = np.atleast_1d(arr)
+    if arr.flags.contiguous:
+        flat = arr.reshape(-1)
+        for start in xrange(0, flat.size, size):
+            yield flat[start:start + size]
+    else:
+        # Chunk along the first axis, the rows can't be flattened without
+        # a copy.
+        step = max(1, size // max(1, arr.size // max(1, len(arr))))
+        for start in xrange(0, len(arr), step):
+            yield arr[start:start + step]
+
+
+def _check_infinite(arr):
+    for chunk in iter_chunks(arr):
+        # The sum of a chunk without infinite or NaN values is finite,
+        # and is computed without any temporary array.
+        if not np.isfinite(chunk.sum()) and np.isinf(chunk).any():
+            return True
+    return False
+
+
+def has_infinite(arr):
+    """ Returns True if the array contains infinite values.  The array
+        is checked by chunks and the result is cached for read-only
+        arrays.
+    """
+    if arr.dtype.kind not in 'fc':
+        # Integer and boolean arrays can't hold infinite values.
+        return False
+    return _cached_check(arr, 'infinite', _check_infinite)
+
+
+def _index_range(arr):
+    return arr.min(), arr.max()
+
+
+def check_triangles(triangles, n_points, validate=None):
+    """ Checks the shape of the triangles array and that its values are
+        valid indices of `n_points` points, raises a ValueError if not.
+    """
+    if len(triangles.shape) != 2 or triangles.shape[1] != 3:
+        raise ValueError('The shape of the triangles array must be (X, 3)')
+    if not validation_enabled(validate) or triangles.size == 0:
+        return
+    t_min, t_max = _cached_check(triangles, 'range', _index_range)
+    if t_min < 0:
+        raise ValueError('The triangles array has negative values')
+    if t_max >= n_points:
+        raise ValueError('The triangles array has values larger than '
+                         'the number of points')
+
+
+def convert_to_arrays(args, validate=None):
     """ Converts a list of iterables to a list of arrays or callables,
-        if needed.
+        if needed.  Unless `validate` is False, or is None and the
+        `validate_inputs` mlab option is False, a ValueError is raised
+        for arrays with infinite values.
     """
+    validate = validation_enabled(validate)
     args = list(args)
     for index, arg in enumerate(args):
         if not callable(arg):
             if not hasattr(arg, 'shape'):
                 arg = np.atleast_1d(np.array(arg))
-            if np.any(np.isinf(arg)):
+            if validate and has_infinite(arg):
                 raise ValueError("""Input array contains infinite values
                 You can remove them using: a[np.isinf(a)] = np.nan
                 """)
@@ -897,13 +1464,13 @@ def convert_to_arrays(args):
     return args
 
 
-def process_regular_vectors(*args):
+def process_regular_vectors(*args, **kwargs):
     """ Converts different signatures to (x, y, z, u, v, w). """
-    args = convert_to_arrays(args)
+    args = convert_to_arrays(args, kwargs.get('validate'))
     if len(args) == 3:
         u, v, w = [np.atleast_3d(a) for a in args]
         assert len(u.shape) == 3, "3D array required"
-        x, y, z = np.indices(u.shape)
+        x, y, z = RegularGrid(u.shape).broadcast_arrays()
     elif len(args) == 6:
         x, y, z, u, v, w = args
     elif len(args) == 4:
@@ -924,13 +1491,13 @@ def process_regular_vectors(*args):
     return x, y, z, u, v, w
 
 
-def process_regular_scalars(*args):
+def process_regular_scalars(*args, **kwargs):
     """ Converts different signatures to (x, y, z, s). """
-    args = convert_to_arrays(args)
+    args = convert_to_arrays(args, kwargs.get('validate'))
     if len(args) == 1:
         s = np.atleast_3d(args[0])
         assert len(s.shape) == 3, "3D array required"
-        x, y, z = np.indices(s.shape)
+        x, y, z = RegularGrid(s.shape).broadcast_arrays()
     elif len(args) == 3:
         x, y, z = args
         s = None
@@ -951,7 +1518,7 @@ def process_regular_scalars(*args):
 
 def process_regular_2d_scalars(*args, **kwargs):
     """ Converts different signatures to (x, y, s). """
-    args = convert_to_arrays(args)
+    args = convert_to_arrays(args, kwargs.get('validate'))
     for index, arg in enumerate(args):
         if not callable(arg):
             args[index] = np.atleast_2d(arg)
@@ -995,6 +1562,9 @@ def vector_scatter(*args, **kwargs):
     If 4 positional arguments are passed the last one must be a callable, f,
     that returns vectors.
 
+    The points are only made vertex cells of the dataset when a module
+    drawing the cells, such as `surface`, is applied to the data.
+
     **Keyword arguments**:
 
         :name: the name of the vtk object created.
@@ -1007,15 +1577,19 @@ def vector_scatter(*args, **kwargs):
                  filters. If False, no figure will be created by modules
                  or filters applied to the source: the source can only
                  be used for testing, or numerical algorithms, not
-                 visualization."""
-    x, y, z, u, v, w = process_regular_vectors(*args)
+                 visualization.
+
+        :validate: whether to check the input arrays for infinite values,
+                   by default the `validate_inputs` mlab option is used."""
+    validate = kwargs.pop('validate', None)
+    x, y, z, u, v, w = process_regular_vectors(*args, validate=validate)
 
     scalars = kwargs.pop('scalars', None)
     if scalars is not None:
         scalars = np.ravel(scalars)
     name = kwargs.pop('name', 'VectorScatter')
 
-    data_source = MGlyphSource()
+    data_source = MGlyphSource(vertex_cells=False)
     data_source.reset(x=x, y=y, z=z, u=u, v=v, w=w, scalars=scalars)
 
     ds = tools.add_dataset(data_source.dataset, name, **kwargs)
@@ -1054,19 +1628,28 @@ def vector_field(*args, **kwargs):
                  filters. If False, no figure will be created by modules
                  or filters applied to the source: the source can only
                  be used for testing, or numerical algorithms, not
-                 visualization."""
+                 visualization.
+
+        :validate: whether to check the input arrays for infinite values,
+                   by default the `validate_inputs` mlab option is used."""
+    validate = kwargs.pop('validate', None)
     if len(args) == 3:
-        x = y = z = np.atleast_3d(1)
-        u, v, w = [np.atleast_3d(a) for a in args]
+        # Don't create the coordinate arrays, the grid is made from the
+        # indices of the vectors.  Its origin is 1, as it has always
+        # been.
+        u, v, w = [np.atleast_3d(a)
+                   for a in convert_to_arrays(args, validate)]
+        coordinates = dict(grid=RegularGrid(u.shape, origin=(1, 1, 1)))
     else:
         x, y, z, u, v, w = [np.atleast_3d(a)
-                        for a in process_regular_vectors(*args)]
+                for a in process_regular_vectors(*args, validate=validate)]
+        coordinates = dict(x=x, y=y, z=z)
 
     scalars = kwargs.pop('scalars', None)
     if scalars is not None:
         scalars = np.atleast_3d(scalars)
     data_source = MArraySource()
-    data_source.reset(x=x, y=y, z=z, u=u, v=v, w=w, scalars=scalars)
+    data_source.reset(u=u, v=v, w=w, scalars=scalars, **coordinates)
     name = kwargs.pop('name', 'VectorField')
     return tools.add_dataset(data_source.m_data, name, **kwargs)
 
@@ -1088,6 +1671,9 @@ def scalar_scatter(*args, **kwargs):
     If 4 positional arguments are passed the last one must be an array s, or
     a callable, f, that returns an array.
 
+    The points are only made vertex cells of the dataset when a module
+    drawing the cells, such as `surface`, is applied to the data.
+
     **Keyword arguments**:
 
         :name: the name of the vtk object created.
@@ -1098,13 +1684,17 @@ def scalar_scatter(*args, **kwargs):
                  filters. If False, no figure will be created by modules
                  or filters applied to the source: the source can only
                  be used for testing, or numerical algorithms, not
-                 visualization."""
-    x, y, z, s = process_regular_scalars(*args)
+                 visualization.
+
+        :validate: whether to check the input arrays for infinite values,
+                   by default the `validate_inputs` mlab option is used."""
+    x, y, z, s = process_regular_scalars(*args,
+                                validate=kwargs.pop('validate', None))
 
     if s is not None:
         s = np.ravel(s)
 
-    data_source = MGlyphSource()
+    data_source = MGlyphSource(vertex_cells=False)
     data_source.reset(x=x, y=y, z=z, scalars=s)
 
     name = kwargs.pop('name', 'ScalarScatter')
@@ -1131,7 +1721,8 @@ def scalar_field(*args, **kwargs):
     the points are regularily spaced.
 
     If 4 positional arguments are passed the last one must be an array s, or
-    a callable, f, that returns an array.
+    a callable, f, that returns an array. An elementwise callable wrapped
+    with `mlab.tiled` is evaluated by tiles, possibly in parallel.
 
     **Keyword arguments**:
 
@@ -1143,17 +1734,22 @@ def scalar_field(*args, **kwargs):
                  filters. If False, no figure will be created by modules
                  or filters applied to the source: the source can only
                  be used for testing, or numerical algorithms, not
-                 visualization."""
-    if len(args) == 1:
-        # Be lazy, don't create three big arrays for 1 input array. The
-        # MArraySource is clever-enough to handle flat arrays
-        x = y = z = np.atleast_1d(1)
-        s = args[0]
-    else:
-        x, y, z, s = process_regular_scalars(*args)
+                 visualization.
 
+        :validate: whether to check the input arrays for infinite values,
+                   by default the `validate_inputs` mlab option is used."""
+    validate = kwargs.pop('validate', None)
     data_source = MArraySource()
-    data_source.reset(x=x, y=y, z=z, scalars=s)
+    if len(args) == 1:
+        # Be lazy, don't create three big arrays for 1 input array, the
+        # grid is made from the indices of the array.  Its origin is 1,
+        # as it has always been.
+        s = np.atleast_3d(convert_to_arrays(args, validate)[0])
+        data_source.reset(scalars=s,
+                          grid=RegularGrid(s.shape, origin=(1, 1, 1)))
+    else:
+        x, y, z, s = process_regular_scalars(*args, validate=validate)
+        data_source.reset(x=x, y=y, z=z, scalars=s)
 
     name = kwargs.pop('name', 'ScalarField')
     return tools.add_dataset(data_source.m_data, name, **kwargs)
@@ -1182,10 +1778,14 @@ def line_source(*args, **kwargs):
                  filters. If False, no figure will be created by modules
                  or filters applied to the source: the source can only
                  be used for testing, or numerical algorithms, not
-                 visualization."""
+                 visualization.
+
+        :validate: whether to check the input arrays for infinite values,
+                   by default the `validate_inputs` mlab option is used."""
     if len(args) == 1:
         raise ValueError("wrong number of arguments")
-    x, y, z, s = process_regular_scalars(*args)
+    x, y, z, s = process_regular_scalars(*args,
+                                validate=kwargs.pop('validate', None))
 
     data_source = MLineSource()
     data_source.reset(x=x, y=y, z=z, scalars=s)
@@ -1208,7 +1808,9 @@ def array2d_source(*args, **kwargs):
 
     If 3 positional arguments are passed the last one must be an array s,
     or a callable, f, that returns an array. x and y give the
-    coordinnates of positions corresponding to the s values.
+    coordinnates of positions corresponding to the s values. An
+    elementwise callable wrapped with `mlab.tiled` is evaluated by
+    tiles, possibly in parallel.
 
     x and y can be 1D or 2D arrays (such as returned by numpy.ogrid or
     numpy.mgrid), but the points should be located on an orthogonal grid
@@ -1231,22 +1833,80 @@ def array2d_source(*args, **kwargs):
                  be used for testing, or numerical algorithms, not
                  visualization.
 
+        :validate: whether to check the input arrays for infinite values,
+                   by default the `validate_inputs` mlab option is used.
+
         :mask: Mask points specified in a boolean masking array.
     """
     data_source = MArray2DSource()
     mask = kwargs.pop('mask', None)
     if len(args) == 1:
-        args = convert_to_arrays(args)
+        args = convert_to_arrays(args, kwargs.get('validate'))
         s = np.atleast_2d(args[0])
         data_source.reset(scalars=s, mask=mask)
     else:
         x, y, s = process_regular_2d_scalars(*args, **kwargs)
         data_source.reset(x=x, y=y, scalars=s, mask=mask)
 
+    kwargs.pop('validate', None)
     name = kwargs.pop('name', 'Array2DSource')
     return tools.add_dataset(data_source.m_data, name, **kwargs)
 
 
+def regular_surface_source(*args, **kwargs):
+    """
+    Creates a surface warped from regularly-spaced elevation data, with
+    its normals computed on the grid.
+
+    **Function signatures**::
+
+        regular_surface_source(s, ...)
+        regular_surface_source(x, y, s, ...)
+        regular_surface_source(x, y, f, ...)
+
+    The arguments are the same as for `array2d_source`: x and y can be
+    1D arrays or arrays returned by numpy.ogrid or numpy.mgrid.  The
+    points can be non-uniformly spaced but must be located on an
+    orthogonal grid.
+
+    The `mlab_source` of the returned source is a `MRegularSurfaceSource`:
+    after changing a part of its scalars in place, its `update_region`
+    method updates only that part of the surface.
+
+    **Keyword arguments**:
+
+        :name: the name of the vtk object created.
+
+        :warp_scale: the scale of the elevation.
+
+        :figure: optionally, the figure on which to add the data source.
+                 If None, the source is not added to any figure, and will
+                 be added automatically by the modules or
+                 filters. If False, no figure will be created by modules
+                 or filters applied to the source: the source can only
+                 be used for testing, or numerical algorithms, not
+                 visualization.
+
+        :validate: whether to check the input arrays for infinite values,
+                   by default the `validate_inputs` mlab option is used.
+    """
+    validate = kwargs.pop('validate', None)
+    if len(args) == 1:
+        x = y = None
+        s = convert_to_arrays(args, validate)[0]
+    else:
+        x, y, s = process_regular_2d_scalars(*args, validate=validate)
+
+    data_source = MRegularSurfaceSource()
+    data_source.reset(x=x, y=y, scalars=s,
+                      warp_scale=kwargs.pop('warp_scale', 1.0))
+
+    name = kwargs.pop('name', 'RegularSurfaceSource')
+    ds = tools.add_dataset(data_source.dataset, name, **kwargs)
+    data_source.m_data = ds
+    return ds
+
+
 def grid_source(x, y, z, **kwargs):
     """
     Creates 2D grid data.
@@ -1272,6 +1932,9 @@ def grid_source(x, y, z, **kwargs):
                  be used for testing, or numerical algorithms, not
                  visualization.
 
+        :validate: whether to check the input arrays for infinite values,
+                   by default the `validate_inputs` mlab option is used.
+
         :mask: Mask points specified in a boolean masking array.
 
         """
@@ -1280,7 +1943,8 @@ def grid_source(x, y, z, **kwargs):
         scalars = z
     mask = kwargs.pop('mask', None)
 
-    x, y, z, scalars = convert_to_arrays((x, y, z, scalars))
+    x, y, z, scalars = convert_to_arrays((x, y, z, scalars),
+                                         kwargs.pop('validate', None))
     data_source = MGridSource()
     data_source.reset(x=x, y=y, z=z, scalars=scalars, mask=mask)
 
@@ -1328,6 +1992,9 @@ def vertical_vectors_source(*args, **kwargs):
                  or filters applied to the source: the source can only
                  be used for testing, or numerical algorithms, not
                  visualization.
+
+        :validate: whether to check the input arrays for infinite values,
+                   by default the `validate_inputs` mlab option is used.
     """
     if len(args) == 3:
         x, y, data = args
@@ -1337,7 +2004,8 @@ def vertical_vectors_source(*args, **kwargs):
             z = np.zeros_like(x)
         args = (x, y, z, data)
 
-    x, y, z, s = process_regular_scalars(*args)
+    x, y, z, s = process_regular_scalars(*args,
+                                validate=kwargs.pop('validate', None))
 
     if s is not None:
         s = np.ravel(s)
@@ -1373,19 +2041,19 @@ def triangular_mesh_source(x, y, z, triangles, **kwargs):
                  or filters applied to the source: the source can only
                  be used for testing, or numerical algorithms, not
                  visualization.
+
+        :validate: whether to check the input arrays for infinite values,
+                   by default the `validate_inputs` mlab option is used.
         """
-    x, y, z, triangles = convert_to_arrays((x, y, z, triangles))
+    validate = kwargs.pop('validate', None)
+    x, y, z, triangles = convert_to_arrays((x, y, z, triangles), validate)
 
-    if triangles.min() < 0:
-        raise ValueError('The triangles array has negative values')
-    if triangles.max() > x.size:
-        raise ValueError('The triangles array has values larger than' \
-                                    'the number of points')
     scalars = kwargs.pop('scalars', None)
     if scalars is None:
         scalars = z
 
-    data_source = MTriangularMeshSource()
+    # The triangles are checked when the source is reset.
+    data_source = MTriangularMeshSource(validate=validate)
     data_source.reset(x=x, y=y, z=z, triangles=triangles, scalars=scalars)
 
     name = kwargs.pop('name', 'TriangularMeshSource')
@@ -264,16 +264,15 @@ def array2vtk(num_array, vtk_array=None):
            "Use real() or imag() to get a component of the array before"\
            " passing it to vtk."
 
-    # First create an array of the right type by using the typecode.
     # Bit arrays need special casing.
-    bit_array = False
+    if vtk_array is not None and \
+           vtk_array.GetDataType() == vtkConstants.VTK_BIT:
+        return _array2bit_array(z, vtk_array)
+
+    # First create an array of the right type by using the typecode.
     if vtk_array is None:
         vtk_typecode = get_vtk_array_type(z.dtype)
         result_array = create_vtk_array(vtk_typecode)
-    elif vtk_array.GetDataType() == vtkConstants.VTK_BIT:
-        vtk_typecode = vtkConstants.VTK_CHAR
-        result_array = create_vtk_array(vtkConstants.VTK_CHAR)
-        bit_array = True
     else:
         vtk_typecode = vtk_array.GetDataType()
         result_array = vtk_array
@@ -297,26 +296,39 @@ def array2vtk(num_array, vtk_array=None):
     # tells the array not to deallocate.
     result_array.SetVoidArray(numpy.getbuffer(z_flat), len(z_flat), 1)
 
-    if bit_array:
-        # Handle bit arrays -- they have to be copied.  Note that bit
-        # arrays are used ONLY when the user has passed one as an
-        # argument to this function.
-        vtk_array.SetNumberOfTuples(result_array.GetNumberOfTuples())
-        vtk_array.SetNumberOfComponents(result_array.GetNumberOfComponents())
-        for i in range(result_array.GetNumberOfComponents()):
-            vtk_array.CopyComponent(i, result_array, i)
-        result_array = vtk_array
-    else:
-        # Save a reference to the flatted array in the array cache.
-        # This prevents the user from deleting or resizing the array
-        # and getting into serious trouble.  This is only done for
-        # non-bit array cases where the data is not copied.
-        global _array_cache
-        _array_cache.add(result_array, z_flat)
+    # Save a reference to the flatted array in the array cache.
+    # This prevents the user from deleting or resizing the array
+    # and getting into serious trouble.
+    global _array_cache
+    _array_cache.add(result_array, z_flat)
 
     return result_array
 
 
+def _array2bit_array(z, vtk_array):
+    """Sets the values of the `vtkBitArray` `vtk_array` to those of the
+    1 or 2D numpy array `z` (non-zero values are set) and returns it.
+    The bits are packed with `numpy.packbits` and the VTK array is
+    pointed to the packed data, which is cached like other arrays.
+    """
+    shape = z.shape
+    if len(shape) == 1:
+        vtk_array.SetNumberOfComponents(1)
+    else:
+        vtk_array.SetNumberOfComponents(shape[1])
+    # VTK stores the bits most significant bit first just as numpy
+    # does.
+    z_flat = numpy.ravel(z)
+    packed = numpy.packbits(z_flat != 0)
+    if len(z_flat) == 0:
+        vtk_array.SetNumberOfTuples(0)
+        return vtk_array
+    vtk_array.SetVoidArray(numpy.getbuffer(packed), len(z_flat), 1)
+    global _array_cache
+    _array_cache.add(vtk_array, packed)
+    return vtk_array
+
+
 def vtk2array(vtk_array):
     """Converts a VTK data array to a numpy array.
 
@@ -345,6 +357,10 @@ def vtk2array(vtk_array):
         dtype = get_numeric_array_type(typ)
         return numpy.array([], dtype)
 
+    # Bit arrays are unpacked with numpy.
+    if typ == vtkConstants.VTK_BIT:
+        return _bit_array2array(vtk_array, shape)
+
     # First check if this array already has a numpy array cached, if
     # it does, reshape that and return it.
     if vtk_array in _array_cache:
@@ -355,29 +371,35 @@ def vtk2array(vtk_array):
         return arr
 
     # If VTK's new numpy support is available, use the buffer interface.
-    if numpy_support is not None and typ != vtkConstants.VTK_BIT:
+    # Id type arrays are always tried since copying them is expensive.
+    if numpy_support is not None or typ == vtkConstants.VTK_ID_TYPE:
         dtype = get_numeric_array_type(typ)
-        result = numpy.frombuffer(vtk_array, dtype=dtype)
-        if shape[1] == 1:
-            shape = (shape[0], )
-        result.shape = shape
-        return result
+        try:
+            result = numpy.frombuffer(vtk_array, dtype=dtype)
+        except (TypeError, AttributeError):
+            result = None
+        if result is not None:
+            if shape[1] == 1:
+                shape = (shape[0], )
+            result.shape = shape
+            return result
 
     # Setup an imaging pipeline to export the array.
     img_data = vtk.vtkImageData()
     img_data.SetDimensions(shape[0], 1, 1)
-    if typ == vtkConstants.VTK_BIT:
-        iarr = vtk.vtkCharArray()
-        iarr.DeepCopy(vtk_array)
-        img_data.GetPointData().SetScalars(iarr)
-    elif typ == vtkConstants.VTK_ID_TYPE:
+    if typ == vtkConstants.VTK_ID_TYPE:
         # Needed since VTK_ID_TYPE does not work with VTK 4.5.
         iarr = vtk.vtkLongArray()
-        iarr.SetNumberOfTuples(vtk_array.GetNumberOfTuples())
         nc = vtk_array.GetNumberOfComponents()
         iarr.SetNumberOfComponents(nc)
-        for i in range(nc):
-            iarr.CopyComponent(i, vtk_array, i)
+        if VTK_ID_TYPE_SIZE == VTK_LONG_TYPE_SIZE:
+            # Use the memory of the id array, avoiding a copy.
+            iarr.SetVoidArray(vtk_array.GetVoidPointer(0),
+                              shape[0]*nc, 1)
+        else:
+            iarr.SetNumberOfTuples(vtk_array.GetNumberOfTuples())
+            for i in range(nc):
+                iarr.CopyComponent(i, vtk_array, i)
         img_data.GetPointData().SetScalars(iarr)
     else:
         img_data.GetPointData().SetScalars(vtk_array)
@@ -387,9 +409,6 @@ def vtk2array(vtk_array):
         # Hack necessary because vtkImageData can't handle VTK_ID_TYPE.
         img_data.SetScalarType(vtkConstants.VTK_LONG)
         r_dtype = get_numeric_array_type(vtkConstants.VTK_LONG)
-    elif typ == vtkConstants.VTK_BIT:
-        img_data.SetScalarType(vtkConstants.VTK_CHAR)
-        r_dtype = get_numeric_array_type(vtkConstants.VTK_CHAR)
     else:
         img_data.SetScalarType(typ)
         r_dtype = get_numeric_array_type(typ)
@@ -409,6 +428,21 @@ def vtk2array(vtk_array):
     return im_arr
 
 
+def _bit_array2array(vtk_array, shape):
+    """Returns the values of the `vtkBitArray` of the given shape as an
+    int8 numpy array.  The bits are unpacked with `numpy.unpackbits`.
+    """
+    n = shape[0]*shape[1]
+    # VTK stores the bits most significant bit first just as numpy
+    # does, so look at the array as bytes and unpack them.
+    packed = vtk.vtkUnsignedCharArray()
+    packed.SetVoidArray(vtk_array.GetVoidPointer(0), (n + 7)//8, 1)
+    result = numpy.unpackbits(vtk2array(packed))[:n].view(numpy.int8)
+    if shape[1] == 1:
+        shape = (shape[0], )
+    return numpy.reshape(result, shape)
+
+
 def array2vtkCellArray(num_array, vtk_array=None):
     """Given a nested Python list or a numpy array, this method
     creates a vtkCellArray instance and returns it.
@@ -538,6 +572,44 @@ def array2vtkCellArray(num_array, vtk_array=None):
         raise TypeError, msg
 
 
+def ids2vtkCellArray(num_array, n_cells, vtk_array=None):
+    """Returns a vtkCellArray with the `n_cells` cells of the
+    connectivity array `num_array`.
+
+    The connectivity is given in the VTK layout, (npts, p0, p1,
+    ... p(npts-1), repeated for each cell).  Unlike with
+    `array2vtkCellArray` no copy of the data is made when `num_array`
+    is a contiguous array of typecode `ID_TYPE_CODE`, the cell array
+    then uses the memory of `num_array`.
+
+    Parameters
+    ----------
+
+    - num_array : numpy array
+
+      The connectivity array, it is flattened.
+
+    - n_cells : int
+
+      The number of cells in the array.
+
+    - vtk_array : `vtkCellArray` (default: `None`)
+
+      If an optional `vtkCellArray` instance, is passed as an argument
+      then a new array is not created and returned.  The passed array
+      is itself modified and returned.
+
+    """
+    if vtk_array:
+        cells = vtk_array
+    else:
+        cells = vtk.vtkCellArray()
+    ids = vtk.vtkIdTypeArray()
+    array2vtk(numpy.ravel(num_array), ids)
+    cells.SetCells(n_cells, ids)
+    return cells
+
+
 def array2vtkPoints(num_array, vtk_points=None):
     """Converts a numpy array/Python list to a vtkPoints object.
 
@@ -601,6 +673,127 @@ def array2vtkIdList(num_array, vtk_idlist=None):
     return ids
 
 
+######################################################################
+# Indexing of VTK arrays, points and id lists.
+######################################################################
+
+def is_index(key):
+    """Returns True if `key` is a single integer index."""
+    return isinstance(key, (int, long, numpy.integer))
+
+
+def _check_items_key(key):
+    if isinstance(key, (basestring, float)):
+        raise TypeError("Only integers, slices and integer or boolean "
+                        "arrays are valid keys.")
+
+
+def _get_data_array(obj):
+    """Returns a `vtkDataArray` holding the data of the given
+    `vtkDataArray`, `vtkPoints` or `vtkIdList`.  For id lists the
+    returned array uses the memory of the list.
+    """
+    if obj.IsA('vtkPoints'):
+        return obj.GetData()
+    elif obj.IsA('vtkIdList'):
+        arr = vtk.vtkIdTypeArray()
+        n = obj.GetNumberOfIds()
+        if n > 0:
+            arr.SetVoidArray(obj.GetPointer(0), n, 1)
+        return arr
+    return obj
+
+
+def _get_view(vtk_array):
+    """Returns a numpy array for the `vtkDataArray` and True if it is
+    a view of the VTK data and False if it is a copy."""
+    is_view = vtk_array.GetNumberOfTuples() > 0 and \
+              vtk_array.GetDataType() != vtkConstants.VTK_BIT and \
+              (vtk_array in _array_cache or numpy_support is not None)
+    return vtk2array(vtk_array), is_view
+
+
+def _write_back(obj, arr):
+    """Copies the numpy array `arr` into `obj` when `arr` is not a view
+    of its data."""
+    if obj.IsA('vtkIdList'):
+        array2vtkIdList(arr, obj)
+    elif obj.IsA('vtkPoints'):
+        array2vtk(arr, obj.GetData())
+    else:
+        array2vtk(arr, obj)
+
+
+def get_array_items(obj, key):
+    """Returns the items of a `vtkDataArray`, `vtkPoints` or
+    `vtkIdList` for the given slice, boolean mask or integer array
+    `key` using numpy indexing.  For slices the result is a view of
+    the VTK data (when VTK supports the buffer interface), so it is
+    only valid as long as `obj` is not resized.
+    """
+    _check_items_key(key)
+    return vtk2array(_get_data_array(obj))[key]
+
+
+def set_array_items(obj, key, value):
+    """Sets the items of a `vtkDataArray`, `vtkPoints` or `vtkIdList`
+    given by the slice, boolean mask or integer array `key` to
+    `value` using numpy indexing, i.e. ``obj[key] = value``.  The data
+    is written in place and `obj` is marked as modified once.
+    """
+    _check_items_key(key)
+    arr, is_view = _get_view(_get_data_array(obj))
+    arr[key] = value
+    if not is_view:
+        _write_back(obj, arr)
+    obj.Modified()
+
+
+def extend_array(obj, values):
+    """Appends the `values` (a numpy array or a sequence) to the given
+    `vtkDataArray`, `vtkPoints` or `vtkIdList`.  The object is resized
+    once and the values copied in one go, `obj` is marked as modified
+    once.
+    """
+    if obj.IsA('vtkIdList'):
+        values = numpy.ravel(values)
+        data = obj
+        n = obj.GetNumberOfIds()
+    else:
+        data = obj
+        if obj.IsA('vtkPoints'):
+            data = obj.GetData()
+        nc = data.GetNumberOfComponents()
+        values = numpy.asarray(values)
+        if nc == 1:
+            values = numpy.ravel(values)
+        else:
+            values = numpy.reshape(values, (-1, nc))
+        n = data.GetNumberOfTuples()
+
+    m = len(values)
+    if m == 0:
+        return
+    if obj.IsA('vtkIdList'):
+        # This grows the list geometrically when needed.
+        obj.Resize(n + m)
+        obj.SetNumberOfIds(n + m)
+    else:
+        if (n + m)*data.GetNumberOfComponents() > data.GetSize():
+            # Grow geometrically so repeated calls are not quadratic.
+            data.Resize(max(n + m, n + n//2))
+            # The data is no longer in the numpy array it may have been
+            # created from, so any cached array is stale.
+            _array_cache._remove_array(data.__this__)
+        data.SetNumberOfTuples(n + m)
+
+    arr, is_view = _get_view(_get_data_array(obj))
+    arr[n:] = values
+    if not is_view:
+        _write_back(obj, arr)
+    obj.Modified()
+
+
 ######################################################################
 # Array argument handling functions.
 ######################################################################
@@ -30,7 +30,7 @@ from special_gen import HelperGenerator
 class TVTKGenerator:
     """Generates all the TVTK code."""
 
-    def __init__(self, out_dir=''):
+    def __init__(self, out_dir='', use_cache=False):
         """Initializes the instance.
 
         Parameters
@@ -45,6 +45,12 @@ class TVTKGenerator:
           overwritten.  If no out_dir is specified, a temporary one is
           created using `tempfile.mkdtemp`.
 
+        - use_cache - `bool`
+
+          If True, the VTK method parser uses (and updates) its
+          on-disk cache of parsed class information.  See
+          `vtk_parser.VTKMethodParser`.
+
         """
         if not out_dir:
             out_dir = tempfile.mkdtemp()
@@ -54,7 +60,7 @@ class TVTKGenerator:
             os.makedirs(self.out_dir)
         self.zip_name = 'tvtk_classes.zip'
 
-        self.wrap_gen = WrapperGenerator()
+        self.wrap_gen = WrapperGenerator(use_cache=use_cache)
         self.helper_gen = HelperGenerator()
 
     #################################################################
@@ -101,6 +107,7 @@ class TVTKGenerator:
                     self._write_wrapper_class(node, tvtk_name)
                     helper_gen.add_class(tvtk_name, helper_file)
         helper_file.close()
+        wrap_gen.parser.save_cache()
 
     def write_wrapper_classes(self, names):
         """Given VTK class names in the list `names`, write out the
@@ -133,6 +140,7 @@ class TVTKGenerator:
         for node in nodes:
             tvtk_name = get_tvtk_name(node.name)
             self._write_wrapper_class(node, tvtk_name)
+        self.wrap_gen.parser.save_cache()
 
     def build_zip(self, include_src=False):
         """Build the zip file (with name `self.zip_name`) in the
@@ -217,11 +225,14 @@ code will be generated for all the VTK classes.
     parser.add_option("-s", "--source", action="store_true",
                       dest="src", default=False,
                       help="Include source files (*.py) in addition to *.pyc files in the ZIP file.")
+    parser.add_option("-c", "--cache", action="store_true",
+                      dest="cache", default=False,
+                      help="Use an on-disk cache of the parsed VTK classes.")
 
     (options, args) = parser.parse_args()
 
     # Now do stuff.
-    gen = TVTKGenerator(options.out_dir)
+    gen = TVTKGenerator(options.out_dir, use_cache=options.cache)
 
     if len(args) == 0:
         gen.generate_code()
@@ -155,7 +155,8 @@ class TVTKScene(HasPrivateTraits):
     # Properties.
 
     # The interactor used by the scene.
-    interactor = Property(Instance(tvtk.GenericRenderWindowInteractor))
+    interactor = Property(Instance(tvtk.GenericRenderWindowInteractor),
+                          depends_on='_interactor')
 
     # The render_window.
     render_window = Property(Instance(tvtk.RenderWindow))
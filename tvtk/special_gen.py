@@ -218,8 +218,7 @@ class SpecialGenerator:
                     yield tuple([obj.GetComponent(i, x) for x in range(nc)])
 
         def _check_key(self, key, n):
-            if type(key) not in [int, long]:
-                raise TypeError, "Only integers are valid keys."
+            key = int(key)
             if key < 0:
                 key =  n + key
             if key < 0 or key >= n:
@@ -227,7 +226,13 @@ class SpecialGenerator:
             return key
 
         def __getitem__(self, key):
+            '''Returns the tuple at the given integer index.  Slices,
+            boolean masks and integer arrays return a numpy array, a
+            view of the data for slices.
+            '''
             obj = self._vtk_obj
+            if not array_handler.is_index(key):
+                return array_handler.get_array_items(obj, key)
             n = obj.GetNumberOfTuples()
             key = self._check_key(key, n)
             nc = obj.GetNumberOfComponents()
@@ -238,6 +243,9 @@ class SpecialGenerator:
 
         def __setitem__(self, key, val):
             obj = self._vtk_obj
+            if not array_handler.is_index(key):
+                array_handler.set_array_items(obj, key, val)
+                return
             n = obj.GetNumberOfTuples()
             key = self._check_key(key, n)
             nc = obj.GetNumberOfComponents()
@@ -275,20 +283,7 @@ class SpecialGenerator:
             self.update_traits()
 
         def extend(self, arr):
-            obj = self._vtk_obj
-            nc = obj.GetNumberOfComponents()
-            if nc == 1:
-                for i in arr:
-                    obj.InsertNextTuple1(i)
-            elif nc in [2,3,4,9]:
-                meth = getattr(obj, 'InsertNextTuple%d'%nc)
-                for i in arr:
-                    meth(*i)
-            else:
-                n = obj.GetNumberOfTuples()
-                for i in range(len(arr)):
-                    for x in range(nc):
-                        obj.InsertComponent(n+i, x, arr[i][x])
+            array_handler.extend_array(self._vtk_obj, arr)
             self.update_traits()
 
         def from_array(self, arr):
@@ -318,8 +313,7 @@ class SpecialGenerator:
                 yield obj.GetPoint(i)
 
         def _check_key(self, key, n):
-            if type(key) != type(1):
-                raise TypeError, "Only integers are valid keys."
+            key = int(key)
             if key < 0:
                 key =  n + key
             if key < 0 or key >= n:
@@ -328,12 +322,17 @@ class SpecialGenerator:
 
         def __getitem__(self, key):
             obj = self._vtk_obj
+            if not array_handler.is_index(key):
+                return array_handler.get_array_items(obj, key)
             n = obj.GetNumberOfPoints()
             key = self._check_key(key, n)
             return obj.GetPoint(key)
 
         def __setitem__(self, key, val):
             obj = self._vtk_obj
+            if not array_handler.is_index(key):
+                array_handler.set_array_items(obj, key, val)
+                return
             n = obj.GetNumberOfPoints()
             key = self._check_key(key, n)
             obj.SetPoint(key, val)
@@ -353,9 +352,7 @@ class SpecialGenerator:
             self.update_traits()
 
         def extend(self, arr):
-            obj = self._vtk_obj
-            for i in arr:
-                obj.InsertNextPoint(i)
+            array_handler.extend_array(self._vtk_obj, arr)
             self.update_traits()
 
         def from_array(self, arr):
@@ -385,8 +382,7 @@ class SpecialGenerator:
                 yield obj.GetId(i)
 
         def _check_key(self, key, n):
-            if type(key) != type(1):
-                raise TypeError, "Only integers are valid keys."
+            key = int(key)
             if key < 0:
                 key =  n + key
             if key < 0 or key >= n:
@@ -395,12 +391,17 @@ class SpecialGenerator:
 
         def __getitem__(self, key):
             obj = self._vtk_obj
+            if not array_handler.is_index(key):
+                return array_handler.get_array_items(obj, key)
             n = obj.GetNumberOfIds()
             key = self._check_key(key, n)
             return obj.GetId(key)
 
         def __setitem__(self, key, val):
             obj = self._vtk_obj
+            if not array_handler.is_index(key):
+                array_handler.set_array_items(obj, key, val)
+                return
             n = obj.GetNumberOfIds()
             key = self._check_key(key, n)
             obj.SetId(key, val)
@@ -420,9 +421,7 @@ class SpecialGenerator:
             self.update_traits()
 
         def extend(self, arr):
-            obj = self._vtk_obj
-            for i in arr:
-                obj.InsertNextId(i)
+            array_handler.extend_array(self._vtk_obj, arr)
             self.update_traits()
 
         def from_array(self, arr):
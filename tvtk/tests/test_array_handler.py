@@ -223,6 +223,23 @@ class TestArrayHandler(unittest.TestCase):
         cells = array_handler.array2vtkCellArray(a)
         self.assertEqual(cells.GetNumberOfCells(), N)
 
+    def test_ids2cell_array(self):
+        """Test connectivity array to vtkCellArray conversion."""
+        ids = numpy.array([[2, 0, 1], [2, 1, 2]], array_handler.ID_TYPE_CODE)
+        cells = array_handler.ids2vtkCellArray(ids, 2)
+        self.assertEqual(cells.GetNumberOfCells(), 2)
+        arr = array_handler.vtk2array(cells.GetData())
+        self.assertEqual(list(arr), [2, 0, 1, 2, 1, 2])
+        # The memory of the array is used.
+        ids[1, 2] = 0
+        self.assertEqual(cells.GetData().GetValue(5), 0)
+
+        cells = vtk.vtkCellArray()
+        ident = id(cells)
+        cells = array_handler.ids2vtkCellArray([1, 0, 1, 1, 1, 2], 3, cells)
+        self.assertEqual(id(cells), ident)
+        self.assertEqual(cells.GetNumberOfCells(), 3)
+
     def test_arr2vtkPoints(self):
         """Test Numeric array to vtkPoints conversion."""
         a = [[0.0, 0.0, 0.0], [1.0, 1.0, 1.0]]
@@ -407,6 +424,97 @@ class TestArrayHandler(unittest.TestCase):
         np = array_handler.vtk2array(arr)
         self.assertEqual(numpy.all(np == range(10)), True)
 
+    def test_bit_array(self):
+        """Test conversion of large and multi-component bit arrays."""
+        a = numpy.array([[1, 0, 1], [0, 0, 1], [1, 1, 1]] * 7)
+        vtk_arr = array_handler.array2vtk(a, vtk.vtkBitArray())
+        self.assertEqual(vtk_arr.GetNumberOfTuples(), 21)
+        self.assertEqual(vtk_arr.GetNumberOfComponents(), 3)
+        for i, v in enumerate(a.flat):
+            self.assertEqual(vtk_arr.GetValue(i), v)
+        b = array_handler.vtk2array(vtk_arr)
+        self.assertEqual(b.shape, a.shape)
+        self.assertEqual(numpy.all(a == b), True)
+
+        # Changes made by VTK must show up.
+        vtk_arr.SetValue(1, 1)
+        vtk_arr.InsertNextTuple3(0, 1, 0)
+        b = array_handler.vtk2array(vtk_arr)
+        self.assertEqual(b.shape, (22, 3))
+        self.assertEqual(list(b[0]), [1, 1, 1])
+        self.assertEqual(list(b[-1]), [0, 1, 0])
+
+        # The array is usable when the numpy array is gone.
+        vtk_arr = vtk.vtkBitArray()
+        array_handler.array2vtk(numpy.ones(100, bool), vtk_arr)
+        self.assertEqual(numpy.all(array_handler.vtk2array(vtk_arr) == 1),
+                         True)
+
+    def test_array_items(self):
+        """Test slicing and fancy indexing of VTK arrays."""
+        a = numpy.arange(12.0).reshape(4, 3)
+        varr = array_handler.array2vtk(a.copy())
+        r = array_handler.get_array_items(varr, slice(1, 3))
+        self.assertEqual(numpy.all(r == a[1:3]), True)
+        r = array_handler.get_array_items(varr, [0, 3])
+        self.assertEqual(numpy.all(r == a[[0, 3]]), True)
+
+        mtime = varr.GetMTime()
+        mask = numpy.array([True, False, True, False])
+        array_handler.set_array_items(varr, mask, -1)
+        a[mask] = -1
+        self._check_arrays(a, varr)
+        self.assertTrue(varr.GetMTime() > mtime)
+        array_handler.set_array_items(varr, slice(None, None, 2), [1, 2, 3])
+        a[::2] = [1, 2, 3]
+        self._check_arrays(a, varr)
+
+        self.assertRaises(TypeError, array_handler.get_array_items,
+                          varr, 's')
+
+        # vtkPoints and vtkIdList.
+        points = array_handler.array2vtkPoints(a)
+        array_handler.set_array_items(points, numpy.array([1, 2]), 0)
+        self.assertEqual(points.GetPoint(1), (0.0, 0.0, 0.0))
+        self.assertEqual(points.GetPoint(3), tuple(a[3]))
+        ids = array_handler.array2vtkIdList([0, 1, 2, 3])
+        array_handler.set_array_items(ids, slice(1, None), 5)
+        self.assertEqual([ids.GetId(i) for i in range(4)], [0, 5, 5, 5])
+        r = array_handler.get_array_items(ids, slice(None, 2))
+        self.assertEqual(list(r), [0, 5])
+
+    def test_extend_array(self):
+        """Test if extending VTK arrays works."""
+        a = numpy.arange(12.0).reshape(4, 3)
+        varr = array_handler.array2vtk(a.copy())
+        mtime = varr.GetMTime()
+        for i in range(5):
+            array_handler.extend_array(varr, [[i, i, i]])
+        b = numpy.repeat(numpy.arange(5.0), 3).reshape(5, 3)
+        a = numpy.concatenate([a, b])
+        self._check_arrays(a, varr)
+        self.assertTrue(varr.GetMTime() > mtime)
+        # The cached array must be updated.
+        r = array_handler.vtk2array(varr)
+        self.assertEqual(numpy.all(r == a), True)
+
+        varr = vtk.vtkFloatArray()
+        array_handler.extend_array(varr, [1, 2, 3])
+        self._check_arrays(numpy.array([1, 2, 3]), varr)
+        array_handler.extend_array(varr, [])
+        self.assertEqual(varr.GetNumberOfTuples(), 3)
+
+        points = vtk.vtkPoints()
+        array_handler.extend_array(points, numpy.ones((10, 3)))
+        array_handler.extend_array(points, [[2, 2, 2]])
+        self.assertEqual(points.GetNumberOfPoints(), 11)
+        self.assertEqual(points.GetPoint(10), (2.0, 2.0, 2.0))
+
+        ids = vtk.vtkIdList()
+        for i in range(3):
+            array_handler.extend_array(ids, range(i*2, i*2 + 2))
+        self.assertEqual([ids.GetId(i) for i in range(6)], range(6))
+
 
 if __name__ == "__main__":
     unittest.main()
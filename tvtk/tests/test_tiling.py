@@ -0,0 +1,72 @@
+"""Tests for the tiled evaluation of functions over grids."""
+# Copyright (c) 2013, Enthought, Inc.
+# License: BSD Style.
+
+import unittest
+
+import numpy
+
+from tvtk.tools.tiling import evaluate_tiled, tiled, TiledFunction
+
+
+def f(x, y, z):
+    return numpy.sin(x*y) + z
+
+
+class TestTiling(unittest.TestCase):
+    def setUp(self):
+        self.x, self.y, self.z = numpy.ogrid[0:1:13j, 0:2:7j, -1:1:5j]
+        self.expect = f(self.x, self.y, self.z)
+
+    def check(self, result, order='F'):
+        self.assertEqual(result.shape, (13, 7, 5))
+        self.assertTrue(numpy.allclose(result, self.expect))
+        flag = 'F_CONTIGUOUS' if order == 'F' else 'C_CONTIGUOUS'
+        self.assertTrue(result.flags[flag])
+
+    def test_serial(self):
+        xyz = (self.x, self.y, self.z)
+        self.check(evaluate_tiled(f, xyz, tile_size=30))
+        self.check(evaluate_tiled(f, xyz, tile_size=30, order='C'), 'C')
+        # A single tile.
+        self.check(evaluate_tiled(f, xyz))
+
+    def test_parallel(self):
+        xyz = (self.x, self.y, self.z)
+        self.check(evaluate_tiled(f, xyz, tile_size=100, n_workers=3))
+        self.check(evaluate_tiled(f, xyz, tile_size=100, n_workers=2,
+                                  use_processes=True))
+
+    def test_out(self):
+        out = numpy.zeros((13, 7, 5), order='F')
+        result = evaluate_tiled(f, (self.x, self.y, self.z), out=out,
+                                tile_size=50, n_workers=2)
+        self.assertTrue(result is out)
+        self.check(out)
+        self.assertRaises(ValueError, evaluate_tiled, f,
+                          (self.x, self.y, self.z), numpy.zeros(3))
+
+    def test_progress(self):
+        calls = []
+        func = tiled(f, tile_size=91, n_workers=2,
+                     progress=lambda *args: calls.append(args))
+        self.assertTrue(isinstance(func, TiledFunction))
+        self.check(func(self.x, self.y, self.z))
+        self.assertEqual(calls, [(i, 5) for i in range(1, 6)])
+
+    def test_error(self):
+        def g(x, y):
+            raise ZeroDivisionError
+        self.assertRaises(ZeroDivisionError, evaluate_tiled, g,
+                          (self.x[:, :, 0], self.y[:, :, 0]),
+                          tile_size=10, n_workers=2)
+
+    def test_extra_args(self):
+        func = TiledFunction(lambda x, y, a, b=0: x*a + y + b, tile_size=4)
+        x, y = numpy.ogrid[0:3, 0:4]
+        result = func.evaluate((x, y), (2,), dict(b=1))
+        self.assertTrue(numpy.all(result == x*2 + y + 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -353,6 +353,17 @@ class TestTVTK(unittest.TestCase):
         self.assertRaises(IndexError, f.__getitem__, 100)
         self.assertRaises(IndexError, f.__setitem__, 100, 100)
 
+        # Slices and fancy indexing.
+        self.assertEqual(mysum(f[1:3] - [[-1,-1,-1], [2,2,2]]), 0)
+        self.assertEqual(f[numpy.array([0, 4])].shape, (2, 3))
+        f[3:] = 0
+        self.assertEqual(f[-1], (0.0, 0.0, 0.0))
+        f[f.to_array()[:,0] < 0] = 5
+        self.assertEqual(f[1], (5.0, 5.0, 5.0))
+        self.assertEqual(f[numpy.int32(1)], (5.0, 5.0, 5.0))
+        f.extend(numpy.ones((3, 3)))
+        self.assertEqual(f.number_of_tuples, 8)
+
         # Check a 5D arrray
         a = numpy.array([[0.,0,0, 0, 0],[1,1,1, 1, 1]])
         f.from_array(a)
@@ -398,6 +409,12 @@ class TestTVTK(unittest.TestCase):
         self.assertRaises(IndexError, f.__getitem__, 100)
         self.assertRaises(IndexError, f.__setitem__, 100, 100)
 
+        # Slices and fancy indexing.
+        f[::2] = [0, 0, 0]
+        self.assertEqual(f[2], (0.0, 0.0, 0.0))
+        self.assertEqual(mysum(f[-2:] - [[3,3,3], [0,0,0]]), 0)
+        self.assertEqual(f.to_array().shape, (5, 3))
+
     def test_idlist(self):
         """Test if vtkIdList behaves in a Pythonic fashion."""
         f = tvtk.IdList()
@@ -419,6 +436,14 @@ class TestTVTK(unittest.TestCase):
         self.assertRaises(IndexError, f.__getitem__, 100)
         self.assertRaises(IndexError, f.__setitem__, 100, 100)
 
+        # Slices and fancy indexing.
+        self.assertEqual(list(f[:3]), [0, -1, 2])
+        f[[0, 2]] = 10
+        self.assertEqual(list(f[:3]), [10, -1, 10])
+        f.extend(numpy.arange(7, 10))
+        self.assertEqual(len(f), 10)
+        self.assertEqual(f[-1], 9)
+
     def test_array_conversion(self):
         """Test if Numeric/VTK array conversion works."""
         # This is only a simple test.
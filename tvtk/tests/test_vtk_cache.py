@@ -0,0 +1,74 @@
+"""Tests for the on-disk cache of VTK introspection data."""
+# Copyright (c) 2013, Enthought, Inc.
+# License: BSD Style.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import vtk
+
+from tvtk import vtk_cache, vtk_parser
+
+
+class TestDiskCache(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.orig_dir = os.environ.get('TVTK_CACHE_DIR')
+        os.environ['TVTK_CACHE_DIR'] = os.path.join(self.root, 'cache')
+
+    def tearDown(self):
+        if self.orig_dir is None:
+            del os.environ['TVTK_CACHE_DIR']
+        else:
+            os.environ['TVTK_CACHE_DIR'] = self.orig_dir
+        shutil.rmtree(self.root)
+
+    def test_save_load(self):
+        c = vtk_cache.DiskCache('test')
+        self.assertEqual(c.load(), None)
+        data = {'a': [1, 2.0, 'x'], 'b': (None, True)}
+        self.assertTrue(c.save(data))
+        self.assertEqual(vtk_cache.DiskCache('test').load(), data)
+        c.clear()
+        self.assertEqual(c.load(), None)
+
+    def test_corrupt_file(self):
+        c = vtk_cache.DiskCache('test')
+        c.save([1])
+        f = open(c.file_name, 'wb')
+        f.write('garbage')
+        f.close()
+        self.assertEqual(c.load(), None)
+
+    def test_is_plain(self):
+        self.assertTrue(vtk_cache.is_plain({'a': [(1, 2.0), None]}))
+        self.assertFalse(vtk_cache.is_plain([vtk.vtkObject()]))
+
+    def test_parser_cache(self):
+        p = vtk_parser.VTKMethodParser(use_tree=False, use_cache=True)
+        expect = {}
+        for klass in (vtk.vtkProperty, vtk.vtkSphereSource):
+            p.parse(klass)
+            expect[klass] = (p.get_toggle_methods(),
+                             p.get_state_methods(),
+                             p.get_get_methods(),
+                             p.get_other_methods())
+        p.save_cache()
+
+        p1 = vtk_parser.VTKMethodParser(use_tree=False, use_cache=True)
+        for klass, value in expect.iteritems():
+            self.assertTrue(klass.__name__ in p1._cache)
+            p1.parse(klass)
+            self.assertEqual((p1.get_toggle_methods(),
+                              p1.get_state_methods(),
+                              p1.get_get_methods(),
+                              p1.get_other_methods()), value)
+        p1.clear_cache()
+        p2 = vtk_parser.VTKMethodParser(use_tree=False, use_cache=True)
+        self.assertEqual(p2._cache, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -104,6 +104,7 @@ from tvtk.api import tvtk
 from tvtk.tvtk_base import TVTKBase, vtk_color_trait
 
 from tvtk.tools import ivtk
+from tvtk.tools.tiling import TiledFunction
 
 # Set this to False to not use LOD Actors.
 USE_LOD_ACTOR = True
@@ -179,7 +180,14 @@ def sampler(xa, ya, func, *args, **kwargs):
 
         kwargs -- a dict of additional keyword arguments for func()
         (default is empty)
+
+    If `func` is a `tvtk.tools.tiling.TiledFunction` it is evaluated
+    by tiles, possibly in parallel, directly into an array laid out as
+    VTK expects.
     """
+    if isinstance(func, TiledFunction):
+        out = func.evaluate((xa[:,None], ya[None,:]), args, kwargs)
+        return numpy.transpose(out)
     ret = func(xa[:,None] + numpy.zeros_like(ya),
                numpy.transpose(ya[:,None] + numpy.zeros_like(xa)),
                *args, **kwargs
@@ -0,0 +1,249 @@
+"""Tiled evaluation of functions over grids of points.
+
+A function of coordinate arrays, like `f(x, y, z)`, is evaluated tile
+by tile over the grid and each tile is written directly into a single
+preallocated output array.  Only the temporaries of one tile per worker
+are alive at a time and the tiles can be evaluated on a pool of threads
+or processes.
+
+The output is allocated in Fortran order by default, so that x varies
+fastest in memory, as VTK expects for its structured datasets: the
+transposed output can be handed over to VTK without a copy.
+
+The function has to be elementwise: the value at a point may only
+depend on the coordinates of that point.  Functions using the whole
+grid (`numpy.gradient`, normalizing by `s.max()`, ...) will give wrong
+results when evaluated by tiles.
+"""
+# Copyright (c) 2013, Enthought, Inc.
+# License: BSD Style.
+
+from multiprocessing import cpu_count, Pool
+from multiprocessing.pool import ThreadPool
+
+import numpy
+
+
+# The default number of elements of a tile.
+TILE_SIZE = 2**18
+
+
+######################################################################
+# Utility functions.
+######################################################################
+def _tiles(shape, axis, tile_size):
+    """Returns the (start, stop) bounds of the tiles along `axis` of a
+    grid of the given shape, each tile holding about `tile_size`
+    elements at most."""
+    n = shape[axis]
+    per_slice = max(1, int(numpy.prod(shape))//max(1, n))
+    step = max(1, tile_size//per_slice)
+    return [(start, min(start + step, n)) for start in range(0, n, step)]
+
+
+def _take(arr, axis, bounds):
+    """Returns the view of the tile of `arr` with the given bounds."""
+    index = [slice(None)]*arr.ndim
+    index[axis] = slice(*bounds)
+    return arr[tuple(index)]
+
+
+def _evaluate_tile(args):
+    """Evaluates a tile in a worker process, `args` is a (function,
+    tile number, coordinates) tuple."""
+    func, number, coordinates = args
+    return number, numpy.asarray(func(*coordinates))
+
+
+def _write_tile(func, out, axis, bounds, coordinates):
+    """Evaluates a tile and writes it into `out`."""
+    _take(out, axis, bounds)[...] = func(*coordinates)
+
+
+def evaluate_tiled(func, coordinates, out=None, tile_size=TILE_SIZE,
+                   n_workers=1, use_processes=False, progress=None,
+                   order='F'):
+    """Evaluates `func(*coordinates)` by tiles and returns the output
+    array.
+
+    Parameters
+    ----------
+
+    - func : callable
+
+      The elementwise function evaluated.
+
+    - coordinates : sequence of arrays
+
+      The coordinate arrays, broadcast against each other to give the
+      shape of the grid.
+
+    - out : array (default: None)
+
+      The array the values are written in.  By default an array of the
+      dtype of the values of the first tile is allocated.
+
+    - tile_size : int (default: TILE_SIZE)
+
+      The approximate number of elements of a tile.
+
+    - n_workers : int (default: 1)
+
+      The number of threads or processes evaluating the tiles, if 0
+      the number of CPUs is used.  With 1 the tiles are evaluated one
+      after the other in the calling thread.
+
+    - use_processes : bool (default: False)
+
+      Evaluate the tiles in worker processes rather than threads.  The
+      function must then be picklable.  Threads work well for
+      functions spending their time in numpy, which releases the GIL.
+
+    - progress : callable (default: None)
+
+      Called as `progress(n_done, n_tiles)` in the calling thread each
+      time a tile is done.
+
+    - order : 'F' or 'C' (default: 'F')
+
+      The memory layout of the output allocated.  The grid is split
+      along its last axis for 'F' and its first axis for 'C', so that
+      the tiles are contiguous blocks of the output.
+    """
+    coordinates = numpy.broadcast_arrays(*coordinates)
+    shape = coordinates[0].shape
+    if len(shape) == 0:
+        value = numpy.asarray(func(*coordinates))
+        if out is not None:
+            out[...] = value
+            return out
+        return value
+
+    axis = len(shape) - 1 if order == 'F' else 0
+    tiles = _tiles(shape, axis, tile_size)
+    n_tiles = len(tiles)
+    tile_coordinates = lambda bounds: [_take(c, axis, bounds)
+                                       for c in coordinates]
+
+    # The first tile gives the dtype of the output.
+    value = numpy.asarray(func(*tile_coordinates(tiles[0])))
+    if out is None:
+        out = numpy.empty(shape, dtype=value.dtype, order=order)
+    elif out.shape != shape:
+        raise ValueError('The output array has shape %s instead of %s.'
+                         %(out.shape, shape))
+    _take(out, axis, tiles[0])[...] = value
+    del value
+    if progress is not None:
+        progress(1, n_tiles)
+    if n_tiles == 1:
+        return out
+
+    if n_workers <= 0:
+        n_workers = cpu_count()
+    n_workers = min(n_workers, n_tiles - 1)
+    numbers = range(1, n_tiles)
+    if n_workers == 1:
+        pool = None
+        results = (_write_tile(func, out, axis, tiles[i],
+                               tile_coordinates(tiles[i]))
+                   for i in numbers)
+    elif use_processes:
+        pool = Pool(n_workers)
+        tasks = ((func, i, tile_coordinates(tiles[i])) for i in numbers)
+        results = pool.imap_unordered(_evaluate_tile, tasks)
+    else:
+        pool = ThreadPool(n_workers)
+        write = lambda i: _write_tile(func, out, axis, tiles[i],
+                                      tile_coordinates(tiles[i]))
+        results = pool.imap_unordered(write, numbers)
+
+    try:
+        for n_done, result in enumerate(results):
+            if use_processes and pool is not None:
+                i, value = result
+                _take(out, axis, tiles[i])[...] = value
+            if progress is not None:
+                progress(n_done + 2, n_tiles)
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+    return out
+
+
+class _Arguments(object):
+    """A picklable function calling `func(*(coordinates + args),
+    **kwargs)`."""
+
+    def __init__(self, func, args, kwargs):
+        self.func = func
+        self.args = tuple(args)
+        self.kwargs = kwargs
+
+    def __call__(self, *coordinates):
+        return self.func(*(coordinates + self.args), **self.kwargs)
+
+
+######################################################################
+# `TiledFunction` class.
+######################################################################
+class TiledFunction(object):
+    """An elementwise function evaluated by tiles when called with
+    coordinate arrays, see `evaluate_tiled` for the parameters.
+    Calling it returns the output array.
+    """
+
+    def __init__(self, func, tile_size=TILE_SIZE, n_workers=1,
+                 use_processes=False, progress=None, order='F'):
+        self.func = func
+        self.tile_size = tile_size
+        self.n_workers = n_workers
+        self.use_processes = use_processes
+        self.progress = progress
+        self.order = order
+
+    def __call__(self, *coordinates):
+        return self.evaluate(coordinates)
+
+    def evaluate(self, coordinates, args=(), kwargs=None, out=None):
+        """Evaluates the function at the coordinates, passing it the
+        additional `args` and `kwargs`, and returns the output array."""
+        func = self.func
+        if args or kwargs:
+            func = _Arguments(func, args, kwargs or {})
+        return evaluate_tiled(func, coordinates, out=out,
+                              tile_size=self.tile_size,
+                              n_workers=self.n_workers,
+                              use_processes=self.use_processes,
+                              progress=self.progress, order=self.order)
+
+
+def tiled(func, tile_size=TILE_SIZE, n_workers=1, use_processes=False,
+          progress=None):
+    """Wraps the elementwise function `func` so that it is evaluated by
+    tiles, possibly in parallel, when mlab samples it on a grid.
+
+    For example::
+
+        def f(x, y, z):
+            return numpy.sin(x*y*z)/(x*y*z)
+
+        x, y, z = numpy.mgrid[-5:5:200j, -5:5:200j, -5:5:200j]
+        contour3d(x, y, z, tiled(f, n_workers=4))
+
+    **Keyword arguments**
+
+        :tile_size: the approximate number of points of a tile.
+
+        :n_workers: the number of threads or processes evaluating the
+                    tiles, the number of CPUs if 0.
+
+        :use_processes: use processes instead of threads, `func` must
+                        then be picklable.
+
+        :progress: a function called as `progress(n_done, n_tiles)`
+                   each time a tile is done.
+    """
+    return TiledFunction(func, tile_size=tile_size, n_workers=n_workers,
+                         use_processes=use_processes, progress=progress)
@@ -18,6 +18,7 @@ docs are shown.
 
 # Standard library imports.
 import vtk
+import re
 import types
 import inspect
 
@@ -28,11 +29,12 @@ from traitsui.api import View, Group, Item, EnumEditor,\
                                     ListEditor, TextEditor
 from tvtk.api import tvtk
 from tvtk.common import get_tvtk_name
+from tvtk.vtk_cache import DiskCache
 
 ################################################################################
 # Utility functions.
 ################################################################################
-def get_tvtk_class_names():
+def get_tvtk_class_names(use_cache=True):
     """Returns 4 lists:
 
      1. A list of all the TVTK class names that are not abstract.
@@ -43,7 +45,16 @@ def get_tvtk_class_names():
 
      4. A list of the TVTK sinks (only inputs and no outputs)
 
+    Finding these requires instantiating every VTK class, so the
+    result is cached on disk (see `tvtk.vtk_cache`) unless `use_cache`
+    is False.
     """
+    if use_cache:
+        cache = DiskCache('tvtk_class_names')
+        result = cache.load()
+        if result is not None:
+            return result
+
     # Shut of VTK warnings for the time being.
     o = vtk.vtkObject
     w = o.GetGlobalWarningDisplay()
@@ -85,6 +96,8 @@ def get_tvtk_class_names():
     for x in result:
         x.sort()
 
+    if use_cache:
+        cache.save(result)
     return result
 
 def get_func_doc(func, fname):
@@ -137,34 +150,84 @@ class DocSearch(object):
     """A simple class that provides a method to search through class
     documentation.  This code is taken from mayavi-1.x's ivtk.VtkHelp
 
+    The lower cased class documentation is indexed by word so a search
+    only needs to look at the classes that contain all the words of a
+    search term.  The documentation and the index are cached on disk
+    (see `tvtk.vtk_cache`).
+
     """
 
     # These are class attributes to prevent regenerating them everytime
     # this class is instantiated.
     VTK_CLASSES = []
     VTK_CLASS_DOC = []
+    # Maps each word in the documentation to a sorted list of the
+    # indices of the classes whose documentation contains it.
+    INDEX = {}
 
-    def __init__(self):
-        self.vtk_classes = self.VTK_CLASSES
-        self.vtk_c_doc = self.VTK_CLASS_DOC
+    # The pattern defining the words that are indexed.
+    _word_patn = re.compile(r'\w+')
 
+    def __init__(self):
         if len(self.VTK_CLASSES) == 0:
             self._setup_data()
+        self.vtk_classes = self.VTK_CLASSES
+        self.vtk_c_doc = self.VTK_CLASS_DOC
+        self.index = self.INDEX
 
     def _setup_data(self):
-        self.vtk_classes = [x for x in dir(vtk) if x.startswith('vtk')]
-        n = len(self.vtk_classes)
+        cache = DiskCache('tvtk_doc_search')
+        data = cache.load()
+        if data is None:
+            data = self._create_data()
+            cache.save(data)
+        klass = self.__class__
+        klass.VTK_CLASSES, klass.VTK_CLASS_DOC, klass.INDEX = data
+
+    def _create_data(self):
+        """Returns the VTK class names, their lower cased documentation
+        and the word index of the documentation."""
+        vtk_classes = [x for x in dir(vtk) if x.startswith('vtk')]
+        n = len(vtk_classes)
         # Store the class docs in the list given below.
-        self.vtk_c_doc = ['']*n
+        vtk_c_doc = ['']*n
+        index = {}
 
         # setup the data.
         for i in range(n):
-            c = self.vtk_classes[i]
+            c = vtk_classes[i]
             try:
                 doc = getattr(vtk, c).__doc__.lower()
-                self.vtk_c_doc[i] = doc
             except AttributeError:
-                pass
+                continue
+            vtk_c_doc[i] = doc
+            for word in set(self._word_patn.findall(doc)):
+                index.setdefault(word, []).append(i)
+        return vtk_classes, vtk_c_doc, index
+
+    def _find(self, w):
+        """Return the set of indices of the classes whose
+        documentation contains the string `w`."""
+        vtk_c_doc = self.vtk_c_doc
+        index = self.index
+        # Any match of `w` in a doc means that every word in `w` is
+        # part of some word in the doc, use the index to restrict the
+        # docs that are searched.
+        candidates = None
+        for part in set(self._word_patn.findall(w)):
+            found = set()
+            for word, idx in index.iteritems():
+                if part in word:
+                    found.update(idx)
+            if candidates is None:
+                candidates = found
+            else:
+                candidates &= found
+            if not candidates:
+                return set()
+        if candidates is None:
+            candidates = xrange(len(vtk_c_doc))
+        return set(i for i in candidates if vtk_c_doc[i].find(w) > -1)
 
     def search(self, word):
         """ Search for word in class documentation and return matching
@@ -204,32 +267,24 @@ class DocSearch(object):
         elif prev:
             wlist.append(prev)
 
-        ret = []
-        i = 0
+        result = set()
+        do_test = ''
+        for w in wlist:
+            if w == 'and':
+                do_test = 'and'
+            elif w == 'or':
+                do_test = 'or'
+            else:
+                found = self._find(w)
+                if do_test == 'and':
+                    result &= found
+                elif do_test == 'or':
+                    result |= found
+                elif do_test == '':
+                    result = found
+
         vtk_classes = self.vtk_classes
-        vtk_c_doc = self.vtk_c_doc
-        N = len(vtk_classes)
-        while i < N:
-            stored_test = 0
-            do_test = ''
-            for w in wlist:
-                if w == 'and':
-                    do_test = 'and'
-                elif w == 'or':
-                    do_test = 'or'
-                else:
-                    test = (vtk_c_doc[i].find(w) > -1)
-                    if do_test == 'and':
-                        stored_test = stored_test and test
-                    elif do_test == 'or':
-                        stored_test = stored_test or test
-                    elif do_test == '':
-                        stored_test = test
-            if stored_test:
-                ret.append(vtk_classes[i])
-            i = i + 1
-
-        return [get_tvtk_name(x) for x in ret]
+        return [get_tvtk_name(vtk_classes[i]) for i in sorted(result)]
 
 _search_help_doc =  """
                         Help on Searching
@@ -0,0 +1,144 @@
+"""A simple disk-backed cache for information obtained by introspecting
+VTK.
+
+Parsing the methods of every VTK class, instantiating them to find
+default values and walking the documentation of all the classes takes
+several seconds.  The results only depend on the VTK build, so they are
+pickled to a cache directory keyed on the VTK version.  The cache is
+strictly an optimization: any problem reading or writing it is
+silently ignored and the information is recomputed.
+
+The cache directory is `~/.tvtk/cache` and can be changed by setting
+the `TVTK_CACHE_DIR` environment variable.
+
+"""
+# Copyright (c) 2013, Enthought, Inc.
+# License: BSD Style.
+
+import os
+import sys
+import cPickle
+import tempfile
+try:
+    from hashlib import md5
+except ImportError:
+    from md5 import md5
+
+# Local imports (these are relative imports because the code generator
+# uses this module before the package is installed).
+import vtk_module as vtk
+
+
+######################################################################
+# Utility functions.
+######################################################################
+def get_cache_dir():
+    """Return the directory in which the cache files are stored."""
+    d = os.environ.get('TVTK_CACHE_DIR')
+    if not d:
+        d = os.path.join(os.path.expanduser('~'), '.tvtk', 'cache')
+    return d
+
+
+def get_vtk_key():
+    """Return a string identifying the VTK build (and the Python
+    version) that the cached data was generated with.  Any local
+    classes exposed via `tvtk_local` also change the key.
+    """
+    v = vtk.vtkVersion()
+    s = '%s|%s|%d'%(v.GetVTKSourceVersion(), sys.version,
+                    len(dir(vtk)))
+    return '%s-%s'%(v.GetVTKVersion(), md5(s).hexdigest()[:10])
+
+
+def is_plain(value):
+    """Returns True if the given value is made only of basic Python
+    types (and can hence be safely pickled and shared).
+    """
+    if value is None or isinstance(value, (bool, int, long, float,
+                                           basestring)):
+        return True
+    elif isinstance(value, (list, tuple)):
+        for x in value:
+            if not is_plain(x):
+                return False
+        return True
+    elif isinstance(value, dict):
+        for k, x in value.iteritems():
+            if not (is_plain(k) and is_plain(x)):
+                return False
+        return True
+    return False
+
+
+######################################################################
+# `DiskCache` class.
+######################################################################
+class DiskCache:
+    """Stores a picklable object in a file named after the given
+    `name` and the VTK build.
+
+    Here is an example::
+
+        >>> c = DiskCache('my_data')
+        >>> data = c.load()
+        >>> if data is None:
+        ...     data = compute_data()
+        ...     c.save(data)
+
+    """
+
+    def __init__(self, name, directory=None):
+        if directory is None:
+            directory = get_cache_dir()
+        self.directory = directory
+        self.file_name = os.path.join(directory,
+                                      '%s-%s.pickle'%(name, get_vtk_key()))
+
+    def load(self):
+        """Return the cached data or None if there is no (readable)
+        cache."""
+        if not os.path.exists(self.file_name):
+            return None
+        try:
+            f = open(self.file_name, 'rb')
+            try:
+                return cPickle.load(f)
+            finally:
+                f.close()
+        except Exception:
+            return None
+
+    def save(self, data):
+        """Save the given data to the cache.  Returns True if this
+        succeeded."""
+        d = self.directory
+        tmp = None
+        try:
+            if not os.path.exists(d):
+                os.makedirs(d)
+            # Write to a temporary file and rename so concurrent
+            # readers never see a partial file.
+            fd, tmp = tempfile.mkstemp(dir=d, suffix='.tmp')
+            f = os.fdopen(fd, 'wb')
+            try:
+                cPickle.dump(data, f, cPickle.HIGHEST_PROTOCOL)
+            finally:
+                f.close()
+            if os.path.exists(self.file_name):
+                # Windows does not allow rename over an existing file.
+                os.remove(self.file_name)
+            os.rename(tmp, self.file_name)
+        except (IOError, OSError, cPickle.PicklingError):
+            if tmp is not None and os.path.exists(tmp):
+                os.remove(tmp)
+            return False
+        return True
+
+    def clear(self):
+        """Remove the cache file."""
+        if os.path.exists(self.file_name):
+            try:
+                os.remove(self.file_name)
+            except OSError:
+                pass
@@ -7,9 +7,11 @@ type information, and organizes them.
 # License: BSD Style.
 
 import re
+import copy
 
 # Local imports (these are relative imports for a good reason).
 import class_tree
+import vtk_cache
 import vtk_module as vtk
 
 
@@ -79,7 +81,7 @@ class VTKMethodParser:
 
     """
 
-    def __init__(self, use_tree=True):
+    def __init__(self, use_tree=True, use_cache=False):
         """Initializes the object.
 
         Parameters
@@ -99,17 +101,31 @@ class VTKMethodParser:
           the methods and not their default values, ranges etc.  In
           that case using a parser should be cheap.
 
+        - use_cache : `bool`
+
+          If True, the parsed method categories and default values
+          of the classes are read from an on-disk cache (see
+          `vtk_cache`) keyed on the VTK version.  Classes that are not
+          in the cache are parsed as usual and are added to it when
+          `save_cache` is called.  When caching, the ClassTree is only
+          created when it is really needed.  Defaults to False.
+
         """
         # The ClassTree is needed to find an instantiable child class
         # for an abstract VTK parent class.  This instance is used to
         # obtain the state values and the ranges of the arguments
         # accepted by the Get/Set methods that have a
         # Get<Prop>{MaxValue,MinValue} method.
-        if use_tree:
-            self._tree = class_tree.ClassTree(vtk)
-            self._tree.create()
-        else:
-            self._tree = None
+        self._use_tree = use_tree
+        self._tree = None
+        if use_tree and not use_cache:
+            self._create_tree()
+        self._disk_cache = None
+        self._cache = {}
+        self._cache_modified = False
+        if use_cache:
+            self._disk_cache = vtk_cache.DiskCache('vtk_parser')
+            self._cache = self._disk_cache.load() or {}
         self._state_patn = re.compile('To[A-Z0-9]')
         self._initialize()
 
@@ -141,6 +157,13 @@ class VTKMethodParser:
         else:
             klass = obj
 
+        use_cache = self._disk_cache is not None
+        if use_cache:
+            cached = self._cache.get(klass.__name__)
+            if cached is not None:
+                self._set_parsed_data(copy.deepcopy(cached))
+                return
+
         methods = self.get_methods(klass)
 
         if no_warn:
@@ -155,6 +178,27 @@ class VTKMethodParser:
             # Reset warning status.
             vtk.vtkObject.SetGlobalWarningDisplay(warn)
 
+        if use_cache:
+            data = self._get_cacheable_data()
+            if data is not None:
+                self._cache[klass.__name__] = data
+                self._cache_modified = True
+
+    def save_cache(self):
+        """Save the parsed data to the on-disk cache if the parser was
+        created with `use_cache=True` and new classes were parsed.
+        """
+        if self._disk_cache is not None and self._cache_modified:
+            if self._disk_cache.save(self._cache):
+                self._cache_modified = False
+
+    def clear_cache(self):
+        """Clear the in-memory and on-disk cache of parsed data."""
+        self._cache = {}
+        self._cache_modified = False
+        if self._disk_cache is not None:
+            self._disk_cache.clear()
+
     def _get_parent_methods(self, klass):
         """Returns all the methods of the classes parents."""
         methods = {}
@@ -411,12 +455,48 @@ class VTKMethodParser:
 
     def get_tree(self):
         """Return the ClassTree instance used by this class."""
+        if self._tree is None and self._use_tree:
+            self._create_tree()
         return self._tree
 
     #################################################################
     # Non-public interface.
     #################################################################
 
+    def _create_tree(self):
+        """Create the ClassTree of all the VTK classes."""
+        self._tree = class_tree.ClassTree(vtk)
+        self._tree.create()
+
+    def _get_parsed_data(self):
+        """Return the parsed method categories as a tuple."""
+        return (self.toggle_meths, self.state_meths, self.get_set_meths,
+                self.get_meths, self.other_meths)
+
+    def _get_cacheable_data(self):
+        """Return a copy of the parsed data suitable for the on-disk
+        cache or None if this is not possible.  Default values of the
+        Get/Set methods that are VTK objects cannot be pickled and are
+        stored as None, the code generator treats both alike.
+        """
+        gsm = {}
+        for key, value in self.get_set_meths.iteritems():
+            if value is not None and \
+                   isinstance(value[0], vtk.vtkObjectBase):
+                value = (None, value[1])
+            gsm[key] = value
+        data = (self.toggle_meths, self.state_meths, gsm,
+                self.get_meths, self.other_meths)
+        if vtk_cache.is_plain(data):
+            return copy.deepcopy(data)
+        return None
+
+    def _set_parsed_data(self, data):
+        """Set the method categories from a tuple returned by
+        `_get_parsed_data`."""
+        (self.toggle_meths, self.state_meths, self.get_set_meths,
+         self.get_meths, self.other_meths) = data
+
     def _initialize(self):
         """Initializes the method categories."""
         # Collects the <Value>On/Off methods.
@@ -658,8 +738,8 @@ class VTKMethodParser:
         try:
             obj = klass()
         except (TypeError, NotImplementedError):
-            if self._tree:
-                t = self._tree
+            t = self.get_tree()
+            if t:
                 n = t.get_node(klass.__name__)
                 for c in n.children:
                     obj = self._get_instance(t.get_class(c.name))
@@ -39,9 +39,9 @@ class WrapperGenerator:
     """Generates the wrapper code for all the TVTK classes.
 
     """
-    def __init__(self):
+    def __init__(self, use_cache=False):
         self.indent = indenter.Indent()
-        self.parser = vtk_parser.VTKMethodParser()
+        self.parser = vtk_parser.VTKMethodParser(use_cache=use_cache)
         self.special = special_gen.SpecialGenerator(self.indent)
         self.dm = indenter.VTKDocMassager()
 